@@ -0,0 +1,83 @@
+"""
+Clustering scaling benchmark (synthetic embeddings with planted near-duplicates).
+
+Usage:
+    python benchmarks/bench_clustering.py                      # 1k / 10k / 100k
+    python benchmarks/bench_clustering.py --sizes 1000 10000   # custom sizes
+    python benchmarks/bench_clustering.py --with-st            # also run sentence_transformers.util (<= 10k)
+
+Reports wall time, peak traced memory and whether keep/drop decisions match
+the exact blocked backend.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processors.clustering import community_detection
+
+DIM = 384 # paraphrase-multilingual-MiniLM-L12-v2
+THRESHOLD = 0.85
+
+def make_embeddings(n, dup_rate=0.3, noise=0.02, seed=0):
+    """~dup_rate of the items are noisy copies of another item (same story, other source)."""
+    rng = np.random.default_rng(seed)
+    n_unique = max(1, int(n * (1 - dup_rate)))
+    base = rng.standard_normal((n_unique, DIM)).astype(np.float32)
+    copies = base[rng.integers(0, n_unique, n - n_unique)]
+    copies = copies + noise * rng.standard_normal(copies.shape).astype(np.float32) * np.sqrt(DIM) / 10
+    emb = np.vstack([base, copies])
+    lengths = rng.integers(50, 5000, n)
+    return emb[rng.permutation(n)], lengths
+
+def dropped_set(clusters, lengths):
+    """DataCleaner strategy: keep the longest content per cluster."""
+    dropped = set()
+    for cluster in clusters:
+        ranked = sorted(cluster, key=lambda i: lengths[i], reverse=True)
+        dropped.update(ranked[1:])
+    return dropped
+
+def run(name, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    clusters = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return name, elapsed, peak / (1024 * 1024), clusters
+
+def main():
+    parser = argparse.ArgumentParser(description="Clustering backend scaling benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--block-size", type=int, default=2048)
+    parser.add_argument("--lsh-bits", type=int, default=12)
+    parser.add_argument("--lsh-tables", type=int, default=4)
+    parser.add_argument("--with-st", action="store_true", help="Include sentence_transformers.util.community_detection")
+    args = parser.parse_args()
+
+    print(f"{'n':>8} | {'backend':<22} | {'time (s)':>9} | {'peak MB':>8} | {'clusters':>8} | {'dropped':>7} | same keep/drop")
+    print("-" * 92)
+    for n in args.sizes:
+        emb, lengths = make_embeddings(n)
+        runs = [
+            run("blocked (exact)", lambda: community_detection(emb, THRESHOLD, block_size=args.block_size)),
+            run(f"blocked+LSH ({args.lsh_bits}x{args.lsh_tables})", lambda: community_detection(
+                emb, THRESHOLD, block_size=args.block_size, lsh_bits=args.lsh_bits, lsh_tables=args.lsh_tables)),
+        ]
+        if args.with_st and n <= 10000:
+            from sentence_transformers import util
+            runs.append(run("sentence_transformers", lambda: util.community_detection(emb, threshold=THRESHOLD, min_community_size=1)))
+
+        reference = dropped_set(runs[0][3], lengths)
+        for name, elapsed, peak_mb, clusters in runs:
+            dropped = dropped_set(clusters, lengths)
+            same = "yes" if dropped == reference else f"no ({len(dropped ^ reference)} differ)"
+            print(f"{n:>8} | {name:<22} | {elapsed:>9.2f} | {peak_mb:>8.1f} | {len(clusters):>8} | {len(dropped):>7} | {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Email rendering benchmark: the four MessageBus retry variants of one unified payload.
+
+Usage:
+    python benchmarks/bench_email_formatter.py                 # 10k items over 7 groups
+    python benchmarks/bench_email_formatter.py --items 50000
+
+Compares a fresh EmailFormatter per attempt (every variant renders from scratch)
+with one formatter reused across attempts (fragments cached after the first render).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from formatters.email_formatter import EmailFormatter
+
+RETRY_LIMITS = [None, 500, 100, 0] # Same stages as MessageBus.publish
+GROUPS = ["US_TECH", "COMMODITIES", "VIETNAM", "MACRO", "HK_TECH", "HK_PHARMA", "STAR50"]
+
+def make_payload(n_items, seed=0):
+    rng = random.Random(seed)
+    results = {}
+    for g, key in enumerate(GROUPS):
+        items = [
+            {
+                "source": "GoogleNews (FullText)",
+                "title": f"Headline {g}-{i}",
+                "published_date": "2025-01-01T08:00:00",
+                "content": "Lorem ipsum dolor sit amet. " * rng.randint(5, 120),
+                "link": f"https://example.com/{g}/{i}",
+            }
+            for i in range(n_items // len(GROUPS))
+        ]
+        results[key] = {"data": {"cleaned_data": items, "raw_data": items}, "meta": {"group_name": key}}
+    return {"is_unified": True, "subject": "Benchmark", "results": results}
+
+def run(payload, reuse_formatter):
+    formatter = EmailFormatter()
+    sizes = []
+    start = time.perf_counter()
+    for limit in RETRY_LIMITS:
+        if not reuse_formatter:
+            formatter = EmailFormatter()
+        sizes.append(len(formatter.format_html(payload, cleaned_truncate_length=limit)))
+    return time.perf_counter() - start, sizes
+
+def main():
+    parser = argparse.ArgumentParser(description="EmailFormatter retry-variant benchmark")
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    payload = make_payload(args.items)
+    print(f"{args.items} items, variants {RETRY_LIMITS}")
+    for name, reuse in [("fresh formatter per attempt", False), ("cached fragments", True)]:
+        best, sizes = min(run(payload, reuse) for _ in range(args.repeat))
+        print(f"{name:<28} | {best * 1000:8.1f} ms | body sizes (KB): {[s // 1024 for s in sizes]}")
+
+if __name__ == "__main__":
+    main()
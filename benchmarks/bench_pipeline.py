@@ -0,0 +1,173 @@
+"""
+Offline end-to-end benchmark: recorded feeds and pages served by a local HTTP stand-in.
+
+Usage:
+    python benchmarks/bench_pipeline.py                                   # all modes, one subprocess each
+    python benchmarks/bench_pipeline.py --mode fetcher --queries 4 --items-per-feed 100
+    python benchmarks/bench_pipeline.py --mode collector --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+    python benchmarks/bench_pipeline.py --mode pipeline --backend async --guardian
+
+Modes:
+    fetcher    GoogleNewsRSSFetcher.fetch() per query
+    collector  USTechCollector.collect_group() (keyword items only)
+    pipeline   main.main() for --collector: collect, clean, save report, publish (file sink)
+
+Reports items/sec, p50/p99 per-article latency (download + extraction with the threads
+backend; extraction only with the async backend, which downloads per batch) and peak RSS.
+Caches, reports and the outbox live in a temporary directory, so every run is cold.
+No network access is needed: ENDPOINTS point at benchmarks/local_news_server.py and every
+publisher link resolves to it.
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import CONFIG
+from local_news_server import LocalNewsServer
+
+MODES = ["fetcher", "collector", "pipeline"]
+QUERIES = ["semiconductor export controls", "AI data center", "cloud capex", "chip stocks",
+           "HBM memory", "foundry capacity", "GPU supply", "AI regulation"]
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+def configure(server, workdir, args):
+    """Point the fetchers at the local server; caches/reports/outbox in workdir."""
+    CONFIG["ENDPOINTS"] = server.endpoints()
+    CONFIG["CACHE"]["DIR"] = os.path.join(workdir, "cache")
+    CONFIG["SCRAPING"]["BACKEND"] = args.backend
+    CONFIG["SCRAPING"]["HOST_LIMITER"]["ENABLED"] = not args.no_host_limiter
+    CONFIG["MESSAGE_BUS"]["SINKS"] = ["file"]
+    CONFIG["MESSAGE_BUS"]["FILE_PATH"] = os.path.join(workdir, "outbox.ndjson")
+    keywords = [{"value": q, "name": q, "type": "keyword"} for q in QUERIES[:args.queries]]
+    for groups in CONFIG["GROUPS"].values():
+        for group in groups.values():
+            group["items"] = keywords
+    if args.guardian:
+        os.environ["GUARDIAN_API_KEY"] = "offline-bench"
+    else:
+        os.environ.pop("GUARDIAN_API_KEY", None)
+
+def instrument_articles(latencies):
+    """Time every GoogleNewsRSSFetcher._process_entry call (all fetcher instances)."""
+    from data_sources.GoogleNews_RSS_Fetcher import GoogleNewsRSSFetcher
+    original = GoogleNewsRSSFetcher._process_entry
+
+    def timed(self, *a, **kw):
+        start = time.perf_counter()
+        try:
+            return original(self, *a, **kw)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    GoogleNewsRSSFetcher._process_entry = timed
+
+def run_fetcher(args):
+    from data_sources.GoogleNews_RSS_Fetcher import GoogleNewsRSSFetcher
+    from utils.utils_data import StatsTracker
+    fetcher = GoogleNewsRSSFetcher(StatsTracker())
+    return sum(len(fetcher.fetch(q, limit=1000)) for q in QUERIES[:args.queries])
+
+def run_collector(args):
+    from collectors import USTechCollector
+    return len(USTechCollector().collect_group("US_MARKET_TECH"))
+
+def run_pipeline(args):
+    import main
+    from utils.report_archive import load_report
+    sys.argv = ["main.py", "--collector", args.collector, "--parallel-collectors", str(args.parallel_collectors)]
+    main.main()
+    raw = cleaned = 0
+    for path in glob.glob(os.path.join("data", "Report_*")):
+        report = load_report(path)
+        raw += len(report["raw_data"])
+        cleaned += len(report["cleaned_data"])
+    print(f"reports:          {raw} raw items, {cleaned} after cleaning")
+    return raw
+
+RUNNERS = {"fetcher": run_fetcher, "collector": run_collector, "pipeline": run_pipeline}
+
+def bench(args):
+    from utils.utils_data import peak_rss_mb
+    latencies = []
+    with tempfile.TemporaryDirectory() as workdir, LocalNewsServer(
+        items_per_feed=args.items_per_feed, hosts=args.hosts, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, error_rate=args.error_rate, seed=args.seed
+    ) as server:
+        configure(server, workdir, args)
+        instrument_articles(latencies)
+        cwd = os.getcwd()
+        os.chdir(workdir) # data/ reports of the pipeline mode
+        try:
+            start = time.perf_counter()
+            items = RUNNERS[args.mode](args)
+            elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+        served = server.stats()
+
+    rss = peak_rss_mb()
+    result = {
+        "mode": args.mode,
+        "backend": args.backend,
+        "items": items,
+        "seconds": round(elapsed, 3),
+        "items_per_sec": round(items / elapsed, 1) if elapsed else None,
+        "article_p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "article_p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+        "articles": len(latencies),
+        "peak_rss_mb": round(rss) if rss else None,
+        "server": served
+    }
+    print(f"mode:             {args.mode} ({args.backend}, {args.queries} queries x {args.items_per_feed} items, {args.hosts} hosts)")
+    print(f"items:            {items} in {elapsed:.2f}s -> {result['items_per_sec']} items/s")
+    print(f"article latency:  p50 {result['article_p50_ms']} ms, p99 {result['article_p99_ms']} ms ({len(latencies)} articles)")
+    print(f"peak RSS:         {result['peak_rss_mb']} MB")
+    print(f"server responses: {served}")
+    if args.json:
+        print(json.dumps(result))
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark (local HTTP stand-in)")
+    parser.add_argument("--mode", choices=MODES + ["all"], default="all")
+    parser.add_argument("--backend", choices=["threads", "async"], default=CONFIG["SCRAPING"].get("BACKEND", "threads"))
+    parser.add_argument("--queries", type=int, default=4, help=f"Keyword queries (max {len(QUERIES)})")
+    parser.add_argument("--items-per-feed", type=int, default=50)
+    parser.add_argument("--hosts", type=int, default=8, help="Distinct publisher hosts")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of responses answered with 503")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--guardian", action="store_true", help="Also query the Guardian stand-in")
+    parser.add_argument("--no-host-limiter", action="store_true", help="Disable the adaptive per-host limiter")
+    parser.add_argument("--collector", default="US_TECH", help="Pipeline mode: --collector for main.py (e.g. ALL)")
+    parser.add_argument("--parallel-collectors", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Also print the result as one JSON line")
+    args = parser.parse_args()
+
+    if args.mode != "all":
+        bench(args)
+        return
+
+    # One process per mode: peak RSS and process-wide singletons stay per mode
+    for mode in MODES:
+        print(f"\n=== {mode} ===", flush=True)
+        # Last --mode wins in argparse
+        subprocess.run([sys.executable, os.path.abspath(__file__)] + sys.argv[1:] + ["--mode", mode], check=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Cold-start benchmark: CLI import time and memory per collector (python -X importtime).
+
+Usage:
+    python benchmarks/bench_startup.py                          # import-only, eager and every collector
+    python benchmarks/bench_startup.py --collector HK_PHARMA --repeat 5 --top 15
+
+Scenarios (each in fresh interpreters, median of --repeat runs):
+    import        `import main` only (argument parsing, --help)
+    eager         import main + every fetcher and the DataCleaner, as each run did before
+                  fetchers were loaded lazily
+    <COLLECTOR>   import main + the collector + the fetchers/cleaner its group's item
+                  types need (collectors/lazy_resources.py)
+
+Reports wall time to ready, summed top-level import time, peak RSS, the resources built
+and any that could not be imported here (library not installed), then the slowest
+top-level packages per scenario from the -X importtime log.
+No network access is needed: nothing is fetched.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+# COLLECTOR_MAP key -> config group (as each collector's run() uses it)
+COLLECTOR_GROUPS = {
+    "US_TECH": "US_MARKET_TECH",
+    "COMMODITIES": "COMMODITIES_EN",
+    "VIETNAM": "VIETNAM_EN",
+    "MACRO": "GLOBAL_MACRO_RISKS",
+    "HK_TECH": "HK_TECH_CN",
+    "HK_PHARMA": "HK_PHARMA_CN",
+    "STAR50": "A_SHARES_STAR50",
+}
+
+# Runs in the child interpreter; prints one JSON line
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import main
+from config import CONFIG
+from collectors.lazy_resources import RESOURCES, resources_for_items
+from utils.utils_data import peak_rss_mb
+
+scenario = {scenario!r}
+if scenario == "import":
+    names, owner = [], None
+elif scenario == "eager":
+    names, owner = list(RESOURCES), None
+else:
+    owner = main.COLLECTOR_MAP[scenario]["class"]()
+    group = {group!r}
+    items = (CONFIG["GROUPS"].get("ENGLISH_SOURCES", {{}}).get(group) or CONFIG["GROUPS"].get("CHINESE_SOURCES", {{}}).get(group) or {{}}).get("items", [])
+    names = resources_for_items(items, google_enabled=bool(CONFIG.get("ENABLE_GOOGLE_RSS")))
+
+built, missing = [], {{}}
+for name in names:
+    try:
+        if owner is not None:
+            getattr(owner, name)
+        else:
+            from collectors.lazy_resources import build_resource
+            build_resource(name)
+        built.append(name)
+    except ImportError as e:
+        missing[name] = e.name or str(e)
+
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "peak_rss_mb": peak_rss_mb(),
+    "built": built,
+    "missing": missing
+}}))
+"""
+
+def parse_importtime(stderr: str) -> dict:
+    """Cumulative microseconds per top-level package (first dotted component, outermost imports)."""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, raw_name = line[len("import time:"):].split("|", 2)
+        # Outermost imports only: nested ones are indented further and counted in their parent
+        if raw_name.startswith("  "):
+            continue
+        top = raw_name.strip().split(".")[0]
+        packages[top] = packages.get(top, 0) + int(cumulative)
+    return packages
+
+def run_once(scenario: str, group: str = None) -> dict:
+    code = CHILD.format(root=ROOT, scenario=scenario, group=group)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, cwd=ROOT)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["no output"]
+        raise RuntimeError(f"{scenario}: child failed ({tail[0]})")
+    result = json.loads(lines[-1])
+    result["packages"] = parse_importtime(proc.stderr)
+    return result
+
+def bench(scenario: str, repeat: int) -> dict:
+    runs = [run_once(scenario, COLLECTOR_GROUPS.get(scenario)) for _ in range(repeat)]
+    median_run = sorted(runs, key=lambda r: r["seconds"])[len(runs) // 2]
+    return {
+        "scenario": scenario,
+        "seconds": statistics.median(r["seconds"] for r in runs),
+        "import_ms": sum(median_run["packages"].values()) / 1000,
+        "peak_rss_mb": statistics.median(r["peak_rss_mb"] or 0 for r in runs),
+        "built": median_run["built"],
+        "missing": median_run["missing"],
+        "packages": median_run["packages"]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import time and memory per collector")
+    parser.add_argument("--collector", action="append", choices=list(COLLECTOR_GROUPS),
+                        help="Collector scenario (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per scenario (median reported)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level packages listed per scenario")
+    parser.add_argument("--json", action="store_true", help="Also print the results as one JSON line")
+    args = parser.parse_args()
+
+    scenarios = ["import", "eager"] + (args.collector or list(COLLECTOR_GROUPS))
+    results = []
+    for scenario in scenarios:
+        try:
+            results.append(bench(scenario, max(1, args.repeat)))
+        except RuntimeError as e:
+            print(f"⚠️ {e}")
+
+    print(f"\n{'scenario':<12} {'ready s':>8} {'imports ms':>11} {'peak RSS MB':>12}  resources (missing here)")
+    for r in results:
+        missing = f" ({', '.join(f'{k}: {v}' for k, v in r['missing'].items())})" if r["missing"] else ""
+        print(f"{r['scenario']:<12} {r['seconds']:>8.2f} {r['import_ms']:>11.0f} {r['peak_rss_mb']:>12.0f}  "
+              f"{', '.join(r['built']) or '-'}{missing}")
+
+    for r in results:
+        top = sorted(r["packages"].items(), key=lambda kv: kv[1], reverse=True)[:args.top]
+        print(f"\n[{r['scenario']}] slowest imports: " + ", ".join(f"{name} {us / 1000:.0f} ms" for name, us in top))
+
+    if args.json:
+        print(json.dumps(results))
+
+if __name__ == "__main__":
+    main()
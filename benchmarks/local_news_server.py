@@ -0,0 +1,222 @@
+"""
+Local HTTP stand-in for Google News RSS, publisher pages and the Guardian API.
+
+Replays the recorded samples in benchmarks/fixtures/, expanded to any number of
+items per query (unique titles, links and lead paragraphs so the cleaner does not
+collapse them), with injectable latency and errors:
+
+    with LocalNewsServer(items_per_feed=50, latency_ms=80, jitter_ms=40, error_rate=0.02) as server:
+        CONFIG["ENDPOINTS"].update(server.endpoints())
+        ...
+        print(server.stats())
+
+Routes:
+    /rss/search?q=...           Google News RSS (fixture items cycled, pubDates in the last hours)
+    /article/<host>/<slug>      Publisher HTML; <source url> of the feed item names the host
+    /guardian/search?q=...      Guardian Content API JSON (page-size results)
+"""
+import copy
+import email.utils
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+class LocalNewsServer:
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR, items_per_feed: int = 50, hosts: int = 8,
+                 latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0, seed: int = 0,
+                 throttled_hosts=()):
+        """
+        latency_ms / jitter_ms: per-response delay, uniform in [latency - jitter, latency + jitter].
+        error_rate: share of responses (any route) answered with 503 instead.
+        hosts: distinct publisher hosts the feed items are spread over (per-host limits apply to each).
+        throttled_hosts: publisher hosts (e.g. "publisher0.example") whose pages always answer 429.
+        """
+        self.items_per_feed = items_per_feed
+        self.hosts = max(1, hosts)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttled_hosts = set(throttled_hosts)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.active = 0       # Requests being handled right now
+        self.peak_active = 0  # Highest concurrency seen (per-host limit checks)
+
+        with open(os.path.join(fixtures_dir, "google_news_rss.xml"), "rb") as f:
+            self.rss_template = ET.fromstring(f.read())
+        with open(os.path.join(fixtures_dir, "publisher_article.html"), encoding="utf-8") as f:
+            self.article_template = f.read()
+        with open(os.path.join(fixtures_dir, "guardian_search.json"), encoding="utf-8") as f:
+            self.guardian_template = json.load(f)
+        # Vocabulary for the per-article lead paragraph
+        body = self.article_template.split('<div class="article-body">')[1].split("</div>")[0]
+        self.vocabulary = [w for w in body.replace("<p>", " ").replace("</p>", " ").split() if w.isalpha()]
+
+        self.httpd = None
+        self.thread = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # Keep-alive, like the real endpoints
+
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="LocalNewsServer", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def endpoints(self) -> dict:
+        """Values for CONFIG["ENDPOINTS"]."""
+        return {"GOOGLE_NEWS_RSS": f"{self.url}/rss/search", "GUARDIAN": f"{self.url}/guardian/search"}
+
+    def stats(self) -> dict:
+        """{ "<route> <status>": count }"""
+        with self.lock:
+            return dict(sorted(self.counters.items()))
+
+    # ------------------------------------------------------------------
+    # Request handling (server threads)
+    # ------------------------------------------------------------------
+    def _handle(self, handler):
+        parsed = urllib.parse.urlsplit(handler.path)
+        query = urllib.parse.parse_qs(parsed.query)
+        route = parsed.path.split("/")[1] if parsed.path.count("/") >= 1 else ""
+
+        with self.lock:
+            delay = max(0.0, self.rng.uniform(self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms)) / 1000
+            fail = self.rng.random() < self.error_rate
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+        try:
+            if delay:
+                time.sleep(delay)
+            self._respond(handler, parsed, query, route, fail)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def _respond(self, handler, parsed, query, route, fail):
+        if fail:
+            status, content_type, body = 503, "text/plain", b"Service Unavailable (injected)"
+        elif parsed.path == "/rss/search":
+            status, content_type, body = 200, "application/rss+xml; charset=UTF-8", self._rss(query.get("q", [""])[0])
+        elif route == "article" and parsed.path.split("/")[2] in self.throttled_hosts:
+            status, content_type, body = 429, "text/plain", b"Too Many Requests"
+        elif route == "article":
+            status, content_type, body = 200, "text/html; charset=utf-8", self._article(parsed.path)
+        elif parsed.path == "/guardian/search":
+            size = int(query.get("page-size", ["20"])[0])
+            status, content_type, body = 200, "application/json", self._guardian(query.get("q", [""])[0], size)
+        else:
+            status, content_type, body = 404, "text/plain", b"Not Found"
+
+        with self.lock:
+            key = f"{route or '/'} {status}"
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _rss(self, q: str) -> bytes:
+        root = copy.deepcopy(self.rss_template)
+        channel = root.find("channel")
+        templates = channel.findall("item")
+        for item in templates:
+            channel.remove(item)
+        slug = urllib.parse.quote(q.split(" after:")[0].replace(" ", "-"), safe="")
+        now = time.time()
+        for i in range(self.items_per_feed):
+            item = copy.deepcopy(templates[i % len(templates)])
+            host = f"publisher{i % self.hosts}.example"
+            link = f"{self.url}/article/{host}/{slug}-{i}"
+            title, _, publisher = item.findtext("title").rpartition(" - ")
+            item.find("title").text = f"{title} ({q} #{i}) - {publisher}"
+            item.find("link").text = link
+            item.find("guid").text = f"{slug}-{i}"
+            item.find("pubDate").text = email.utils.formatdate(now - 600 * (i + 1), usegmt=True)
+            item.find("description").text = f'<a href="{link}" target="_blank">{title}</a>&nbsp;&nbsp;<font color="#6f6f6f">{publisher}</font>'
+            item.find("source").set("url", f"https://{host}")
+            channel.append(item)
+        return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+    def _article(self, path: str) -> bytes:
+        article_id = path.rsplit("/", 1)[-1]
+        rng = random.Random(article_id)
+        lead = " ".join(rng.choice(self.vocabulary) for _ in range(60))
+        title = f"Export controls update {article_id}"
+        html = self.article_template.replace(
+            "US tightens chip export rules as Nvidia, AMD weigh China sales", title
+        ).replace(
+            '<div class="article-body">', f'<div class="article-body">\n<p>{article_id}: {lead}.</p>', 1
+        )
+        return html.encode("utf-8")
+
+    def _guardian(self, q: str, size: int) -> bytes:
+        data = copy.deepcopy(self.guardian_template)
+        templates = data["response"]["results"]
+        results = []
+        for i in range(size):
+            item = copy.deepcopy(templates[i % len(templates)])
+            item["id"] = f"{item['id']}-{i}"
+            item["webTitle"] = f"{item['webTitle']} ({q} #{i})"
+            item["webUrl"] = f"{item['webUrl']}-{i}"
+            item["fields"]["bodyText"] = f"{q} #{i}. {item['fields']['bodyText']}"
+            results.append(item)
+        data["response"].update(results=results, total=size, pageSize=size)
+        return json.dumps(data).encode("utf-8")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve the recorded news fixtures locally")
+    parser.add_argument("--items-per-feed", type=int, default=50)
+    parser.add_argument("--hosts", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    with LocalNewsServer(items_per_feed=args.items_per_feed, hosts=args.hosts, latency_ms=args.latency_ms,
+                         jitter_ms=args.jitter_ms, error_rate=args.error_rate) as server:
+        print(f"Serving on {server.url}  (endpoints: {server.endpoints()})  Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
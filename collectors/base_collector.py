@@ -1,37 +1,48 @@
 import logging
 import os
 import concurrent.futures
+import time
 from datetime import datetime
 import config
 from utils.utils_data import StatsTracker, save_custom_json
-from data_sources.YFinance_Fetcher import YFinanceFetcher
-from data_sources.Akshare_Fetcher import AkshareFetcher
-from data_sources.GoogleNews_RSS_Fetcher import GoogleNewsRSSFetcher
-from data_sources.Guardian_Fetcher import GuardianFetcher
-from data_sources.OpenBB_NewsFetcher import OpenBBNewsFetcher
-from processors.DataCleaner import DataCleaner
-
-class BaseCollector:
-    def __init__(self):
+from collectors.lazy_resources import LazyResources, build_resource, is_ticker, YF_TYPES, AK_TYPES, OBB_TYPES
+from utils.metrics import write_metrics
+from utils.watermark_store import get_watermark_store
+from utils.backfill import Backfill
+from utils.journal import Journal
+
+class BaseCollector(LazyResources):
+    def __init__(self, shared=None):
+        """
+        shared: optional SharedResources (parallel mode). When given, fetchers,
+        cleaner and work pool are reused instead of built per collector.
+        Fetchers and the cleaner are built on first use (collectors/lazy_resources.py),
+        so a group only imports the data-source libraries its item types need.
+        """
+        super().__init__()
         self.logger = logging.getLogger(self.__class__.__name__)
         self.stats = StatsTracker()
-        # Initialize Cleaner (language agnostic mostly, or pass specific)
-        self.cleaner = DataCleaner()
-        
-        # Initialize Data Sources
-        self.yf_fetcher = YFinanceFetcher(self.stats)
-        self.ak_fetcher = AkshareFetcher(self.stats)
-        self.google_fetcher = GoogleNewsRSSFetcher(self.stats)
-        self.guardian_fetcher = GuardianFetcher(self.stats)
-        self.obb_fetcher = OpenBBNewsFetcher(self.stats)
+        self.shared = shared
         
         self.config = config.CONFIG
         self.results = []
+        self.is_historical = False # Set by collect_group when a date range is given
+        self.checkpoint = None # Journal of the last collect_group (removed once the report is saved)
+        self.group_key = None # Last collect_group (cross-run index scope)
+        self.pending_vectors = [] # (index, vectors) kept by process_and_clean, added once the report is saved
+
+    def _build(self, name):
+        if self.shared:
+            return getattr(self.shared, name)
+        return build_resource(name, self.stats)
     
-    def fetch_item(self, item, cat_name, start_date=None, end_date=None):
+    def fetch_item(self, item, cat_name, start_date=None, end_date=None, prefetched=None, include_google=True):
         """
         Generic fetch logic refactored from main.py
+        prefetched: optional { "yf": {...}, "obb": {...} } from _prefetch_tickers (per symbol).
+        include_google: False when Google RSS is fetched per window (utils/backfill.py).
         """
+        prefetched = prefetched or {}
         name = item.get("name")
         val = item.get("value")
         itype = item.get("type", "keyword")
@@ -39,19 +50,22 @@ class BaseCollector:
         fetched_data = []
 
         # --- Sub-Strategy A: Stock Tickers (YFinance/Akshare/OpenBB) ---
-        if "stock" in itype or "index" in itype or "etf" in itype or "future" in itype:
+        if is_ticker(itype):
             # 1. YFinance
-            if itype in ["stock_us", "index_us", "index_hk", "etf_zh", "future_foreign", "stock_hk", "stock_vn"]:
+            if itype in YF_TYPES:
                 # PROPER METHOD NAME: fetch
                 # Note: YFetcher likely does not support historical yet. 
                 # We prioritize GoogleRSS for history anyway as per plan.
-                yf_news = self.yf_fetcher.fetch(val)
+                if val in prefetched.get("yf", {}):
+                    yf_news = [dict(n) for n in prefetched["yf"][val]]
+                else:
+                    yf_news = self.yf_fetcher.fetch(val)
                 if yf_news:
                     self._tag(yf_news, cat_name)
                     fetched_data.extend(yf_news)
 
             # 2. AkShare
-            if itype in ["stock_zh_a", "etf_zh", "index_hk", "stock_hk"]:
+            if itype in AK_TYPES:
                 # PROPER METHOD NAME: fetch_stock_news
                 # Akshare typically returns latest.
                 ak_news = self.ak_fetcher.fetch_stock_news(val)
@@ -60,8 +74,11 @@ class BaseCollector:
                     fetched_data.extend(ak_news)
 
             # 3. OpenBB (Supplement)
-            if itype in ["stock_us"]:
-                obb_news = self.obb_fetcher.fetch_company_news(val)
+            if itype in OBB_TYPES:
+                if val in prefetched.get("obb", {}):
+                    obb_news = [dict(n) for n in prefetched["obb"][val]]
+                else:
+                    obb_news = self.obb_fetcher.fetch_company_news([val])
                 if obb_news:
                     self._tag(obb_news, cat_name)
                     fetched_data.extend(obb_news)
@@ -75,10 +92,11 @@ class BaseCollector:
                 
                 # Try English Fetch
                 # PASS DATES HERE
-                g_news = self.google_fetcher.fetch(query=val, lang="en-US", geo="US", limit=limit, start_date=start_date, end_date=end_date)
-                if g_news:
-                    self._tag(g_news, cat_name)
-                    fetched_data.extend(g_news)
+                if include_google:
+                    g_news = self.google_fetcher.fetch(query=val, lang="en-US", geo="US", limit=limit, start_date=start_date, end_date=end_date)
+                    if g_news:
+                        self._tag(g_news, cat_name)
+                        fetched_data.extend(g_news)
 
                 # 2. Guardian (High Quality)
                 if self.config.get("GUARD_API_KEY") or os.getenv("GUARDIAN_API_KEY"):
@@ -104,24 +122,115 @@ class BaseCollector:
             self.logger.error(f"Group {group_key} not found in Config!")
             return []
 
+        self.is_historical = bool(start_date and end_date)
+        self.group_key = group_key
+        watermarks = get_watermark_store()
+        if watermarks:
+            # Keywords shared by two groups keep one watermark per group
+            watermarks.set_group(self.stats, group_key)
         items = target_group.get("items", [])
         desc = target_group.get("desc", group_key)
         self.logger.info(f"🚀 Collecting {group_key} ({len(items)} items)...")
 
         results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            # PASS DATES HERE
-            future_to_item = {executor.submit(self.fetch_item, item, group_key, start_date, end_date): item for item in items}
-            for future in concurrent.futures.as_completed(future_to_item):
-                try:
-                    data = future.result()
-                    if data:
-                        results.extend(data)
-                except Exception as e:
-                    self.logger.error(f"Error fetching item: {e}", exc_info=True)
+        with self.stats.stage("fetch"):
+            if self.is_historical and self.config.get("BACKFILL", {}).get("ENABLED", False):
+                # Windowed, checkpointed fetch (long ranges exceed the ~100 entry feed cap)
+                backfill = Backfill(self, group_key, start_date, end_date)
+                self.checkpoint = backfill.journal
+                results = backfill.run(items)
+            else:
+                # Items finished by a crashed run of the same group/range are replayed, not refetched
+                self.checkpoint, done = self._open_checkpoint(group_key, start_date, end_date)
+                for item in items:
+                    if _item_key(item) in done:
+                        results.extend(done[_item_key(item)])
+                pending = [item for item in items if _item_key(item) not in done]
+                if len(pending) < len(items):
+                    self.stats.update("Checkpoint (Resumed)", len(items) - len(pending))
+                    self.logger.info(f"♻️ Resuming {group_key}: {len(items) - len(pending)} items from checkpoint, {len(pending)} to fetch.")
+
+                if self.shared:
+                    with self.shared.stats.bind(self.stats):
+                        prefetched = self._prefetch_tickers(pending)
+                    # Parallel mode: global work pool shared with the other collectors
+                    # PASS DATES HERE
+                    future_to_item = {self.shared.executor.submit(self._fetch_item_bound, item, group_key, start_date, end_date, prefetched): item for item in pending}
+                    self._gather_results(future_to_item, results)
+                else:
+                    prefetched = self._prefetch_tickers(pending)
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+                        # PASS DATES HERE
+                        future_to_item = {executor.submit(self.fetch_item, item, group_key, start_date, end_date, prefetched): item for item in pending}
+                        self._gather_results(future_to_item, results)
+                if self.checkpoint:
+                    self.checkpoint.close()
         
         return results
 
+    def _open_checkpoint(self, group_key, start_date=None, end_date=None):
+        """
+        Per-item journal for this group and range: (Journal or None, { item key: results }).
+        A recent-news journal older than MAX_AGE_HOURS belongs to an earlier run and is dropped.
+        """
+        conf = self.config.get("COLLECTION", {}).get("CHECKPOINT", {})
+        if not conf.get("ENABLED", False):
+            return None, {}
+        scope = f"{start_date}_{end_date}" if start_date and end_date else "recent"
+        journal = Journal(os.path.join(conf.get("DIR", os.path.join("cache", "checkpoints")), f"{group_key}_{scope}.ndjson"))
+        try:
+            age_hours = (time.time() - os.path.getmtime(journal.path)) / 3600
+        except OSError:
+            return journal, {}
+        if scope == "recent" and age_hours > conf.get("MAX_AGE_HOURS", 12):
+            self.logger.info(f"Discarding stale checkpoint {journal.path} ({age_hours:.1f}h old).")
+            journal.remove()
+            return journal, {}
+        return journal, {record["key"]: record.get("results", []) for record in journal.replay()}
+
+    def _prefetch_tickers(self, items):
+        """
+        Batched ticker stage: YFinance and OpenBB news for all batchable tickers of the
+        group in a few grouped calls. fetch_item then picks its symbol's share.
+        """
+        conf = self.config.get("COLLECTION", {}).get("TICKER_BATCH", {})
+        if not conf.get("ENABLED", False):
+            return {}
+        types = conf.get("TYPES", ["stock_us", "index_us", "stock_hk"])
+        symbols = list(dict.fromkeys(i.get("value") for i in items if i.get("type") in types and i.get("value")))
+        if not symbols:
+            return {}
+
+        self.logger.info(f"📦 Batched ticker fetch for {len(symbols)} symbols...")
+        prefetched = {"yf": self.yf_fetcher.fetch_many(symbols, max_workers=conf.get("YF_WORKERS", 5))}
+        # OpenBB only supplements US stocks (see fetch_item)
+        obb_symbols = list(dict.fromkeys(i.get("value") for i in items if i.get("type") == "stock_us" and i.get("value") in symbols))
+        if obb_symbols:
+            prefetched["obb"] = self.obb_fetcher.fetch_company_news_grouped(obb_symbols, batch_size=conf.get("OPENBB_BATCH_SIZE", 20))
+        return prefetched
+
+    def _gather_results(self, future_to_item, results):
+        for future in concurrent.futures.as_completed(future_to_item):
+            try:
+                data = future.result()
+            except Exception as e:
+                # Not checkpointed: a rerun tries the item again
+                self.logger.error(f"Error fetching item: {e}", exc_info=True)
+                continue
+            if self.checkpoint:
+                try:
+                    self.checkpoint.append({"key": _item_key(future_to_item[future]), "results": data or []})
+                except OSError as e:
+                    self.logger.warning(f"Checkpoint write failed ({e}). Continuing without checkpoint.")
+                    self.checkpoint = None
+            if data:
+                results.extend(data)
+
+    def _fetch_item_bound(self, *args):
+        """fetch_item on a shared pool thread, with shared fetchers reporting into self.stats."""
+        with self.shared.stats.bind(self.stats):
+            return self.fetch_item(*args)
+
     def process_and_clean(self, raw_data, language="ENGLISH"):
         """
         Deduplication and Cleaning Steps.
@@ -135,7 +244,10 @@ class BaseCollector:
             return []
 
         mapped_data = { "RawData": raw_data }
-        cleaned_map = self.cleaner.clean_data(mapped_data, language=language)
+        # Historical fetches neither consult nor feed the cross-run index
+        with self.stats.stage("clean"):
+            cleaned_map = self.cleaner.clean_data(mapped_data, language=language, cross_run=not self.is_historical,
+                                                  scope=self.group_key or "default", pending=self.pending_vectors)
         return cleaned_map.get("RawData", [])
 
     def save_report(self, filename, cleaned_data, stats_report, raw_data=None):
@@ -170,6 +282,50 @@ class BaseCollector:
         }
         abs_path = os.path.abspath(os.path.join("data", filename))
         os.makedirs(os.path.dirname(abs_path), exist_ok=True)
-        save_custom_json(final_output, abs_path)
+        with self.stats.stage("save"):
+            if self.config.get("REPORT_FORMAT", "json") == "archive":
+                from utils.report_archive import write_report_archive # zstandard / pyarrow only when used
+                # Columnar zip: smaller attachments, per-column / per-category reloads
+                abs_path = os.path.splitext(abs_path)[0] + ".zip"
+                codec = write_report_archive(final_output, abs_path, codec=self.config.get("REPORT_ARCHIVE_CODEC", "auto"))
+                self.logger.info(f"Archive codec: {codec}")
+            else:
+                save_custom_json(final_output, abs_path)
         self.logger.info(f"Saved {abs_path}")
+        self.export_metrics(os.path.splitext(abs_path)[0])
+
+        # Report is on disk: a rerun of the same range starts over instead of resuming
+        if self.checkpoint:
+            self.checkpoint.remove()
+            self.checkpoint = None
+
+        # Report is on disk: later runs may treat its stories as already reported
+        if self.pending_vectors:
+            added = 0
+            for index, vectors in self.pending_vectors:
+                index.add(vectors)
+                added += len(vectors)
+            self.pending_vectors = []
+            self.logger.info(f"🧭 Cross-run index: remembered {added} reported items.")
+
+        # Report is on disk: the next incremental run may start after what this one saw
+        watermarks = get_watermark_store()
+        if watermarks:
+            committed = watermarks.commit(self.stats)
+            if committed:
+                self.logger.info(f"🔖 Watermarks advanced for {committed} queries.")
         return final_output, abs_path
+
+    def export_metrics(self, base_path):
+        """Stage timings, latency histograms and counters next to the report (.metrics.json + .prom)."""
+        if not self.config.get("METRICS", {}).get("EXPORT", True):
+            return
+        try:
+            paths = write_metrics(self.stats.metrics(), base_path, const_labels={"report": os.path.basename(base_path)})
+            self.logger.info(f"📊 Metrics: {', '.join(os.path.basename(p) for p in paths)}")
+        except Exception as e:
+            self.logger.warning(f"Metrics export failed: {e}")
+
+def _item_key(item) -> str:
+    """Checkpoint key of a group item (the same value can appear with different types)."""
+    return f"{item.get('type', 'keyword')}:{item.get('value')}"
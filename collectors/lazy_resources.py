@@ -0,0 +1,72 @@
+import abc
+import importlib
+import threading
+
+# Attribute -> (module, class). Imported on first access, so a run only loads the
+# libraries its group items need (yfinance, akshare, openbb, newspaper/bs4/feedparser,
+# numpy + sentence-transformers for the cleaner).
+RESOURCES = {
+    "yf_fetcher": ("data_sources.YFinance_Fetcher", "YFinanceFetcher"),
+    "ak_fetcher": ("data_sources.Akshare_Fetcher", "AkshareFetcher"),
+    "google_fetcher": ("data_sources.GoogleNews_RSS_Fetcher", "GoogleNewsRSSFetcher"),
+    "guardian_fetcher": ("data_sources.Guardian_Fetcher", "GuardianFetcher"),
+    "obb_fetcher": ("data_sources.OpenBB_NewsFetcher", "OpenBBNewsFetcher"),
+    "cleaner": ("processors.DataCleaner", "DataCleaner"),
+}
+
+# Item types per ticker source (BaseCollector.fetch_item)
+YF_TYPES = ("stock_us", "index_us", "index_hk", "etf_zh", "future_foreign", "stock_hk", "stock_vn")
+AK_TYPES = ("stock_zh_a", "etf_zh", "index_hk", "stock_hk")
+OBB_TYPES = ("stock_us",)
+
+def build_resource(name: str, stats=None):
+    module_name, class_name = RESOURCES[name]
+    cls = getattr(importlib.import_module(module_name), class_name)
+    return cls() if name == "cleaner" else cls(stats)
+
+def is_ticker(itype: str) -> bool:
+    return "stock" in itype or "index" in itype or "etf" in itype or "future" in itype
+
+def resources_for_items(items: list, google_enabled: bool = True) -> list[str]:
+    """RESOURCES a group's items will touch in fetch_item (plus the cleaner), in RESOURCES order."""
+    needed = {"cleaner"}
+    for item in items:
+        itype = item.get("type", "keyword")
+        if is_ticker(itype):
+            if itype in YF_TYPES:
+                needed.add("yf_fetcher")
+            if itype in AK_TYPES:
+                needed.add("ak_fetcher")
+            if itype in OBB_TYPES:
+                needed.add("obb_fetcher")
+        if (itype == "keyword" or "desc" in item) and google_enabled:
+            needed.update(("google_fetcher", "guardian_fetcher"))
+    return [name for name in RESOURCES if name in needed]
+
+class LazyResources(abc.ABC):
+    """
+    Fetchers and the DataCleaner as attributes built on first access (thread-safe).
+    Subclasses call super().__init__() and implement _build(name).
+    Assigning an attribute directly still works.
+    """
+    def __init__(self):
+        self._lazy_lock = threading.RLock()
+
+    def __getattr__(self, name):
+        # Only called for missing attributes
+        lock = self.__dict__.get("_lazy_lock")
+        if name not in RESOURCES:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        if lock is None:
+            raise AttributeError(f"{type(self).__name__}.{name}: LazyResources.__init__ was not called")
+        with lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = self._build(name)
+        return self.__dict__[name]
+
+    @abc.abstractmethod
+    def _build(self, name):
+        """The resource for attribute `name` (a key of RESOURCES)."""
+
+    def loaded_resources(self) -> list[str]:
+        return [name for name in RESOURCES if name in self.__dict__]
@@ -0,0 +1,29 @@
+import logging
+import concurrent.futures
+from utils.utils_data import StatsRouter
+from collectors.lazy_resources import LazyResources, build_resource
+
+logger = logging.getLogger(__name__)
+
+class SharedResources(LazyResources):
+    """
+    One fetcher layer, one DataCleaner and one bounded work pool for collectors
+    running at the same time (main.py --parallel-collectors N).
+    Fetchers report into a StatsRouter, so each collector still gets its own stats:
+    BaseCollector binds its StatsTracker while its items are being fetched.
+    Fetchers and the cleaner are built when the first collector needs them.
+    """
+    def __init__(self, max_workers: int = 20):
+        super().__init__()
+        self.stats = StatsRouter()
+
+        # Global bound on concurrent fetch_item calls across ALL collectors
+        self.max_workers = max_workers
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        logger.info(f"Shared resources ready (work pool: {max_workers} workers).")
+
+    def _build(self, name):
+        return build_resource(name, self.stats)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -19,10 +19,171 @@ import os
 CONFIG = {
     "DAYS_BACK": 7,  # 回溯天数
     "OUTPUT_FILE": "news_result.json",
+    "JSON_ENCODER": "orjson", # Report items via orjson when installed (same bytes), else "json"
+    "REPORT_FORMAT": "json",     # "archive": columnar zip (utils/report_archive.py), cleaned_data as row references
+    "REPORT_ARCHIVE_CODEC": "auto", # "auto" (zstd if installed) | "zstd" | "deflate" | "parquet" (pyarrow)
     # [NEW] Feature Flag
     "ENABLE_GOOGLE_RSS": True, # [OPTIMIZED] Re-enabled with Concurrent scraping + Date Filtering
     "SERP_API_KEY": os.getenv("Serp_API_KEY"),
-    
+
+    "ENDPOINTS": {
+        # API base URLs (overridden by benchmarks/local_news_server.py for offline runs)
+        "GOOGLE_NEWS_RSS": "https://news.google.com/rss/search",
+        "GUARDIAN": "https://content.guardianapis.com/search",
+    },
+    # ---------------------------------------------------
+    # Article Scraping (Google RSS full-text)
+    # ---------------------------------------------------
+    "SCRAPING": {
+        # "threads": newspaper3k download in a per-fetch ThreadPool (MAX_WORKERS)
+        # "async":   shared aiohttp engine (requires aiohttp), hundreds of downloads in flight
+        "BACKEND": "threads",
+        "MAX_WORKERS": 10,
+        "REQUEST_TIMEOUT": 10,
+        "ASYNC_MAX_CONCURRENCY": 256, # Global in-flight downloads (all collectors)
+        "ASYNC_PER_HOST_LIMIT": 32,   # In-flight downloads per host
+        "HOST_LIMITER": {
+            # Per publisher host: token bucket + AIMD concurrency, adapted to latency / 403-429-503
+            "ENABLED": True,
+            "INITIAL_LIMIT": 4,   # Concurrent downloads per host at start
+            "MIN_LIMIT": 1,
+            "MAX_LIMIT": 32,      # <= ASYNC_PER_HOST_LIMIT
+            "RATE": 2.0,          # Requests/second per host at start
+            "MIN_RATE": 0.2,
+            "MAX_RATE": 20.0,
+            "BURST": 4,
+            "LATENCY_TARGET": 5.0, # Seconds; slower answers shrink the limit
+            "MAX_WAIT": 30,       # Seconds waiting for a slot before falling back to the snippet
+        },
+    },
+
+    "RESILIENCE": {
+        # Library-backed sources (YFinance, Akshare): retries with jittered exponential backoff
+        "RETRIES": 5,
+        "BASE_DELAY": 1.0,      # Seconds, doubled per attempt (full jitter)
+        "MAX_DELAY": 8.0,
+        "BREAKER": {
+            # Per source: after N consecutive failed attempts, fail fast for COOLDOWN seconds
+            "FAILURE_THRESHOLD": 6,
+            "COOLDOWN": 60,
+        },
+    },
+
+    "EMAIL": {
+        "SMTP_SERVER": "smtp.qq.com",
+        "SMTP_PORT": 465,
+        "MAX_MESSAGE_MB": 25,          # Known server limit; the server's ESMTP SIZE wins if lower
+        "COMPRESS_ATTACHMENTS": True,  # All report files in one in-memory zip
+    },
+
+    "INCREMENTAL": {
+        # Newest published per (group, source, query, locale) in cache/watermarks.sqlite3
+        "ENABLED": True,
+        "MODE": "since_last_run",   # Skip entries older than the last saved run | "full": whole window (CLI: --full)
+        "OVERLAP_MINUTES": 60,      # Re-check this much before the watermark (late-indexed stories; cleaner dedups)
+    },
+
+    "BACKFILL": {
+        # --start-date/--end-date split into windows (CLI: --backfill [--window-days N])
+        "ENABLED": False,
+        "WINDOW_DAYS": 1,              # Google RSS days per (keyword, window); saturated windows are halved
+        "SPLIT_AT": 90,                # Feed entries at which a window counts as saturated (cap ~100)
+        "MAX_PARALLEL_WINDOWS": 8,     # Windows in flight, all collectors together
+        "CHECKPOINT_DIR": "cache/backfill", # Finished windows per group/range; resume after a crash
+    },
+
+    "METRICS": {
+        # Per report: <report>.metrics.json + <report>.prom (Prometheus textfile format)
+        "EXPORT": True,
+    },
+
+    "MESSAGE_BUS": {
+        # Delivery targets, each with its own bounded queue and worker thread (core/sinks.py)
+        "SINKS": ["email"],            # Any of "email", "file", "webhook"
+        "QUEUE_SIZE": 16,              # Pending messages per sink
+        "PUT_TIMEOUT": 0.5,            # Seconds publish() waits on a full sink queue before dropping
+        "SHUTDOWN_TIMEOUT": 300,       # Seconds to drain queues at exit
+        "FILE_PATH": "data/outbox.ndjson",
+        "FILE_INCLUDE_DATA": False,    # Full payload in each line (else summary only)
+        "WEBHOOK_URL": os.getenv("NEWS_WEBHOOK_URL"),
+        "WEBHOOK_TIMEOUT": 10,
+    },
+
+    "SCHEDULER": {
+        # main.py --serve: per-group cadences (COLLECTOR_MAP keys); edits apply without a restart
+        "DEFAULTS": {"INTERVAL_MINUTES": 120, "JITTER_SECONDS": 300, "PRIORITY": 100},
+        "GROUPS": {
+            "US_TECH": {"INTERVAL_MINUTES": 60, "PRIORITY": 10},
+            "MACRO": {"INTERVAL_MINUTES": 60, "PRIORITY": 20},
+            "STAR50": {"INTERVAL_MINUTES": 90, "PRIORITY": 30},
+            # "VIETNAM": {"ENABLED": False},
+        },
+        "MAX_PARALLEL": 2,             # Groups running at once (lower PRIORITY first when more are due)
+        "RUN_ON_START": True,          # Every group once at startup (spread by its jitter)
+        "WARM_UP": True,               # Load cleaning models before the first run
+        "DISPATCH": {
+            "TIMES": ["08:00", "18:00"], # Daily local times; empty -> every INTERVAL_MINUTES
+            "INTERVAL_MINUTES": 240,
+            "ON_STOP": True,           # Send what is pending on shutdown (SIGTERM / Ctrl+C)
+        },
+        "RELOAD_CHECK_SECONDS": 30,    # config.py mtime polling
+    },
+
+    "HTTP": {
+        # Shared keep-alive session (data_sources/http_client.py) for RSS, Guardian, NewsAPI, article downloads
+        "POOL_CONNECTIONS": 32, # Hosts kept in the pool cache
+        "POOL_MAXSIZE": 32,     # Keep-alive sockets per host (>= SCRAPING.MAX_WORKERS)
+        "TIMEOUT": 10,          # Seconds, default for every request
+        "RETRIES": 2,           # Connect errors / 5xx, exponential backoff
+        "BACKOFF_FACTOR": 0.5,
+    },
+
+    # ---------------------------------------------------
+    # Collection Orchestration
+    # ---------------------------------------------------
+    "COLLECTION": {
+        # Shared fetch_item pool for --parallel-collectors (all groups together)
+        "WORK_POOL_SIZE": 20,
+        "TICKER_BATCH": {
+            # Per group, before the per-item fan-out: grouped OpenBB calls + batched yfinance lookups
+            "ENABLED": True,
+            "TYPES": ["stock_us", "index_us", "stock_hk"],
+            "OPENBB_BATCH_SIZE": 20, # Symbols per obb.news.company call
+            "YF_WORKERS": 5,         # Concurrent yfinance news requests
+        },
+        "CHECKPOINT": {
+            # Per-item results appended to cache/checkpoints/<group>_<range>.ndjson as each item finishes;
+            # a rerun after a crash replays them and fetches only the missing items
+            "ENABLED": True,
+            "DIR": "cache/checkpoints",
+            "MAX_AGE_HOURS": 12,     # Older recent-news journals belong to an earlier run and are dropped
+        },
+    },
+
+    # ---------------------------------------------------
+    # Local Caches (persisted between runs)
+    # ---------------------------------------------------
+    "CACHE": {
+        "DIR": "cache",
+        "ARTICLES": {
+            # Extracted title/text/authors per article URL
+            "ENABLED": True,
+            "TTL_HOURS": 192,      # > DAYS_BACK window, stories stay in RSS ~7 days
+            "MAX_ENTRIES": 50000,  # LRU eviction beyond this
+        },
+        "EMBEDDINGS": {
+            # Sentence embeddings keyed by hash(model + text), numpy memmap + index
+            "ENABLED": True,
+            "MAX_AGE_DAYS": 30,    # Drop vectors unused for this long
+            "MAX_ENTRIES": 200000, # Least recently used beyond this are dropped (checked on every write)
+        },
+        "FEEDS": {
+            # ETag / Last-Modified + entries per feed query (conditional GET, 304 reuse)
+            "ENABLED": True,
+            "MAX_AGE_DAYS": 14,
+        },
+    },
+
     # ---------------------------------------------------
     # Data Cleaning / Deduplication Configuration
     # ---------------------------------------------------
@@ -39,6 +200,22 @@ CONFIG = {
             # Options: "shibing624/text2vec-base-chinese", "BAAI/bge-large-zh-v1.5", "paraphrase-multilingual-MiniLM-L12-v2"
             "MODEL_NAME": "paraphrase-multilingual-MiniLM-L12-v2", 
             "SIMILARITY_THRESHOLD": 0.85, 
+        },
+
+        # In-run clustering (community detection over embeddings)
+        "CLUSTERING": {
+            "BACKEND": "blocked",  # "blocked" (tiled, sparse) or "sentence_transformers" (O(n^2) memory)
+            "BLOCK_SIZE": 2048,    # Tile edge for similarity blocks
+            "LSH_BITS": 0,         # >0 enables random-projection prefilter (approximate, for 100k+ backfills)
+            "LSH_TABLES": 4,
+        },
+
+        # Cross-run dedup: drop stories the same group already reported in the last N days
+        # (one index per group, fed only once the report is saved)
+        "CROSS_RUN": {
+            "ENABLED": False,      # Opt-in
+            "RETENTION_DAYS": 7,   # Older day partitions are deleted
+            "BACKEND": "exact",    # "exact" (numpy) or "hnsw" (requires hnswlib)
         }
     },
 
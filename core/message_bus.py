@@ -1,77 +1,216 @@
+import concurrent.futures
 import logging
-from formatters.email_formatter import EmailFormatter
+import queue
+import threading
+import time
+from datetime import datetime
 from dispatchers.email_dispatcher import EmailDispatcher
+from core.sinks import EmailSink, FileSink, WebhookSink
+from config import CONFIG
 import os
 
+_STOP = object() # Worker shutdown sentinel
+
+def build_default_sinks(conf: dict) -> list:
+    """Sinks listed in CONFIG["MESSAGE_BUS"]["SINKS"]."""
+    sinks = []
+    for name in conf.get("SINKS", ["email"]):
+        if name == "email":
+            email_conf = CONFIG.get("EMAIL", {})
+            sinks.append(EmailSink(EmailDispatcher(
+                smtp_server=email_conf.get("SMTP_SERVER", "smtp.qq.com"),
+                smtp_port=email_conf.get("SMTP_PORT", 465),
+                sender_email=os.getenv("SENDER_EMAIL"),
+                sender_password=os.getenv("SENDER_PASSWORD"),
+                receiver_email=os.getenv("RECEIVER_EMAIL"),
+                max_message_bytes=int(email_conf.get("MAX_MESSAGE_MB", 25) * 1024 * 1024),
+                compress_attachments=email_conf.get("COMPRESS_ATTACHMENTS", True)
+            )))
+        elif name == "file":
+            sinks.append(FileSink(conf.get("FILE_PATH", "data/outbox.ndjson"), include_data=conf.get("FILE_INCLUDE_DATA", False)))
+        elif name == "webhook":
+            if not conf.get("WEBHOOK_URL"):
+                logging.getLogger("MessageBus").warning("⚠️ Webhook sink enabled without WEBHOOK_URL. Skipping it.")
+                continue
+            sinks.append(WebhookSink(conf["WEBHOOK_URL"], timeout=conf.get("WEBHOOK_TIMEOUT", 10)))
+        else:
+            logging.getLogger("MessageBus").warning(f"⚠️ Unknown sink '{name}'. Skipping it.")
+    return sinks
+
+class _SinkWorker:
+    """Bounded queue + delivery thread + counters for one sink."""
+    def __init__(self, sink, queue_size: int):
+        self.sink = sink
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.peak_depth = 0
+        self.latency_total = 0.0 # Seconds, over delivered + failed
+        self.latency_max = 0.0
+        self.latency_last = None
+        self.thread = threading.Thread(target=self._run, name=f"sink-{sink.name}", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        logger = logging.getLogger("MessageBus")
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                message, outcome = item
+                start = time.perf_counter()
+                try:
+                    ok = self.sink.deliver(message)
+                except Exception as e:
+                    logger.error(f"❌ Sink '{self.sink.name}' failed on '{message['topic']}': {e}")
+                    ok = False
+                latency = time.perf_counter() - start
+                with self.lock:
+                    self.latency_total += latency
+                    self.latency_max = max(self.latency_max, latency)
+                    self.latency_last = latency
+                    if ok:
+                        self.delivered += 1
+                    else:
+                        self.failed += 1
+                if outcome is not None:
+                    outcome.set_result(bool(ok))
+            finally:
+                self.queue.task_done()
+
+    def put(self, message, timeout: float, outcome: concurrent.futures.Future = None) -> bool:
+        """Queue message; outcome (if given) is resolved with the delivery result."""
+        try:
+            self.queue.put((message, outcome), timeout=timeout)
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+            return False
+        with self.lock:
+            self.peak_depth = max(self.peak_depth, self.queue.qsize())
+        return True
+
+    def wait_idle(self, deadline) -> bool:
+        """Block until every queued message was handled (Queue.join with a deadline)."""
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def metrics(self) -> dict:
+        with self.lock:
+            handled = self.delivered + self.failed
+            return {
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "queue_depth": self.queue.qsize(),
+                "peak_depth": self.peak_depth,
+                "latency_ms": {
+                    "avg": int(self.latency_total / handled * 1000) if handled else None,
+                    "max": int(self.latency_max * 1000) if handled else None,
+                    "last": int(self.latency_last * 1000) if handled else None
+                }
+            }
+
 class MessageBus:
-    def __init__(self):
+    """
+    Fan-out of published reports to sinks (email, NDJSON file, webhook).
+    publish() only enqueues: every sink has its own bounded queue and worker thread,
+    so a slow or failing sink neither blocks collection nor the other sinks.
+    Call shutdown() before exiting to drain the queues.
+    """
+    def __init__(self, sinks=None):
         self.logger = logging.getLogger("MessageBus")
-        self.email_formatter = EmailFormatter()
-        
-        # Initialize Email Dispatcher from Env/Config
-        self.email_dispatcher = EmailDispatcher(
-            smtp_server="smtp.qq.com",
-            smtp_port=465,
-            sender_email=os.getenv("SENDER_EMAIL"),
-            sender_password=os.getenv("SENDER_PASSWORD"),
-            receiver_email=os.getenv("RECEIVER_EMAIL")
-        )
+        conf = CONFIG.get("MESSAGE_BUS", {})
+        self.put_timeout = conf.get("PUT_TIMEOUT", 0.5)
+        self.shutdown_timeout = conf.get("SHUTDOWN_TIMEOUT", 300)
+        self.queue_size = conf.get("QUEUE_SIZE", 16)
+        self.workers = {}
+        self.closed = False
+        for sink in (build_default_sinks(conf) if sinks is None else sinks):
+            self.subscribe(sink)
+
+    def subscribe(self, sink):
+        """Attach a sink (anything with name / deliver(message) / close()). Names must be unique."""
+        if sink.name in self.workers:
+            raise ValueError(f"Sink '{sink.name}' already subscribed")
+        self.workers[sink.name] = _SinkWorker(sink, self.queue_size)
 
     def publish(self, topic, data, meta=None):
         """
-        Publish data to a topic. For now, topic maps to "Email Subject".
+        Queue a message for every sink. Returns the number of sinks that accepted it
+        (a sink whose queue stays full for PUT_TIMEOUT seconds drops the message).
+        """
+        return sum(self._publish(topic, data, meta, track=False).values())
+
+    def publish_and_wait(self, topic, data, meta=None, timeout: float = None) -> dict:
+        """
+        publish() and block until every sink handled the message (up to timeout,
+        default SHUTDOWN_TIMEOUT). Returns { sink: True if delivered }; a dropped,
+        failed or still-queued message is False.
         """
+        timeout = self.shutdown_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        outcomes = self._publish(topic, data, meta, track=True)
+        delivered = {}
+        for name, outcome in outcomes.items():
+            try:
+                delivered[name] = bool(outcome and outcome.result(timeout=max(0.0, deadline - time.monotonic())))
+            except concurrent.futures.TimeoutError:
+                self.logger.warning(f"⚠️ Sink '{name}' still busy after {timeout}s with '{topic}'.")
+                delivered[name] = False
+        return delivered
+
+    def _publish(self, topic, data, meta, track: bool) -> dict:
+        """{ sink: Future of the delivery (track) or True, False if dropped }"""
+        if self.closed:
+            raise RuntimeError("MessageBus is shut down")
         self.logger.info(f"📨 Received message for topic: {topic}")
-        
-        # Prepare Attachments
-        attachments = []
-        if meta:
-            # Single file legacy support
-            if "filename" in meta:
-                fpath = meta["filename"]
-                if os.path.exists(fpath):
-                    attachments.append(fpath)
-            
-            # Multiple files support (Unified Report)
-            if "filenames" in meta and isinstance(meta["filenames"], list):
-                for fpath in meta["filenames"]:
-                    if os.path.exists(fpath):
-                        attachments.append(fpath)
-        
-        subject = f"[News_Engine] {topic} - {meta.get('date', '')}"
+        message = {"topic": topic, "data": data, "meta": meta or {}, "published_at": datetime.now().isoformat()}
+        outcomes = {}
+        for name, worker in self.workers.items():
+            outcome = concurrent.futures.Future() if track else None
+            if worker.put(message, self.put_timeout, outcome):
+                outcomes[name] = outcome or True
+            else:
+                self.logger.warning(f"⚠️ Sink '{name}' queue full. Dropped '{topic}'.")
+                outcomes[name] = False
+        return outcomes
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until all queued messages were handled. False if timeout ran out first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        return all([worker.wait_idle(deadline) for worker in self.workers.values()])
 
-        # Retry Strategy: [(TruncateLength, Description)]
-        # None = Full Content
-        # 0 = Title Only
-        retry_stages = [
-            (None, "Attempt 1 (Full Content)"),
-            (500,  "Attempt 2 (Truncated 500 chars)"),
-            (100,  "Attempt 3 (Truncated 100 chars)"),
-            (0,    "Attempt 4 (Title Only)")
-        ]
+    def shutdown(self, timeout: float = None) -> dict:
+        """Drain the queues (up to timeout, default SHUTDOWN_TIMEOUT), stop workers, close sinks. Returns metrics()."""
+        if self.closed:
+            return self.metrics()
+        timeout = self.shutdown_timeout if timeout is None else timeout
+        if not self.flush(timeout):
+            self.logger.warning(f"⚠️ Sinks still busy after {timeout}s: {[n for n, w in self.workers.items() if w.queue.unfinished_tasks]}")
+        self.closed = True
+        for name, worker in self.workers.items():
+            try:
+                worker.queue.put_nowait(_STOP)
+            except queue.Full:
+                continue # Busy worker is a daemon thread; abandoned at exit
+            worker.thread.join(timeout=1)
+            if worker.thread.is_alive():
+                continue
+            try:
+                worker.sink.close()
+            except Exception as e:
+                self.logger.debug(f"Sink '{name}' close failed: {e}")
+        return self.metrics()
 
-        for limit, desc in retry_stages:
-            self.logger.info(f"📨 {desc}...")
-            
-            # 1. Format Payload
-            html_body = self.email_formatter.format_html(data, title=topic, cleaned_truncate_length=limit)
-            
-            # 2. Dispatch
-            is_last_attempt = (limit == 0)
-            current_subject = subject + (" [Truncated]" if limit is not None else "")
-            
-            success, error_msg = self.email_dispatcher.send_email(
-                subject=current_subject,
-                body_html=html_body,
-                attachment_files=attachments
-            )
-            
-            if success:
-                self.logger.info(f"✅ Email sent successfully at {desc}.")
-                return True
-            
-            self.logger.warning(f"⚠️ {desc} failed: {error_msg}")
-        
-        # If we get here, all attempts failed
-        self.logger.error("❌ Action Error: Failed to send email after all retry attempts.")
-        return False
+    def metrics(self) -> dict:
+        """{ sink: { delivered, failed, dropped, queue_depth, peak_depth, latency_ms: { avg, max, last } } }"""
+        return {name: worker.metrics() for name, worker in self.workers.items()}
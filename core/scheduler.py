@@ -0,0 +1,298 @@
+import concurrent.futures
+import logging
+import os
+import random
+import runpy
+import threading
+import time
+from datetime import datetime, timedelta
+from config import CONFIG
+
+logger = logging.getLogger("Scheduler")
+
+class Job:
+    """One COLLECTOR_MAP group on its own cadence."""
+    def __init__(self, key: str):
+        self.key = key
+        self.interval = 3600.0 # Seconds
+        self.jitter = 0.0
+        self.priority = 100    # Lower runs first when several groups are due
+        self.enabled = True
+        self.next_due = None
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.last_duration = None
+
+    def configure(self, defaults: dict, conf: dict):
+        self.interval = 60.0 * conf.get("INTERVAL_MINUTES", defaults.get("INTERVAL_MINUTES", 60))
+        self.jitter = float(conf.get("JITTER_SECONDS", defaults.get("JITTER_SECONDS", 0)))
+        self.priority = conf.get("PRIORITY", defaults.get("PRIORITY", 100))
+        self.enabled = conf.get("ENABLED", True)
+
+    def schedule_next(self, now: float):
+        self.next_due = now + self.interval + random.uniform(0, self.jitter)
+
+    def status(self) -> dict:
+        return {
+            "interval_s": self.interval,
+            "priority": self.priority,
+            "enabled": self.enabled,
+            "running": self.running,
+            "next_due": datetime.fromtimestamp(self.next_due).isoformat(timespec="seconds") if self.next_due else None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_duration_s": round(self.last_duration, 2) if self.last_duration is not None else None
+        }
+
+def next_dispatch_time(now: float, conf: dict) -> float:
+    """
+    Next dispatch epoch: the next of the daily local TIMES ("HH:MM") if given,
+    else now + INTERVAL_MINUTES.
+    """
+    times = conf.get("TIMES") or []
+    if times:
+        current = datetime.fromtimestamp(now)
+        candidates = []
+        for value in times:
+            hour, minute = (int(part) for part in value.split(":"))
+            at = current.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if at.timestamp() <= now:
+                at += timedelta(days=1)
+            candidates.append(at.timestamp())
+        return min(candidates)
+    return now + 60.0 * conf.get("INTERVAL_MINUTES", 240)
+
+class ConfigReloader:
+    """
+    Re-executes config.py when it changes and updates the shared CONFIG dict in place,
+    key by key, so every module holding a reference sees the new sections.
+    A config.py that fails to load is reported and the old CONFIG kept.
+    """
+    def __init__(self, path: str, on_reload=None):
+        self.path = path
+        self.on_reload = on_reload # Called with the set of changed top-level keys
+        self.mtime = self._mtime()
+
+    def _mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def changed(self) -> bool:
+        return self._mtime() != self.mtime
+
+    def reload(self) -> set:
+        self.mtime = self._mtime()
+        try:
+            new = runpy.run_path(self.path)["CONFIG"]
+        except Exception as e:
+            logger.error(f"❌ Config reload failed, keeping the current config: {e}")
+            return set()
+        changed = {key for key in set(CONFIG) | set(new) if CONFIG.get(key) != new.get(key)}
+        for key in changed:
+            if key in new:
+                CONFIG[key] = new[key]
+            else:
+                del CONFIG[key]
+        if changed:
+            logger.info(f"🔄 Config reloaded: {', '.join(sorted(changed))}")
+            if self.on_reload:
+                self.on_reload(changed)
+        return changed
+
+def report_files(meta: dict) -> list:
+    """Report files of a pending result (meta["filenames"], else meta["filename"])."""
+    if meta.get("filenames"):
+        return list(meta["filenames"])
+    return [meta["filename"]] if meta.get("filename") else []
+
+def merge_results(older: dict, newer: dict) -> dict:
+    """
+    One pending {"data", "meta"} for two runs of a group: the newer report's fields,
+    cleaned_data of both (newest first, repeated titles dropped), raw_data of both,
+    and every report file in meta["filenames"].
+    """
+    data = dict(newer["data"])
+    cleaned, seen = [], set()
+    for item in newer["data"].get("cleaned_data", []) + older["data"].get("cleaned_data", []):
+        title = item.get("title") if isinstance(item, dict) else None
+        if title:
+            if title in seen:
+                continue
+            seen.add(title)
+        cleaned.append(item)
+    raw = newer["data"].get("raw_data", []) + older["data"].get("raw_data", [])
+    data["cleaned_data"], data["raw_data"] = cleaned, raw
+    if isinstance(data.get("meta"), dict):
+        data["meta"] = dict(data["meta"], count=len(cleaned), raw_count=len(raw))
+
+    meta = dict(newer["meta"])
+    meta["filenames"] = list(dict.fromkeys(report_files(older["meta"]) + report_files(newer["meta"])))
+    return {"data": data, "meta": meta}
+
+class Scheduler:
+    """
+    Long-running collection loop (main.py --serve).
+    Each group runs on its own cadence from CONFIG["SCHEDULER"] with random jitter;
+    when more groups are due than MAX_PARALLEL slots, lower PRIORITY values go first.
+    Collected results are held until the separate dispatch schedule publishes them.
+    A changed config.py is applied once running groups have finished.
+
+    run_group(key) -> (data, meta) and dispatch({key: {"data", "meta"}}) are supplied
+    by the caller; on_idle() runs whenever the last running group finishes.
+    Runs of a group between two dispatches are merged (merge_results), and results
+    of a failed dispatch are kept for the next one: dispatch must raise when the
+    results were not delivered, so it has to wait for the sinks, not just queue.
+    """
+    def __init__(self, keys: list, run_group, dispatch, reloader: ConfigReloader = None, on_idle=None):
+        self.keys = list(keys)
+        self.run_group = run_group
+        self.dispatch = dispatch
+        self.reloader = reloader
+        self.on_idle = on_idle
+        self.jobs = {key: Job(key) for key in self.keys}
+        self.pending = {} # key -> {"data", "meta"} awaiting dispatch (runs merged)
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopping = False
+        self.reload_pending = False
+        self.next_dispatch = None
+        self.dispatch_conf = None
+        self.executor = None
+
+    @property
+    def conf(self) -> dict:
+        return CONFIG.get("SCHEDULER", {})
+
+    def _configure(self, now: float, initial: bool = False):
+        defaults = self.conf.get("DEFAULTS", {})
+        groups = self.conf.get("GROUPS", {})
+        for key, job in self.jobs.items():
+            old_interval = job.interval
+            job.configure(defaults, groups.get(key, {}))
+            if initial:
+                # RUN_ON_START: every group once right away (spread by jitter), else after one interval
+                if self.conf.get("RUN_ON_START", True):
+                    job.next_due = now + random.uniform(0, job.jitter)
+                else:
+                    job.schedule_next(now)
+            elif job.interval < old_interval and not job.running:
+                job.next_due = min(job.next_due, now + job.interval)
+        dispatch_conf = self.conf.get("DISPATCH", {})
+        if initial or dispatch_conf != self.dispatch_conf:
+            self.next_dispatch = next_dispatch_time(now, dispatch_conf)
+        self.dispatch_conf = dispatch_conf
+
+    def due_jobs(self, now: float) -> list:
+        """Due, idle, enabled jobs in start order (priority, then how overdue)."""
+        due = [job for job in self.jobs.values() if job.enabled and not job.running and job.next_due <= now]
+        return sorted(due, key=lambda job: (job.priority, job.next_due))
+
+    def serve(self):
+        """Run until stop() (blocks the calling thread)."""
+        now = time.time()
+        self._configure(now, initial=True)
+        # One thread per group; MAX_PARALLEL (hot-reloadable) bounds how many start
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(self.jobs)), thread_name_prefix="scheduled")
+        logger.info(f"🕰️ Serving {len(self.jobs)} groups (up to {self.conf.get('MAX_PARALLEL', 1)} at a time). Next dispatch: "
+                    f"{datetime.fromtimestamp(self.next_dispatch).isoformat(timespec='seconds')}")
+        try:
+            while not self.stopping:
+                self._tick(time.time())
+                self.wakeup.wait(self._sleep_seconds(time.time()))
+                self.wakeup.clear()
+        finally:
+            self.executor.shutdown(wait=True)
+            if self.pending and self.conf.get("DISPATCH", {}).get("ON_STOP", True):
+                self._dispatch()
+            logger.info("🛑 Scheduler stopped.")
+
+    def stop(self):
+        """Finish running groups, dispatch what is pending and leave serve()."""
+        self.stopping = True
+        self.wakeup.set()
+
+    def _tick(self, now: float):
+        with self.lock:
+            running = sum(job.running for job in self.jobs.values())
+        if self.reloader and not self.reload_pending and self.reloader.changed():
+            self.reload_pending = True
+            logger.info("Config change detected; applying it once running groups finish.")
+        if self.reload_pending:
+            if running:
+                return # Drain first: every run sees one consistent config
+            self.reload_pending = False
+            if self.reloader.reload():
+                self._configure(now)
+
+        if now >= self.next_dispatch:
+            if self.pending:
+                self._dispatch()
+            self.next_dispatch = next_dispatch_time(now, self.conf.get("DISPATCH", {}))
+
+        slots = max(1, self.conf.get("MAX_PARALLEL", 1)) - running
+        for job in self.due_jobs(now)[:max(0, slots)]:
+            with self.lock:
+                job.running = True
+            self.executor.submit(self._run_job, job)
+
+    def _sleep_seconds(self, now: float) -> float:
+        """Until the next due group, dispatch or config check (finishing jobs wake the loop early)."""
+        deadlines = [job.next_due for job in self.jobs.values() if job.enabled and not job.running]
+        deadlines.append(self.next_dispatch)
+        poll = self.conf.get("RELOAD_CHECK_SECONDS", 30) if self.reloader else 3600
+        return max(0.05, min([now + poll] + deadlines) - now)
+
+    def _run_job(self, job: Job):
+        start = time.time()
+        logger.info(f"▶️ Scheduled run: {job.key}")
+        try:
+            data, meta = self.run_group(job.key)
+            if data and meta:
+                with self.lock:
+                    self._add_pending(job.key, {"data": data, "meta": meta})
+        except Exception as e:
+            job.failures += 1
+            logger.error(f"❌ Scheduled run {job.key} failed: {e}", exc_info=True)
+        finally:
+            job.runs += 1
+            job.last_duration = time.time() - start
+            job.schedule_next(time.time())
+            with self.lock:
+                job.running = False
+                idle = not any(j.running for j in self.jobs.values())
+            if idle and self.on_idle:
+                try:
+                    self.on_idle()
+                except Exception as e:
+                    logger.warning(f"on_idle hook failed: {e}")
+            self.wakeup.set()
+
+    def _add_pending(self, key, result):
+        """Caller holds self.lock."""
+        previous = self.pending.get(key)
+        self.pending[key] = result if previous is None else merge_results(previous, result)
+
+    def _dispatch(self):
+        with self.lock:
+            results, self.pending = self.pending, {}
+        logger.info(f"📨 Scheduled dispatch: {', '.join(results)}")
+        try:
+            self.dispatch(results)
+        except Exception as e:
+            logger.error(f"❌ Scheduled dispatch failed: {e}. Keeping the results for the next dispatch.", exc_info=True)
+            with self.lock:
+                # Runs that finished meanwhile are newer than the failed batch
+                newer, self.pending = self.pending, results
+                for key, result in newer.items():
+                    self._add_pending(key, result)
+
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                "jobs": {key: job.status() for key, job in self.jobs.items()},
+                "pending_dispatch": list(self.pending),
+                "next_dispatch": datetime.fromtimestamp(self.next_dispatch).isoformat(timespec="seconds") if self.next_dispatch else None
+            }
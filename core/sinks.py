@@ -0,0 +1,217 @@
+import abc
+import html
+import json
+import logging
+import os
+import threading
+import urllib.error
+import urllib.request
+from formatters.email_formatter import EmailFormatter
+from dispatchers.email_dispatcher import EmailDispatcher
+
+# Retry Strategy: [(TruncateLength, Description)]
+# None = Full Content
+# 0 = Title Only
+RETRY_STAGES = [
+    (None, "Attempt 1 (Full Content)"),
+    (500,  "Attempt 2 (Truncated 500 chars)"),
+    (100,  "Attempt 3 (Truncated 100 chars)"),
+    (0,    "Attempt 4 (Title Only)")
+]
+
+class BaseSink(abc.ABC):
+    """
+    Delivery target of the MessageBus. deliver() runs on the sink's own worker
+    thread; return True on success (False or an exception counts as a failure).
+    """
+    name = "sink"
+
+    @abc.abstractmethod
+    def deliver(self, message: dict) -> bool:
+        """Send one {"topic", "data", "meta", "published_at"} message."""
+
+    def close(self):
+        pass
+
+def attachment_paths(meta) -> list[str]:
+    """Existing files referenced by meta["filename"] / meta["filenames"]."""
+    attachments = []
+    if meta:
+        # Single file legacy support
+        if "filename" in meta:
+            fpath = meta["filename"]
+            if os.path.exists(fpath):
+                attachments.append(fpath)
+
+        # Multiple files support (Unified Report)
+        if "filenames" in meta and isinstance(meta["filenames"], list):
+            for fpath in meta["filenames"]:
+                if os.path.exists(fpath):
+                    attachments.append(fpath)
+    return attachments
+
+def summarize(data, max_titles: int = 20) -> dict:
+    """Per-group counts and top titles of a report / unified payload (small JSON for webhooks)."""
+    if not data:
+        return {}
+    if data.get("is_unified"):
+        groups = {key: (res["data"], res["meta"]) for key, res in data.get("results", {}).items()}
+    else:
+        groups = {"News Report": (data, data.get("meta", {}))}
+    summary = {}
+    for key, (group_data, group_meta) in groups.items():
+        items = group_data.get("cleaned_data", group_data.get("data", []))
+        summary[key] = {
+            "group_name": group_meta.get("group_name", key),
+            "count": len(items),
+            "raw_count": len(group_data.get("raw_data", [])),
+            "titles": [item.get("title") for item in items[:max_titles]]
+        }
+    return summary
+
+class EmailSink(BaseSink):
+    """HTML email with size-planned truncation and zipped report attachments."""
+    name = "email"
+
+    def __init__(self, dispatcher: EmailDispatcher, formatter: EmailFormatter = None):
+        self.logger = logging.getLogger("EmailSink")
+        self.email_dispatcher = dispatcher
+        self.email_formatter = formatter or EmailFormatter()
+
+    def deliver(self, message: dict) -> bool:
+        topic, data, meta = message["topic"], message["data"], message.get("meta") or {}
+        subject = f"[News_Engine] {topic} - {meta.get('date', '')}"
+
+        if not self.email_dispatcher.is_configured():
+            self.logger.warning("❌ Missing SENDER_EMAIL or PW. Skipping email.")
+            return False
+
+        try:
+            # Read (and zip) attachments once for all attempts
+            paths = attachment_paths(meta)
+            packed = self.email_dispatcher.pack_attachments(paths)
+            names = [os.path.basename(p) for p in paths]
+            first_stage, bodies, blobs = self.plan_dispatch(data, topic, packed, names=names)
+            omitted = names if packed and not blobs else []
+
+            for limit, desc in RETRY_STAGES[first_stage:]:
+                self.logger.info(f"📨 {desc}...")
+
+                # 1. Format Payload (planned body reused)
+                html_body = bodies.get(limit) or omitted_note(self.email_formatter.format_html(data, title=topic, cleaned_truncate_length=limit), omitted)
+
+                # 2. Dispatch (same SMTP session across attempts)
+                current_subject = subject + (" [Truncated]" if limit is not None else "")
+
+                success, error_msg = self.email_dispatcher.send_email(
+                    subject=current_subject,
+                    body_html=html_body,
+                    attachment_blobs=blobs
+                )
+
+                if success:
+                    self.logger.info(f"✅ Email sent successfully at {desc}.")
+                    return True
+
+                self.logger.warning(f"⚠️ {desc} failed: {error_msg}")
+        finally:
+            self.email_dispatcher.close()
+
+        # If we get here, all attempts failed
+        self.logger.error("❌ Action Error: Failed to send email after all retry attempts.")
+        return False
+
+    def plan_dispatch(self, data, topic, blobs, names=None):
+        """
+        Pick the first (largest) retry stage whose estimated MIME size fits the server limit.
+        If not even the title-only body fits with the attachments, they are dropped and
+        the body lists the omitted files (names: report files, default the blob names).
+        Returns (stage index, { truncate_length: rendered body }, attachment blobs).
+        """
+        max_bytes = self.email_dispatcher.max_message_size()
+        bodies = {}
+        omitted = []
+        for attachments in ([blobs, []] if blobs else [[]]):
+            for index, (limit, desc) in enumerate(RETRY_STAGES):
+                if limit not in bodies:
+                    bodies[limit] = self.email_formatter.format_html(data, title=topic, cleaned_truncate_length=limit)
+                body = omitted_note(bodies[limit], omitted)
+                size = self.email_dispatcher.estimate_message_size(body, attachments)
+                if size <= max_bytes:
+                    self.logger.info(f"📐 Planned {desc}: ~{size / 1e6:.1f} MB (limit {max_bytes / 1e6:.1f} MB).")
+                    return index, {limit: body}, attachments
+            if attachments:
+                omitted = names or [name for name, _ in attachments]
+                self.logger.warning(f"⚠️ Attachments do not fit in {max_bytes / 1e6:.1f} MB even with a title-only body. "
+                                    f"Sending without them: {', '.join(omitted)}")
+        # Nothing fits: try the smallest body anyway (the server may accept more than configured)
+        limit = RETRY_STAGES[-1][0]
+        return len(RETRY_STAGES) - 1, {limit: omitted_note(bodies[limit], omitted)}, []
+
+def omitted_note(body_html: str, omitted: list[str]) -> str:
+    """body_html with a closing note listing attachments left out for size."""
+    if not omitted:
+        return body_html
+    note = (
+        '<p class="omitted" style="color: #c0392b; text-align: center;">'
+        f'⚠️ Not attached (message size limit): {html.escape(", ".join(omitted))}</p>'
+    )
+    end = body_html.rfind("</body>")
+    if end < 0:
+        return body_html + note
+    return body_html[:end] + note + body_html[end:]
+
+class FileSink(BaseSink):
+    """Appends one JSON line per message to a local NDJSON drop file."""
+    name = "file"
+
+    def __init__(self, path: str, include_data: bool = True):
+        self.path = path
+        self.include_data = include_data
+        self.lock = threading.Lock()
+
+    def deliver(self, message: dict) -> bool:
+        record = {
+            "topic": message["topic"],
+            "published_at": message["published_at"],
+            "meta": message.get("meta") or {},
+            "summary": summarize(message["data"])
+        }
+        if self.include_data:
+            record["data"] = message["data"]
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+        return True
+
+class WebhookSink(BaseSink):
+    """POSTs a JSON summary (optionally the full payload) to an HTTP endpoint."""
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 10, include_data: bool = False, headers: dict = None):
+        self.url = url
+        self.timeout = timeout
+        self.include_data = include_data
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.logger = logging.getLogger("WebhookSink")
+
+    def deliver(self, message: dict) -> bool:
+        body = {
+            "topic": message["topic"],
+            "published_at": message["published_at"],
+            "meta": message.get("meta") or {},
+            "summary": summarize(message["data"])
+        }
+        if self.include_data:
+            body["data"] = message["data"]
+        request = urllib.request.Request(
+            self.url, data=json.dumps(body, ensure_ascii=False, default=str).encode("utf-8"),
+            headers=self.headers, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return 200 <= response.status < 300
+        except urllib.error.URLError as e:
+            self.logger.warning(f"⚠️ Webhook {self.url} failed: {e}")
+            return False
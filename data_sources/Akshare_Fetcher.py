@@ -1,17 +1,25 @@
 import logging
-import time
 from datetime import datetime, timedelta
 import akshare as ak
 from config import CONFIG
 from utils.utils_data import StatsTracker
+from utils.resilience import get_breaker, retry_call
+from utils.watermark_store import filter_since_watermark, get_watermark_store
 
 logger = logging.getLogger(__name__)
 
 class AkshareFetcher:
     def __init__(self, stats_tracker: StatsTracker):
         self.stats = stats_tracker
-        self.max_retries = 5
-        self.retry_delay = 3
+        retry_conf = CONFIG.get("RESILIENCE", {})
+        self.max_retries = retry_conf.get("RETRIES", 5)
+        self.retry_delay = retry_conf.get("BASE_DELAY", 1.0)
+        self.max_retry_delay = retry_conf.get("MAX_DELAY", 8.0)
+        # Shared across threads/collectors: once the source trips, later tickers fail fast
+        # EastMoney (stock news) and CLS (rolling) are separate upstreams
+        self.breaker = get_breaker("Akshare EastMoney")
+        self.rolling_breaker = get_breaker("Akshare CLS")
+        self.watermarks = get_watermark_store()
 
     def fetch_stock_news(self, symbol: str) -> list[dict]:
         """Fetch specific stock/ETF news from Akshare (EastMoney)."""
@@ -37,6 +45,11 @@ class AkshareFetcher:
                         "content": row.get('新闻内容'),
                         "related_ticker": symbol
                     })
+            # EastMoney times are naive China time; compared only with themselves
+            results = filter_since_watermark(
+                self.watermarks, self.stats, "akshare_em", symbol, "zh-CN",
+                results, lambda item: item["publish_time"]
+            )
             self.stats.update(source_name, len(results))
             return results
         except Exception as e:
@@ -54,7 +67,7 @@ class AkshareFetcher:
             return []
 
         try:
-            news_df = self._retry_operation(self._fetch_rolling_logic)
+            news_df = self._retry_operation(self._fetch_rolling_logic, breaker=self.rolling_breaker)
             
             results = []
             for _, row in news_df.head(100).iterrows():
@@ -84,13 +97,9 @@ class AkshareFetcher:
     def _fetch_rolling_logic(self):
         return ak.stock_info_global_cls()
 
-    def _retry_operation(self, operation, *args, **kwargs):
-        last_exception = None
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                return operation(*args, **kwargs)
-            except Exception as e:
-                last_exception = e
-                logger.warning(f"[Akshare] Attempt {attempt}/{self.max_retries} failed: {e}. Retrying...")
-                time.sleep(self.retry_delay)
-        raise last_exception
+    def _retry_operation(self, operation, *args, breaker=None, **kwargs):
+        return retry_call(
+            operation, *args,
+            retries=self.max_retries, base_delay=self.retry_delay, max_delay=self.max_retry_delay,
+            breaker=breaker or self.breaker, stats=self.stats, label="Akshare", **kwargs
+        )
@@ -1,15 +1,28 @@
 import logging
 import feedparser
+import requests
 from newspaper import Article, Config
 from datetime import datetime, timedelta
 import urllib.parse
 from bs4 import BeautifulSoup
 from utils.utils_data import StatsTracker
+from config import CONFIG
+from data_sources import async_fetch_engine
+from utils.article_cache import get_article_cache
+from utils.singleflight import get_url_registry
+from utils.feed_cache import FeedCache, get_feed_cache
+from data_sources.http_client import get_session
+from utils.rate_limiter import get_host_limiter
+from utils.watermark_store import filter_since_watermark, get_watermark_store
+import concurrent.futures
 import time
 import random
 
 logger = logging.getLogger(__name__)
 
+class HostDeferred(Exception):
+    """The publisher's limiter had no slot within MAX_WAIT; the download was never sent."""
+
 class GoogleNewsRSSFetcher:
     """
     Fetches news from Google News RSS feeds and scrapes full content using Newspaper3k.
@@ -17,18 +30,56 @@ class GoogleNewsRSSFetcher:
     """
     def __init__(self, stats_tracker: StatsTracker):
         self.stats = stats_tracker
-        self.base_url = "https://news.google.com/rss/search"
+        self.base_url = CONFIG.get("ENDPOINTS", {}).get("GOOGLE_NEWS_RSS", "https://news.google.com/rss/search")
         
+        scraping_conf = CONFIG.get("SCRAPING", {})
+        self.max_workers = scraping_conf.get("MAX_WORKERS", 10)
+        self.backend = scraping_conf.get("BACKEND", "threads")
+        if self.backend == "async" and not async_fetch_engine.is_available():
+            logger.warning("aiohttp not installed. Falling back to threaded scraping.")
+            self.backend = "threads"
+
         # Newspaper3k Config
         self.scrape_config = Config()
-        self.scrape_config.browser_user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        self.scrape_config.request_timeout = 10
+        self.scrape_config.browser_user_agent = async_fetch_engine.DEFAULT_USER_AGENT
+        self.scrape_config.request_timeout = scraping_conf.get("REQUEST_TIMEOUT", 10)
+        # Shared keep-alive session for the feed and article downloads
+        self.http = get_session()
+        # Adaptive per-publisher admission (None if disabled)
+        self.limiter = get_host_limiter()
+
+        # Persistent URL -> extracted article cache (None if disabled)
+        self.cache = get_article_cache()
+        # In-run URL registry: one scrape per article across keywords & collectors
+        self.inflight = get_url_registry()
+        # ETag/Last-Modified + entries per feed URL (conditional GET)
+        self.feed_cache = get_feed_cache()
+        # Newest published per (query, locale): incremental runs skip older entries
+        self.watermarks = get_watermark_store()
 
     def fetch(self, query: str, lang: str = "en-US", geo: str = "US", limit: int = 100, start_date: str = None, end_date: str = None) -> list[dict]:
         """
         Fetch news for a keyword/query using Google News RSS + Scraping (Optimized).
         Supports date range via search operators (after:YYYY-MM-DD before:YYYY-MM-DD).
         """
+        try:
+            results, _ = self.fetch_window(query, lang=lang, geo=geo, limit=limit, start_date=start_date, end_date=end_date)
+            return results
+        except Exception as e:
+            source_name = f"GoogleRSS ({query})"
+            logger.error(f"Error {source_name}: {e}")
+            self.stats.update(source_name, 0, e)
+            return []
+
+    def fetch_window(self, query: str, lang: str = "en-US", geo: str = "US", limit: int = 100,
+                     start_date: str = None, end_date: str = None, split_at: int = None):
+        """
+        fetch() that raises on feed errors (callers checkpointing windows must not record a
+        failure as done) and also returns the feed's entry count.
+        start_date/end_date: inclusive day range; only entries published within it are kept.
+        split_at: if the feed holds at least this many entries (Google caps feeds at ~100,
+        so the window likely lost articles), return (None, count) without scraping anything.
+        """
         source_name = f"GoogleRSS ({query})"
         logger.info(f"Fetching {source_name}...")
         
@@ -36,95 +87,150 @@ class GoogleNewsRSSFetcher:
         # If start/end provided, append to query
         final_query = query
         if start_date and end_date:
-            # Google Search Operators: "term after:2025-01-01 before:2025-01-07"
-            final_query = f"{query} after:{start_date} before:{end_date}"
+            # Google Search Operators: "term after:2025-01-01 before:2025-01-08" (before: is exclusive)
+            before = (datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+            final_query = f"{query} after:{start_date} before:{before}"
             logger.info(f"📅 Using Date Range: {start_date} to {end_date}")
 
         encoded_query = urllib.parse.quote(final_query)
         rss_url = f"{self.base_url}?q={encoded_query}&hl={lang}&gl={geo}&ceid={geo}:{lang.split('-')[0]}"
         
-        try:
-            feed = feedparser.parse(rss_url)
-            all_entries = feed.entries
-            
-            # 1. Date Filtering (Pre-filtering)
-            valid_entries = []
-            
-            if start_date and end_date:
-                # Targeted Range Mode: strict filter based on provided dates
-                s_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                e_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1) # Inclusive end? allow some buffer
-                
-                for entry in all_entries:
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        pub_dt = datetime.fromtimestamp(time.mktime(entry.published_parsed))
-                        # Basic buffer check (sometimes RSS returns out of range items)
-                        if s_dt <= pub_dt <= e_dt + timedelta(days=1): 
-                           valid_entries.append(entry)
-            else:
-                # Default "Recent" Mode
-                days_back = 7 
-                cutoff_date = datetime.now() - timedelta(days=days_back)
-                for entry in all_entries:
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        pub_dt = datetime.fromtimestamp(time.mktime(entry.published_parsed))
-                        if pub_dt >= cutoff_date:
-                            valid_entries.append(entry)
-            
-            # Apply limit after date filtering
-            valid_entries = valid_entries[:limit]
-            
-            logger.info(f"RSS: Found {len(all_entries)} total, {len(valid_entries)} relevant. Scraping...")
-            
-            results = []
+        all_entries = self._fetch_feed(rss_url)
+        feed_size = len(all_entries)
+        if split_at is not None and feed_size >= split_at:
+            logger.info(f"RSS: {feed_size} entries for {final_query} (feed saturated). Not scraping.")
+            return None, feed_size
+
+        # 0. Incremental: only entries newer than the last run (date ranges always fetch the window)
+        if not (start_date and end_date):
+            all_entries = filter_since_watermark(
+                self.watermarks, self.stats, "google_rss", query, f"{lang}/{geo}",
+                all_entries, lambda entry: entry.get("published_parsed")
+            )
+        
+        # 1. Date Filtering (Pre-filtering)
+        valid_entries = []
+        
+        if start_date and end_date:
+            # Targeted Range Mode: strict filter based on provided dates (end inclusive)
+            s_dt = datetime.strptime(start_date, "%Y-%m-%d")
+            e_dt = datetime.strptime(before, "%Y-%m-%d")
             
-            # 2. Concurrent Scraping
-            # Use ThreadPoolExecutor to download articles in parallel
-            import concurrent.futures
+            for entry in all_entries:
+                if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                    pub_dt = datetime.fromtimestamp(time.mktime(entry.published_parsed))
+                    # Sometimes RSS returns out of range items
+                    if s_dt <= pub_dt < e_dt:
+                       valid_entries.append(entry)
+        else:
+            # Default "Recent" Mode
+            days_back = 7 
+            cutoff_date = datetime.now() - timedelta(days=days_back)
+            for entry in all_entries:
+                if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                    pub_dt = datetime.fromtimestamp(time.mktime(entry.published_parsed))
+                    if pub_dt >= cutoff_date:
+                        valid_entries.append(entry)
+        
+        # Apply limit after date filtering
+        valid_entries = valid_entries[:limit]
+        
+        logger.info(f"RSS: Found {len(all_entries)} total, {len(valid_entries)} relevant. Scraping...")
+        
+        # 2. Concurrent Scraping
+        results = self._scrape_entries(valid_entries, final_query) # Use final_query for related_ticker
             
-            # Helper wrapper for thread mapping
-            def scrape_wrapper(entry):
-                return self._process_entry(entry, final_query) # Use final_query for related_ticker
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                # Map entries to threads
-                future_to_entry = {executor.submit(scrape_wrapper, entry): entry for entry in valid_entries}
-                
-                for future in concurrent.futures.as_completed(future_to_entry):
-                    try:
-                        data = future.result()
-                        if data:
-                            results.append(data)
-                    except Exception as exc:
-                        logger.debug(f"Thread generated an exception: {exc}")
-                
-            self.stats.update(source_name, len(results))
-            return results
+        self.stats.update(source_name, len(results))
+        return results, feed_size
+
+    def _fetch_feed(self, rss_url) -> list:
+        """
+        Parse the RSS feed with a conditional GET against the feed cache.
+        On 304 Not Modified the entries stored by the previous run are reused.
+        """
+        cached = self.feed_cache.get(rss_url) if self.feed_cache else None
+        with self.stats.timer("source_latency_seconds", source="google_rss"):
+            response = self.http.get(rss_url, headers=FeedCache.conditional_headers(cached))
+        self.stats.incr("bytes_downloaded_total", len(response.content), source="google_rss")
+        if response.status_code == 304 and cached:
+            self.feed_cache.touch(rss_url)
+            self.stats.update("FeedCache (304 Reuse)", 1)
+            return [_entry_from_cache(e) for e in cached["payload"]]
+        response.raise_for_status()
+
+        # feedparser only parses; the bytes come from the pooled session
+        feed = feedparser.parse(response.content, response_headers=dict(response.headers))
+        etag, modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if self.feed_cache and (etag or modified):
+            self.feed_cache.put(rss_url, [_entry_to_cache(e) for e in feed.entries], etag=etag, modified=modified)
+        return feed.entries
+
+    def _scrape_entries(self, entries, query) -> list[dict]:
+        """
+        Scrape full text for all entries with the configured backend.
+        """
+        with self.stats.stage("scrape"):
+            if self.backend == "async":
+                return self._scrape_entries_async(entries, query)
+            return self._scrape_entries_threads(entries, query)
+
+    def _scrape_entries_threads(self, entries, query) -> list[dict]:
+        results = []
+        # Stats from pool threads must land in the caller's tracker (shared fetchers)
+        process_entry = self.stats.propagate(self._process_entry)
+        # Use ThreadPoolExecutor to download articles in parallel
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Map entries to threads
+            # Round-robin over publishers so one throttled host cannot occupy every worker
+            future_to_entry = {executor.submit(process_entry, entry, query): entry for entry in _interleave_by_host(entries)}
             
-        except Exception as e:
-            logger.error(f"Error {source_name}: {e}")
-            self.stats.update(source_name, 0, e)
-            return []
+            for future in concurrent.futures.as_completed(future_to_entry):
+                try:
+                    data = future.result()
+                    if data:
+                        results.append(data)
+                except Exception as exc:
+                    logger.debug(f"Thread generated an exception: {exc}")
+        return results
 
-    def _process_entry(self, entry, query) -> dict:
+    def _scrape_entries_async(self, entries, query) -> list[dict]:
+        """
+        Download every article on the shared asyncio engine, then parse in this thread.
+        Parsing is CPU-bound, so extra threads would only fight over the GIL.
+        """
+        # Articles already scraped this run or cached on disk never hit the network
+        hosts = {
+            entry.link: _publisher_host(entry) for entry in entries
+            if not self.inflight.seen(entry.link) and not (self.cache and self.cache.contains(entry.link))
+        }
+        with self.stats.timer("source_latency_seconds", source="article_batch"):
+            # Per-host caps apply per publisher, not to news.google.com as a whole
+            html_map = async_fetch_engine.get_engine().fetch_many(list(hosts), hosts=hosts)
+        self.stats.incr("bytes_downloaded_total", sum(len(html.encode("utf-8")) for html in html_map.values() if html), source="article")
+        
+        results = []
+        for entry in entries:
+            try:
+                # "" marks a failed download -> snippet fallback, never a blocking re-download
+                data = self._process_entry(entry, query, html=html_map.get(entry.link) or "")
+                if data:
+                    results.append(data)
+            except Exception as exc:
+                logger.debug(f"Entry processing generated an exception: {exc}")
+        return results
+
+    def _process_entry(self, entry, query, html: str = None) -> dict:
+        """
+        html: None -> download with newspaper3k, str -> pre-downloaded page ("" = download failed).
+        """
         try:
             url = entry.link
             
-            # 1. Init Article
-            article = Article(url, config=self.scrape_config)
-            
-            # 2. Download & Parse
-            full_text = ""
-            try:
-                article.download()
-                article.parse()
-                full_text = article.text
-            except Exception as e:
-                # Fallback to snippet if download fails
-                logger.debug(f"Scrape failed for {url}: {e}")
-                # CONTINUE to fallback logic below
+            # 1. Download & Parse (cache first)
+            article = self._extract_article(url, html, _publisher_host(entry))
+            full_text = article["text"]
             
-            # 3. Fallback Logic (if scrape failed or text too short)
+            # 2. Fallback Logic (if scrape failed or text too short)
             source_type = "GoogleNews (FullText)"
             
             if not full_text or len(full_text) < 50:
@@ -135,7 +241,7 @@ class GoogleNewsRSSFetcher:
                  source_type = "GoogleNews (Snippet)"
             
             # Title Fallback Logic
-            title = article.title
+            title = article["title"]
             if not title or title.strip().lower() in ["google news", "google", "news"]:
                 title = entry.title
 
@@ -145,22 +251,116 @@ class GoogleNewsRSSFetcher:
                 logger.debug(f"Skipping low quality item: {url} (Len: {len(full_text) if full_text else 0})")
                 return None
 
-            # 4. Return Normalized Data
+            # 3. Return Normalized Data
             return {
                 "source": source_type,
                 "title": title,
                 "published_date": self._parse_date(entry),
-                "author": article.authors,
+                "author": article["authors"],
                 "content": full_text, 
                 "link": url,
                 "related_ticker": query,
-                "images": list(article.images) if article.images else []
+                "images": article["images"]
             }
             
         except Exception as e:
             logger.error(f"Failed to process entry: {e}")
             return None
 
+    def _extract_article(self, url, html: str = None, host: str = None) -> dict:
+        """
+        Extract one article, at most once per run: concurrent and later requests
+        for the same URL (other keywords/collectors) share the first result.
+        Returns { title, text, authors, images } (empty fields if the scrape failed).
+        """
+        try:
+            article, shared = self.inflight.do(url, self._load_article, url, html, host)
+        except HostDeferred:
+            # Not stored in the registry: a later keyword/collector may still get a slot
+            return {"title": "", "text": "", "authors": [], "images": []}
+        if shared:
+            self.stats.update("URLRegistry (Shared)", 1)
+        return article
+
+    def _load_article(self, url, html: str = None, host: str = None) -> dict:
+        """
+        Download + parse one article with newspaper3k, consulting the on-disk cache first.
+        Raises HostDeferred if the publisher had no limiter slot for it.
+        """
+        if self.cache:
+            cached = self.cache.get(url)
+            if cached is not None:
+                self.stats.update("ArticleCache (Hit)", 1)
+                return cached
+            self.stats.update("ArticleCache (Miss)", 1)
+
+        article = Article(url, config=self.scrape_config)
+        if html is None:
+            html = self._download(url, host)
+        try:
+            if html:
+                article.download(input_html=html)
+            article.parse()
+        except Exception as e:
+            # Fallback to snippet if download fails (handled by caller)
+            logger.debug(f"Scrape failed for {url}: {e}")
+
+        extracted = {
+            "title": article.title,
+            "text": article.text,
+            "authors": article.authors,
+            "images": list(article.images) if article.images else []
+        }
+        # Only cache real extractions; failures may be transient
+        if self.cache and extracted["text"] and len(extracted["text"]) >= 50:
+            try:
+                self.cache.put(url, extracted)
+            except Exception as e:
+                logger.debug(f"ArticleCache write failed for {url}: {e}")
+        return extracted
+
+    def _download(self, url, host: str = None) -> str:
+        """
+        Article HTML via the pooled session ("" on failure, like newspaper3k).
+        Admission goes through the adaptive limiter keyed on the publisher host (feed
+        links all point at news.google.com and redirect from there); backoff goes to
+        the host that answered. Raises HostDeferred if no slot opened within MAX_WAIT.
+        """
+        host = host or urllib.parse.urlsplit(url).hostname or ""
+        if self.limiter and not self.limiter.acquire(host, max_wait=self.limiter.max_wait):
+            self.stats.update("HostLimiter (Deferred)", 1)
+            raise HostDeferred(host)
+
+        start = time.monotonic()
+        status = None
+        answered_by = None
+        try:
+            response = self.http.get(url, timeout=self.scrape_config.request_timeout)
+            status = response.status_code
+            answered_by = _redirected_host(url, response.url)
+            self.stats.incr("bytes_downloaded_total", len(response.content), source="article")
+            if status >= 300:
+                return ""
+            # requests falls back to ISO-8859-1 for text/* without a charset, which
+            # mangles UTF-8 and GBK pages; sniff the body instead (as newspaper3k does)
+            if not response.encoding or response.encoding.lower() == "iso-8859-1":
+                response.encoding = response.apparent_encoding
+            return response.text
+        except Exception as e:
+            logger.debug(f"Download failed for {url}: {e}")
+            request = getattr(e, "request", None)
+            answered_by = _redirected_host(url, request.url) if request is not None else None
+            if isinstance(e, requests.exceptions.Timeout):
+                self.stats.incr("timeouts_total", source="article")
+            return ""
+        finally:
+            latency = time.monotonic() - start
+            self.stats.observe("source_latency_seconds", latency, source="article")
+            if self.limiter:
+                self.limiter.release(host, status, latency, answered_by=answered_by)
+                if status in self.limiter.THROTTLE_STATUSES:
+                    self.stats.update("HostLimiter (Throttled)", 1)
+
     def _parse_date(self, entry):
         if hasattr(entry, 'published_parsed') and entry.published_parsed:
             return datetime.fromtimestamp(time.mktime(entry.published_parsed)).isoformat()
@@ -178,3 +378,42 @@ class GoogleNewsRSSFetcher:
             return " ".join(text.split())
         except Exception:
             return html_content
+
+def _entry_to_cache(entry) -> dict:
+    """Keep the entry fields the fetcher uses, in JSON-friendly form."""
+    data = {k: entry.get(k) for k in ("link", "title", "summary", "published", "source")}
+    if entry.get("published_parsed"):
+        data["published_parsed"] = list(entry.published_parsed)
+    return data
+
+def _entry_from_cache(data) -> feedparser.FeedParserDict:
+    entry = feedparser.FeedParserDict(data)
+    if data.get("published_parsed"):
+        entry["published_parsed"] = time.struct_time(tuple(data["published_parsed"]))
+    return entry
+
+def _publisher_host(entry) -> str:
+    """
+    Google News links all point at news.google.com; <source url="..."> names the publisher.
+    Key for limiter admission and round-robin ordering.
+    """
+    source = entry.get("source") or {}
+    return urllib.parse.urlsplit(source.get("href") or entry.get("link") or "").hostname or ""
+
+def _redirected_host(url, final_url) -> str:
+    """Host of final_url if the request was redirected to another host, else None."""
+    final_host = urllib.parse.urlsplit(final_url or "").hostname
+    if final_host and final_host != urllib.parse.urlsplit(url).hostname:
+        return final_host
+    return None
+
+def _interleave_by_host(entries) -> list:
+    """Reorder entries round-robin by publisher host (order within a host kept)."""
+    by_host = {}
+    for entry in entries:
+        by_host.setdefault(_publisher_host(entry), []).append(entry)
+    queues = list(by_host.values())
+    interleaved = []
+    for i in range(max((len(q) for q in queues), default=0)):
+        interleaved.extend(q[i] for q in queues if i < len(q))
+    return interleaved
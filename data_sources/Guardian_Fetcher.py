@@ -1,8 +1,11 @@
 import logging
-import requests
 import os
+import urllib.parse
 from datetime import datetime, timedelta
 from utils.utils_data import StatsTracker
+from utils.feed_cache import FeedCache, get_feed_cache
+from data_sources.http_client import get_session
+from config import CONFIG
 import time
 
 logger = logging.getLogger(__name__)
@@ -16,7 +19,9 @@ class GuardianFetcher:
     def __init__(self, stats_tracker: StatsTracker):
         self.stats = stats_tracker
         self.api_key = os.getenv("GUARDIAN_API_KEY") # User needs to set this
-        self.base_url = "https://content.guardianapis.com/search"
+        self.base_url = CONFIG.get("ENDPOINTS", {}).get("GUARDIAN", "https://content.guardianapis.com/search")
+        self.feed_cache = get_feed_cache()
+        self.http = get_session()
 
     def fetch(self, query: str, limit: int = 20) -> list[dict]:
         """
@@ -41,21 +46,36 @@ class GuardianFetcher:
             'lang': 'en'
         }
         
+        # Conditional GET: same query as last run -> 304 reuses the stored results
+        cache_key = f"{self.base_url}?{urllib.parse.urlencode(sorted(params.items()))}"
+        cached = self.feed_cache.get(cache_key) if self.feed_cache else None
+
         try:
-            response = requests.get(self.base_url, params=params)
-            
-            if response.status_code == 429:
-                 logger.warning(f"Guardian API Limit Reached (429).")
-                 self.stats.update(source_name, 0, "Rate Limit")
-                 return []
+            with self.stats.timer("source_latency_seconds", source="guardian"):
+                response = self.http.get(self.base_url, params=params, headers=FeedCache.conditional_headers(cached))
+            self.stats.incr("bytes_downloaded_total", len(response.content), source="guardian")
             
-            if response.status_code != 200:
-                logger.error(f"Guardian API Error: {response.status_code} - {response.text}")
-                self.stats.update(source_name, 0, f"HTTP {response.status_code}")
-                return []
+            if response.status_code == 304 and cached:
+                self.feed_cache.touch(cache_key)
+                self.stats.update("FeedCache (304 Reuse)", 1)
+                results = cached["payload"]
+            else:
+                if response.status_code == 429:
+                     logger.warning(f"Guardian API Limit Reached (429).")
+                     self.stats.update(source_name, 0, "Rate Limit")
+                     return []
+                
+                if response.status_code != 200:
+                    logger.error(f"Guardian API Error: {response.status_code} - {response.text}")
+                    self.stats.update(source_name, 0, f"HTTP {response.status_code}")
+                    return []
+
+                data = response.json()
+                results = data.get('response', {}).get('results', [])
 
-            data = response.json()
-            results = data.get('response', {}).get('results', [])
+                etag, modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+                if self.feed_cache and (etag or modified):
+                    self.feed_cache.put(cache_key, results, etag=etag, modified=modified)
             
             parsed_results = []
             for item in results:
@@ -1,5 +1,7 @@
 import os
 import logging
+import concurrent.futures
+import time
 from datetime import datetime, timedelta
 try:
     from openbb import obb
@@ -34,12 +36,16 @@ class OpenBBNewsFetcher:
         """
         Fetch company news from multiple providers to maximize quantity.
         Prioritizes YFinance (Free/Working) over FMP (Restricted).
+        Providers are queried in parallel; one call covers all symbols.
         """
         if not obb:
             self.logger.error("OpenBB SDK not installed.")
             return []
 
-        all_news = []
+        # A bare ticker string would otherwise be joined character by character
+        if isinstance(symbols, str):
+            symbols = [symbols]
+
         # Adjusted priorities based on user feedback/logs:
         # 1. YFinance: Confirmed working and free.
         # 2. FMP: API key exists but user reported 402 Restricted. usage might be limited.
@@ -50,40 +56,78 @@ class OpenBBNewsFetcher:
         start_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
         end_date = datetime.now().strftime('%Y-%m-%d')
         
-        # YFinance works best with single symbols or small batches.
-        # OpenBB 'company' endpoint often handles lists, but let's be safe with YFinance
-        # by passing the list if supported, or looping if needed. 
-        # OpenBB SDK usually joins them.
+        # OpenBB 'company' endpoint takes a comma separated symbol list
         symbols_str = ",".join(symbols)
 
-        for provider in providers:
-            try:
-                self.logger.info(f"Fetching company news for {symbols} from {provider}...")
-                result = obb.news.company(
-                    symbol=symbols_str,
-                    provider=provider,
-                    start_date=start_date,
-                    end_date=end_date,
-                    limit=limit
-                )
-                
-                if result and result.results:
-                    news_items = result.results
-                    self.logger.info(f"Fetched {len(news_items)} items from {provider}.")
-                    for item in news_items:
-                        normalized = self._normalize_news_data(item, provider)
-                        if normalized:
-                            all_news.append(normalized)
-            except Exception as e:
-                # Handle specific FMP 402 error cleanly
-                error_msg = str(e)
-                if "402" in error_msg and provider == 'fmp':
-                    self.logger.warning(f"FMP Plan Limit: Company news endpoint restricted (402). Skipping FMP.")
-                else:
-                    self.logger.warning(f"Failed to fetch from {provider}: {e}")
+        # Provider threads report into the caller's stats (shared fetchers)
+        fetch_provider = self.stats.propagate(self._fetch_provider) if self.stats is not None else self._fetch_provider
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(providers)) as executor:
+            futures = [
+                executor.submit(fetch_provider, provider, symbols_str, start_date, end_date, limit)
+                for provider in providers
+            ]
+            # Provider priority order is kept for deduplication
+            all_news = [news for future in futures for news in future.result()]
 
         return self._deduplicate_news(all_news)
 
+    def fetch_company_news_grouped(self, symbols: list[str], limit: int = 100, days_back: int = 7, batch_size: int = 20) -> dict:
+        """
+        Batched variant for a whole group: one fetch_company_news call per `batch_size`
+        symbols instead of one per ticker, results fanned back per symbol.
+        limit is per symbol. Returns { symbol: [news] } with every requested symbol present.
+        Articles tagged with none of a batch's symbols cannot be attributed and are dropped
+        (a single-symbol batch keeps them, as the per-ticker call would).
+        """
+        grouped = {symbol: [] for symbol in symbols}
+        untagged = 0
+        for i in range(0, len(symbols), batch_size):
+            chunk = symbols[i:i + batch_size]
+            lookup = {symbol.upper(): symbol for symbol in chunk}
+            for news in self.fetch_company_news(chunk, limit=limit * len(chunk), days_back=days_back):
+                # First requested symbol the article is tagged with
+                owner = next((lookup[s.strip().upper()] for s in news.get("symbols") or [] if s.strip().upper() in lookup), None)
+                if owner is None and len(chunk) == 1:
+                    owner = chunk[0]
+                if owner is None:
+                    untagged += 1
+                    continue
+                grouped[owner].append(news)
+        if untagged:
+            self.logger.info(f"Dropped {untagged} batched articles tagged with none of the requested symbols.")
+        return grouped
+
+    def _fetch_provider(self, provider, symbols_str, start_date, end_date, limit) -> list[dict]:
+        results = []
+        try:
+            self.logger.info(f"Fetching company news for {symbols_str} from {provider}...")
+            start = time.perf_counter()
+            result = obb.news.company(
+                symbol=symbols_str,
+                provider=provider,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit
+            )
+            if self.stats is not None:
+                self.stats.observe("source_latency_seconds", time.perf_counter() - start, source=f"openbb_{provider}")
+            
+            if result and result.results:
+                news_items = result.results
+                self.logger.info(f"Fetched {len(news_items)} items from {provider}.")
+                for item in news_items:
+                    normalized = self._normalize_news_data(item, provider)
+                    if normalized:
+                        results.append(normalized)
+        except Exception as e:
+            # Handle specific FMP 402 error cleanly
+            error_msg = str(e)
+            if "402" in error_msg and provider == 'fmp':
+                self.logger.warning(f"FMP Plan Limit: Company news endpoint restricted (402). Skipping FMP.")
+            else:
+                self.logger.warning(f"Failed to fetch from {provider}: {e}")
+        return results
+
     def fetch_world_news(self, limit: int = 100) -> list[dict]:
         """
         Fetch general world/market news.
@@ -1,30 +1,56 @@
 import logging
-import time
+import concurrent.futures
 from datetime import datetime
 import yfinance as yf
 from config import CONFIG
 from utils.utils_data import StatsTracker
+from utils.resilience import get_breaker, retry_call
+from utils.watermark_store import filter_since_watermark, get_watermark_store
 
 logger = logging.getLogger(__name__)
 
+# yfinance's own "delisted / no data" signals for one symbol (present in recent releases only)
+_yf_exceptions = getattr(yf, "exceptions", None)
+SYMBOL_ERRORS = tuple(
+    cls for cls in (getattr(_yf_exceptions, name, None) for name in ("YFTickerMissingError", "YFPricesMissingError"))
+    if cls is not None
+)
+
+def is_symbol_error(e: Exception) -> bool:
+    """
+    yfinance reported the ticker itself as delisted or without data: retrying cannot help,
+    and it says nothing about Yahoo's health. Anything else, including malformed payloads
+    (KeyError/ValueError from a rate-limit or error page), is a source error.
+    """
+    return isinstance(e, SYMBOL_ERRORS)
+
 class YFinanceFetcher:
     def __init__(self, stats_tracker: StatsTracker):
         self.stats = stats_tracker
-        self.max_retries = 5
-        self.retry_delay = 3
+        retry_conf = CONFIG.get("RESILIENCE", {})
+        self.max_retries = retry_conf.get("RETRIES", 5)
+        self.retry_delay = retry_conf.get("BASE_DELAY", 1.0)
+        self.max_retry_delay = retry_conf.get("MAX_DELAY", 8.0)
+        # Shared across threads/collectors: once the source trips, later tickers fail fast
+        self.breaker = get_breaker("YFinance")
+        self.watermarks = get_watermark_store()
 
-    def fetch(self, ticker_symbol: str) -> list[dict]:
-        """Fetch news from YFinance with Retries."""
+    def fetch(self, ticker_symbol: str, ticker=None) -> list[dict]:
+        """Fetch news from YFinance with Retries. ticker: optional pre-built yf.Ticker."""
         source_name = f"YFinance ({ticker_symbol})"
         logger.info(f"Fetching {source_name}...")
         try:
-            news = self._retry_operation(self._fetch_logic, ticker_symbol)
+            news = self._retry_operation(self._fetch_logic, ticker_symbol, ticker)
             
             results = []
             for item in news:
                 parsed = self._parse_item(item, ticker_symbol)
                 if parsed:
                     results.append(parsed)
+            results = filter_since_watermark(
+                self.watermarks, self.stats, "yfinance", ticker_symbol, "",
+                results, lambda item: item["publish_time"]
+            )
             
             self.stats.update(source_name, len(results))
             return results
@@ -33,20 +59,37 @@ class YFinanceFetcher:
             self.stats.update(source_name, 0, e)
             return []
 
-    def _fetch_logic(self, ticker_symbol):
-        ticker = yf.Ticker(ticker_symbol)
+    def fetch_many(self, ticker_symbols: list[str], max_workers: int = 5) -> dict:
+        """
+        Batched lookup for a group: one yf.Tickers object (shared session/cookie/crumb)
+        and the per-symbol news requests run concurrently.
+        Yahoo has no multi-symbol news endpoint, so there is still one request per symbol.
+        Returns { symbol: [news] }.
+        """
+        symbols = list(dict.fromkeys(ticker_symbols))
+        if not symbols:
+            return {}
+        try:
+            tickers = yf.Tickers(" ".join(symbols)).tickers
+        except Exception as e:
+            logger.warning(f"yf.Tickers failed ({e}). Falling back to single tickers.")
+            tickers = {}
+
+        fetch = self.stats.propagate(self.fetch)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {symbol: executor.submit(fetch, symbol, tickers.get(symbol.upper())) for symbol in symbols}
+            return {symbol: future.result() for symbol, future in futures.items()}
+
+    def _fetch_logic(self, ticker_symbol, ticker=None):
+        ticker = ticker or yf.Ticker(ticker_symbol)
         return ticker.news
 
     def _retry_operation(self, operation, *args, **kwargs):
-        last_exception = None
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                return operation(*args, **kwargs)
-            except Exception as e:
-                last_exception = e
-                logger.warning(f"[YFinance] Attempt {attempt}/{self.max_retries} failed: {e}. Retrying...")
-                time.sleep(self.retry_delay)
-        raise last_exception
+        return retry_call(
+            operation, *args,
+            retries=self.max_retries, base_delay=self.retry_delay, max_delay=self.max_retry_delay,
+            breaker=self.breaker, stats=self.stats, label="YFinance", permanent=is_symbol_error, **kwargs
+        )
 
     def _parse_item(self, item, ticker_symbol):
         content_data = item.get('content', item) if 'content' in item else item
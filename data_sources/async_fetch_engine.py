@@ -0,0 +1,194 @@
+import asyncio
+import atexit
+import logging
+import threading
+import time
+import urllib.parse
+from config import CONFIG
+from utils.rate_limiter import get_host_limiter
+
+try:
+    import aiohttp
+except ImportError:
+    # Optional backend: GoogleNewsRSSFetcher falls back to threaded scraping without it.
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+class AsyncFetchEngine:
+    """
+    Process-wide asyncio download engine (aiohttp) running on one background event loop.
+    Worker threads hand over batches of URLs and block until they are downloaded.
+    One global semaphore plus per-host semaphores bound the sockets in flight
+    across ALL collectors, instead of one small thread pool per fetch() call.
+    """
+    def __init__(self, max_concurrency: int = 256, per_host_limit: int = 32, timeout: int = 10, user_agent: str = None, limiter=None):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        # Optional AdaptiveHostLimiter; admission within the fixed per-host semaphores when set
+        self.limiter = limiter
+        self.timeout = timeout
+        self.user_agent = user_agent or DEFAULT_USER_AGENT
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._session = None
+
+        # Loop-bound state (only touched from the event loop thread)
+        self._global_sem = None
+        self._host_sems = {}
+        self._inflight = {} # url -> asyncio.Task (coalesce identical downloads)
+
+    # ------------------------------------------------------------------
+    # Loop lifecycle
+    # ------------------------------------------------------------------
+    def _ensure_started(self):
+        with self._lock:
+            if self._loop:
+                return
+            self._loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run_loop, args=(ready,), name="AsyncFetchEngine", daemon=True)
+            self._thread.start()
+            ready.wait()
+            logger.info(f"⚡ Async fetch engine started (global={self.max_concurrency}, per_host={self.per_host_limit}).")
+
+    def _run_loop(self, ready):
+        asyncio.set_event_loop(self._loop)
+        self._global_sem = asyncio.Semaphore(self.max_concurrency)
+        ready.set()
+        self._loop.run_forever()
+
+    def close(self):
+        """Close the HTTP session and stop the event loop (safe to call twice)."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if not loop:
+            return
+        if self._session is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._session.close(), loop).result(timeout=5)
+            except Exception as e:
+                logger.debug(f"Error closing aiohttp session: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        self._session = None
+
+    # ------------------------------------------------------------------
+    # Coroutines (event loop thread)
+    # ------------------------------------------------------------------
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            # Admission is controlled by our own semaphores, so the connector pool
+            # never queues a request (queued time would count against the timeout).
+            # No connector per-host cap: our host keys are publishers, and many of
+            # them share one real host (news.google.com links).
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=0, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": self.user_agent}
+            )
+        return self._session
+
+    def _host_semaphore(self, host):
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = self._host_sems[host] = asyncio.Semaphore(self.per_host_limit)
+        return sem
+
+    async def _acquire_host(self, host) -> bool:
+        """Poll the adaptive limiter (never blocks the loop). False after limiter.max_wait."""
+        deadline = time.monotonic() + self.limiter.max_wait
+        while True:
+            wait = self.limiter.try_acquire(host)
+            if not wait:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+    async def _request(self, url):
+        """(status or None, html or None)"""
+        async with self._global_sem:
+            try:
+                async with self._get_session().get(url, allow_redirects=True) as resp:
+                    if resp.status != 200:
+                        logger.debug(f"Async download {url} -> HTTP {resp.status}")
+                        return resp.status, None
+                    return resp.status, await resp.text(errors="replace")
+            except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+                logger.debug(f"Async download failed for {url}: {e}")
+                return None, None
+
+    async def _download(self, url, host):
+        # Host slot first, so requests queued behind a slow host do not pin global slots.
+        # The semaphore stays as a hard cap when the adaptive limiter is on (its limit can grow past it).
+        async with self._host_semaphore(host):
+            if self.limiter is None:
+                return (await self._request(url))[1]
+
+            if not await self._acquire_host(host):
+                logger.debug(f"Host limiter: no slot for {host} within {self.limiter.max_wait}s, skipping {url}")
+                return None
+            start = time.monotonic()
+            status = None
+            try:
+                status, html = await self._request(url)
+                return html
+            finally:
+                self.limiter.release(host, status, time.monotonic() - start)
+
+    async def _download_coalesced(self, url, host):
+        task = self._inflight.get(url)
+        if task is None:
+            task = self._inflight[url] = asyncio.ensure_future(self._download(url, host))
+            task.add_done_callback(lambda _t: self._inflight.pop(url, None))
+        return await task
+
+    async def _gather(self, urls, hosts):
+        htmls = await asyncio.gather(*(
+            self._download_coalesced(u, hosts.get(u) or urllib.parse.urlsplit(u).hostname or "") for u in urls
+        ))
+        return dict(zip(urls, htmls))
+
+    # ------------------------------------------------------------------
+    # Public API (any thread)
+    # ------------------------------------------------------------------
+    def fetch_many(self, urls: list[str], hosts: dict = None) -> dict:
+        """
+        Download all URLs concurrently. Blocks the calling thread.
+        hosts: optional { url: host key } for per-host limiting (default: the URL's host);
+        pass the publisher for redirecting links, or they all share one host's cap.
+        Returns { url: html or None (failed) }.
+        """
+        unique_urls = list(dict.fromkeys(u for u in urls if u))
+        if not unique_urls:
+            return {}
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._gather(unique_urls, hosts or {}), self._loop)
+        return future.result()
+
+def is_available() -> bool:
+    return aiohttp is not None
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> AsyncFetchEngine:
+    """Process-wide engine, configured from CONFIG["SCRAPING"]."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            conf = CONFIG.get("SCRAPING", {})
+            _engine = AsyncFetchEngine(
+                max_concurrency=conf.get("ASYNC_MAX_CONCURRENCY", 256),
+                per_host_limit=conf.get("ASYNC_PER_HOST_LIMIT", 32),
+                timeout=conf.get("REQUEST_TIMEOUT", 10),
+                limiter=get_host_limiter()
+            )
+            atexit.register(_engine.close)
+        return _engine
@@ -2,7 +2,7 @@ import os
 import logging
 from datetime import datetime, timedelta
 from utils.utils_data import StatsTracker
-import requests
+from data_sources.http_client import get_session
 
 # Optional Imports (Graceful Failures handled in __init__)
 try:
@@ -64,7 +64,7 @@ class _NewsApiHandler:
     def __init__(self, stats: StatsTracker):
         self.stats = stats
         self.api_key = os.getenv("News_API_KEY")
-        self.client = NewsApiClient(api_key=self.api_key) if (NewsApiClient and self.api_key) else None
+        self.client = NewsApiClient(api_key=self.api_key, session=get_session()) if (NewsApiClient and self.api_key) else None
 
     def fetch(self, query: str, limit: int = 10) -> list[dict]:
         source_name = f"NewsAPI ({query})"
@@ -170,6 +170,7 @@ class _GuardianHandler:
         self.stats = stats
         self.api_key = os.getenv("GUARDIAN_API_KEY")
         self.base_url = "https://content.guardianapis.com/search"
+        self.http = get_session()
 
     def fetch(self, query: str, limit: int = 10) -> list[dict]:
         source_name = f"Guardian ({query})"
@@ -183,7 +184,7 @@ class _GuardianHandler:
                 'show-fields': 'bodyText,headline,byline,shortUrl',
                 'order-by': 'newest'
             }
-            res = requests.get(self.base_url, params=params)
+            res = self.http.get(self.base_url, params=params)
             if res.status_code != 200: return []
             
             data = res.json().get('response', {}).get('results', [])
@@ -0,0 +1,58 @@
+import atexit
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import CONFIG
+from data_sources.async_fetch_engine import DEFAULT_USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+class PooledSession(requests.Session):
+    """
+    requests.Session with keep-alive connection pools per host, transport-level
+    retries (connect errors, 5xx, Retry-After) and a default timeout.
+    One instance is shared by every fetcher and thread, so TCP/TLS handshakes
+    to the same host are paid once per run instead of once per request.
+    """
+    def __init__(self, pool_connections: int = 32, pool_maxsize: int = 32, timeout: float = 10,
+                 retries: int = 2, backoff_factor: float = 0.5, user_agent: str = None):
+        super().__init__()
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504), # 429 is handled by the callers (quota semantics)
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        # pool_connections: hosts kept in the pool cache; pool_maxsize: keep-alive sockets per host
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers["User-Agent"] = user_agent or DEFAULT_USER_AGENT
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> PooledSession:
+    """Process-wide pooled session, configured from CONFIG["HTTP"]."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            conf = CONFIG.get("HTTP", {})
+            _session = PooledSession(
+                pool_connections=conf.get("POOL_CONNECTIONS", 32),
+                pool_maxsize=conf.get("POOL_MAXSIZE", 32),
+                timeout=conf.get("TIMEOUT", 10),
+                retries=conf.get("RETRIES", 2),
+                backoff_factor=conf.get("BACKOFF_FACTOR", 0.5)
+            )
+            atexit.register(_session.close)
+        return _session
@@ -3,22 +3,123 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
+from datetime import datetime
+import io
 import os
 import logging
+import zipfile
+
+# Headers, MIME boundaries and part headers of one message (generous)
+MIME_OVERHEAD_BYTES = 4096
+
+def base64_size(n_bytes: int) -> int:
+    """Size of n_bytes once base64-encoded in 76-char lines with CRLF (as sent over SMTP)."""
+    encoded = (n_bytes + 2) // 3 * 4
+    return encoded + (encoded + 75) // 76 * 2
 
 class EmailDispatcher:
-    def __init__(self, smtp_server, smtp_port, sender_email, sender_password, receiver_email):
+    def __init__(self, smtp_server, smtp_port, sender_email, sender_password, receiver_email,
+                 max_message_bytes: int = 25 * 1024 * 1024, compress_attachments: bool = True):
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.sender_email = sender_email
         self.sender_password = sender_password
         self.receiver_email = receiver_email
+        # Known server limit; lowered to the server's ESMTP SIZE when it advertises one
+        self.max_message_bytes = max_message_bytes
+        self.compress_attachments = compress_attachments
         self.logger = logging.getLogger("EmailDispatcher")
+        self._server = None # Authenticated SMTP session, reused across sends
+
+    def is_configured(self) -> bool:
+        return bool(self.sender_email and self.sender_password)
+
+    # ------------------------------------------------------------------
+    # Connection (one authenticated session per dispatch)
+    # ------------------------------------------------------------------
+    def _connection(self):
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+            self._server = None
+        self.logger.info(f"Connecting to SMTP {self.smtp_server}...")
+        server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port)
+        server.login(self.sender_email, self.sender_password)
+        self._server = server
+        return server
+
+    def close(self):
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception as e:
+                self.logger.debug(f"SMTP quit failed: {e}")
+
+    def max_message_size(self) -> int:
+        """Effective size limit: configured limit, or the server's ESMTP SIZE if lower."""
+        if not self.is_configured():
+            return self.max_message_bytes
+        try:
+            advertised = int(self._connection().esmtp_features.get("size", "0") or 0)
+        except Exception as e:
+            self.logger.debug(f"Could not read SMTP SIZE: {e}")
+            return self.max_message_bytes
+        if advertised > 0:
+            return min(self.max_message_bytes, advertised)
+        return self.max_message_bytes
+
+    # ------------------------------------------------------------------
+    # Attachments & size planning
+    # ------------------------------------------------------------------
+    def pack_attachments(self, attachment_files) -> list[tuple[str, bytes]]:
+        """
+        Read attachments once, as [(filename, bytes)].
+        With compression on, all files go into one in-memory zip archive.
+        """
+        paths = [p for p in (attachment_files or []) if os.path.exists(p)]
+        if not paths:
+            return []
+        if not self.compress_attachments:
+            blobs = []
+            for path in paths:
+                with open(path, "rb") as f:
+                    blobs.append((os.path.basename(path), f.read()))
+            return blobs
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+            for path in paths:
+                # Report archives are compressed already
+                compress_type = zipfile.ZIP_STORED if zipfile.is_zipfile(path) else zipfile.ZIP_DEFLATED
+                zf.write(path, arcname=os.path.basename(path), compress_type=compress_type)
+        archive = buffer.getvalue()
+        raw_size = sum(os.path.getsize(p) for p in paths)
+        self.logger.info(f"📦 Attachments: {len(paths)} files, {raw_size / 1e6:.1f} MB -> {len(archive) / 1e6:.1f} MB zip.")
+        return [(f"reports_{datetime.now().strftime('%Y%m%d_%H%M')}.zip", archive)]
+
+    def estimate_message_size(self, body_html: str, attachment_blobs=None) -> int:
+        """Bytes on the wire for send_email(body_html, attachment_blobs), without building the MIME tree."""
+        body = body_html.encode("utf-8")
+        # Non-ASCII HTML goes out as UTF-8 base64; pure ASCII as 7bit (+1 byte per CRLF)
+        body_size = len(body) + body.count(b"\n") if body.isascii() else base64_size(len(body))
+        return MIME_OVERHEAD_BYTES + body_size + sum(base64_size(len(data)) for _, data in attachment_blobs or [])
 
-    def send_email(self, subject, body_html, attachment_files=None):
-        if not self.sender_email or not self.sender_password:
+    # ------------------------------------------------------------------
+    def send_email(self, subject, body_html, attachment_files=None, attachment_blobs=None):
+        """
+        attachment_files: paths read (and zipped, if enabled) now.
+        attachment_blobs: pre-packed [(filename, bytes)] from pack_attachments (preferred for retries).
+        Returns (success, message).
+        """
+        if not self.is_configured():
             self.logger.warning("❌ Missing SENDER_EMAIL or PW. Skipping email.")
-            return False
+            return False, "Missing SENDER_EMAIL or SENDER_PASSWORD"
 
         msg = MIMEMultipart()
         msg['From'] = self.sender_email
@@ -28,29 +129,30 @@ class EmailDispatcher:
         # Attach HTML Body
         msg.attach(MIMEText(body_html, 'html'))
 
-        if attachment_files:
-            for file_path in attachment_files:
-                if os.path.exists(file_path):
-                    try:
-                        with open(file_path, "rb") as attachment:
-                            part = MIMEBase("application", "octet-stream")
-                            part.set_payload(attachment.read())
-                        
-                        encoders.encode_base64(part)
-                        filename = os.path.basename(file_path)
-                        part.add_header('Content-Disposition', 'attachment', filename=filename)
-                        msg.attach(part)
-                    except Exception as e:
-                        self.logger.error(f"Failed to attach {file_path}: {e}")
+        if attachment_blobs is None:
+            try:
+                attachment_blobs = self.pack_attachments(attachment_files)
+            except Exception as e:
+                self.logger.error(f"Failed to attach {attachment_files}: {e}")
+                attachment_blobs = []
+
+        for filename, data in attachment_blobs:
+            part = MIMEBase("application", "octet-stream")
+            part.set_payload(data)
+            encoders.encode_base64(part)
+            part.add_header('Content-Disposition', 'attachment', filename=filename)
+            msg.attach(part)
 
         try:
-            self.logger.info(f"Connecting to SMTP {self.smtp_server}...")
-            server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port)
-            server.login(self.sender_email, self.sender_password)
+            server = self._connection()
             server.sendmail(self.sender_email, self.receiver_email, msg.as_string())
-            server.quit()
             self.logger.info("✅ Email sent successfully.")
             return True, "OK"
+        except smtplib.SMTPResponseException as e:
+            # Rejected message (e.g. 552 too large); the session itself is still usable
+            self.logger.error(f"❌ Email sending failed: {e}")
+            return False, str(e)
         except Exception as e:
             self.logger.error(f"❌ Email sending failed: {e}")
+            self.close() # Broken session: reconnect on the next attempt
             return False, str(e)
@@ -20,6 +20,9 @@ class EmailFormatter:
             .tag-dup { background-color: #9b59b6; }
         </style>
         """
+        # Last rendered payload and its fragments (retry variants reuse them)
+        self._cache_key = None
+        self._cache_sections = None
 
     def format_html(self, data, title="News Report", cleaned_truncate_length=None):
         """
@@ -29,59 +32,100 @@ class EmailFormatter:
             - None: Full content
             - Int (e.g. 500, 100): Truncate content
             - 0: Title Only (Hide Summary)
+        Row/section fragments are cached for the last payload, so the truncated retry
+        variants of the same payload only re-render the summaries.
         """
         if not data:
             return "<html><body><p>No data available.</p></body></html>"
 
-        # helper
-        def generate_section_html(group_key, group_data, group_meta):
+        # Main Logic ----------------------------------------------------------
+        if data.get("is_unified"):
+            # Unified Multi-Group
+            title = data.get("subject", title)
+            total_groups = len(data.get("results", {}))
+            meta_info = f"Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M')} | Total Groups: {total_groups}"
+        else:
+            # Legacy Single Payload (fallback if called directly)
+            meta_info = f"Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+        parts = [_PAGE_HEAD.format(css=self.css, title=title, meta_info=meta_info)]
+        for section_head, rows, section_tail in self._sections(data):
+            parts.append(section_head)
+            for row_head, content, row_tail in rows:
+                parts.append(row_head)
+                parts.append(_summary_html(content, cleaned_truncate_length))
+                parts.append(row_tail)
+            parts.append(section_tail)
+        parts.append(_PAGE_TAIL)
+        return "".join(parts)
+
+    def _sections(self, data):
+        """[(section_head, [(row_head, content, row_tail)], section_tail)] for data, cached by identity."""
+        if self._cache_key is data:
+            return self._cache_sections
+
+        if data.get("is_unified"):
+            groups = [(key, res["data"], res["meta"]) for key, res in data.get("results", {}).items()]
+        else:
+            # Wrap it to reuse logic
+            groups = [("News Report", data, data.get("meta", {}))]
+
+        sections = []
+        for group_key, group_data, group_meta in groups:
             # Support new "cleaned_data" key, fallback to legacy "data"
             news_items = group_data.get("cleaned_data", group_data.get("data", []))
             raw_items = group_data.get("raw_data", []) # Used for counting only
             group_name = group_meta.get("group_name", group_key)
             
-            # Helper to generate table rows
-            def generate_rows(items, truncate_length):
-                rows = ""
-                for item in items:
-                    item_title = item.get('title', 'No Title')
-                    source = item.get('source', 'Unknown')
-                    # Handle varying date keys
-                    pdate = item.get('published_date') or item.get('publish_time') or 'N/A'
-                    link = item.get('link') or item.get('url') or '#'
-                    content = item.get('content', '') or item.get('summary', '') or ''
-                    
-                    # Logic for Title Only vs Truncation
-                    summary_html = ""
-                    if truncate_length != 0:
-                        # Truncate content
-                        if truncate_length is not None and len(content) > truncate_length:
-                            content = content[:truncate_length] + "..."
-                        summary_html = f'<div class="summary">{content}</div>'
-                    
-                    rows += f"""
+            rows = []
+            for item in news_items:
+                # Handle varying date keys
+                pdate = item.get('published_date') or item.get('publish_time') or 'N/A'
+                link = item.get('link') or item.get('url') or '#'
+                content = item.get('content', '') or item.get('summary', '') or ''
+                row_head = _ROW_HEAD.format(
+                    source=item.get('source', 'Unknown'), pdate=pdate, link=link, title=item.get('title', 'No Title')
+                )
+                rows.append((row_head, content, _ROW_TAIL))
+
+            # Note: Raw Data is NOT included in the HTML body anymore, only in Attachment.
+            section_head = _SECTION_HEAD.format(group_name=group_name, cleaned=len(news_items), raw=len(raw_items))
+            sections.append((section_head, rows, _SECTION_TAIL))
+
+        # Keep a reference: the identity check must not match a recycled id()
+        self._cache_key, self._cache_sections = data, sections
+        return sections
+
+def _summary_html(content, truncate_length):
+    # Logic for Title Only vs Truncation
+    if truncate_length == 0:
+        return ""
+    # Truncate content
+    if truncate_length is not None and len(content) > truncate_length:
+        content = content[:truncate_length] + "..."
+    return f'<div class="summary">{content}</div>'
+
+# Fragments of the email body (whitespace kept identical to the previous f-string layout)
+_ROW_HEAD = """
                     <tr>
                         <td class="meta-col">
                             <div class="source">{source}</div>
                             <div class="date">{pdate}</div>
                         </td>
                         <td class="content-col">
-                            <div class="title"><a href="{link}">{item_title}</a></div>
-                            {summary_html}
+                            <div class="title"><a href="{link}">{title}</a></div>
+                            """
+
+_ROW_TAIL = """
                         </td>
                     </tr>
                     """
-                return rows
 
-            cleaned_rows = generate_rows(news_items, truncate_length=cleaned_truncate_length)
-            
-            # Note: Raw Data is NOT included in the HTML body anymore, only in Attachment.
-            
-            html_part = f"""
+_SECTION_HEAD = """
             <div class="group-container" style="margin-top: 30px; border-top: 3px solid #3498db; padding-top: 10px;">
                 <h2 style="color: #2c3e50;">📌 {group_name}</h2>
                 <div class="meta">
-                    Cleaned: {len(news_items)} | Raw: {len(raw_items)} (See Attachment)
+                    Cleaned: {cleaned} | Raw: {raw} (See Attachment)
                 </div>
                 
                 <h3>✅ Cleaned Highlights</h3>
@@ -93,49 +137,26 @@ class EmailFormatter:
                         </tr>
                     </thead>
                     <tbody>
-                        {cleaned_rows}
+                        """
+
+_SECTION_TAIL = """
                     </tbody>
                 </table>
             </div>
             """
-            return html_part
 
-        # Main Logic ----------------------------------------------------------
-        content_body = ""
-        meta_info = ""
-        
-        # Determine if it's a Unified payload or Legacy single payload
-        if data.get("is_unified"):
-            # Unified Multi-Group
-            results_map = data.get("results", {})
-            title = data.get("subject", title)
-            
-            # Summarize Stats
-            total_groups = len(results_map)
-            meta_info = f"Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M')} | Total Groups: {total_groups}"
-            
-            # Iterate groups
-            for key, res in results_map.items():
-                g_data = res["data"]
-                g_meta = res["meta"]
-                content_body += generate_section_html(key, g_data, g_meta)
-                
-        else:
-            # Legacy Single Payload (fallback if called directly)
-            # Wrap it to reuse logic
-            content_body += generate_section_html("News Report", data, data.get("meta", {}))
-            meta_info = f"Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-
-        final_html = f"""
+_PAGE_HEAD = """
         <html>
-        <head>{self.css}</head>
+        <head>{css}</head>
         <body>
             <h1 style="color: #2c3e50; text-align: center;">{title}</h1>
             <div class="meta" style="text-align: center;">
                 {meta_info}
             </div>
             
-            {content_body}
+            """
+
+_PAGE_TAIL = """
             
             <div class="footer" style="margin-top: 50px; text-align: center; color: #95a5a6; border-top: 1px solid #eee; padding-top: 20px;">
                 Powered by News Engine 7-Layer Architecture
@@ -143,6 +164,3 @@ class EmailFormatter:
         </body>
         </html>
         """
-        return final_html
-
-
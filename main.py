@@ -1,7 +1,16 @@
+import time
+PROCESS_START = time.time() # Before heavy imports, for time-to-first-fetch
+
 import argparse
+import concurrent.futures
 import logging
 import os
+import shutil
+import signal
+import threading
 from datetime import datetime
+import config
+from config import CONFIG
 
 # Import Collectors
 from collectors import (
@@ -13,9 +22,17 @@ from collectors import (
     HKPharmaCollector,
     Star50Collector
 )
+from collectors.shared_resources import SharedResources
 
 # Import Core
 from core.message_bus import MessageBus
+from core.scheduler import Scheduler, ConfigReloader, report_files
+from utils.singleflight import get_url_registry
+from utils.rate_limiter import get_host_limiter
+from utils.watermark_store import get_watermark_store
+from utils.utils_data import StatsTracker, peak_rss_mb
+from utils.metrics import write_metrics
+from processors.model_registry import loaded_models
 
 # Setup Logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -31,10 +48,22 @@ COLLECTOR_MAP = {
     "STAR50": {"class": Star50Collector, "name": "科创50与芯片"}
 }
 
-def run_collector(key, start_date=None, end_date=None):
+_first_fetch_lock = threading.Lock()
+_first_fetch_at = None
+
+def _mark_first_fetch():
+    """Log startup cost once: process start -> first collector begins fetching."""
+    global _first_fetch_at
+    with _first_fetch_lock:
+        if _first_fetch_at is None:
+            _first_fetch_at = time.time()
+            logger.info(f"⏱️ Time to first fetch: {_first_fetch_at - PROCESS_START:.2f}s")
+
+def run_collector(key, start_date=None, end_date=None, shared=None):
     """
     Executes a single collector and returns the data and metadata.
     Does NOT publish to MessageBus directly.
+    shared: optional SharedResources (parallel mode).
     """
     cfg = COLLECTOR_MAP.get(key)
     if not cfg:
@@ -42,8 +71,10 @@ def run_collector(key, start_date=None, end_date=None):
         return None, None
 
     logger.info(f"🟢 Starting Collector: {key} ({cfg['name']})")
+    collector = None
     try:
-        collector = cfg["class"]()
+        collector = cfg["class"](shared=shared)
+        _mark_first_fetch()
         # Run Collection -> Returns (data_json, filename)
         # PASS DATES HERE
         data_json, filename = collector.run(start_date, end_date)
@@ -75,52 +106,38 @@ def run_collector(key, start_date=None, end_date=None):
     except Exception as e:
         logger.error(f"❌ Error running {key}: {e}", exc_info=True)
         return None, None
+    finally:
+        # save_report commits this run's watermarks; a run that failed before it leaves
+        # proposals (and its group) keyed by its stats, which --serve would accumulate
+        watermarks = get_watermark_store()
+        if watermarks and collector is not None:
+            watermarks.discard(collector.stats)
 
-def main():
-    parser = argparse.ArgumentParser(description="News Engine CLI")
-    parser.add_argument("--collector", type=str, default="ALL", help="Specific collector to run (e.g., US_TECH) or ALL")
-    parser.add_argument("--start-date", type=str, default=None, help="Start date (YYYY-MM-DD) for historical fetch")
-    parser.add_argument("--end-date", type=str, default=None, help="End date (YYYY-MM-DD) for historical fetch")
-    args = parser.parse_args()
-
-    # Initialize MessageBus
-    bus = MessageBus()
-
-    target = args.collector.upper()
-    collector_keys = []
-    
-    if target == "ALL":
-        collector_keys = list(COLLECTOR_MAP.keys())
-    else:
-        if target in COLLECTOR_MAP:
-            collector_keys = [target]
-        else:
-            logger.error(f"Invalid collector: {target}. Available: {list(COLLECTOR_MAP.keys())}")
-            return
-            
-    # Validate Dates
-    start_date = args.start_date
-    end_date = args.end_date
-    if (start_date and not end_date) or (end_date and not start_date):
-        logger.error("Must provide BOTH --start-date and --end-date for historical fetch.")
-        return
-
-    # 1. Collection Phase
-    collected_results = {} # { key: {data: ..., meta: ...} }
-    
-    for key in collector_keys:
-        # PASS DATES HERE
-        data, meta = run_collector(key, start_date, end_date)
-        if data and meta:
-            collected_results[key] = {"data": data, "meta": meta}
-
-    if not collected_results:
-        logger.warning("No data collected from any source. Exiting.")
-        return
+def run_collectors_parallel(collector_keys, start_date=None, end_date=None, max_parallel=2):
+    """
+    Runs up to max_parallel collectors at the same time on one SharedResources
+    (fetchers, cleaner, bounded work pool).
+    Returns { key: (data, meta) } in collector_keys order, whatever the completion order.
+    """
+    pool_size = CONFIG.get("COLLECTION", {}).get("WORK_POOL_SIZE", 20)
+    shared = SharedResources(max_workers=pool_size)
+    outputs = {}
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="collector") as executor:
+            futures = {key: executor.submit(run_collector, key, start_date, end_date, shared) for key in collector_keys}
+            for key in collector_keys:
+                outputs[key] = futures[key].result()
+    finally:
+        shared.shutdown()
+    return outputs
 
-    # 2. Dispatch/Notification Phase
-    logger.info("📨 Starting Dispatch Phase...")
-    
+def publish_results(bus, collected_results, start_date=None, end_date=None, wait: bool = False):
+    """
+    Publish one unified report message for { key: {"data", "meta"} } to the MessageBus.
+    Returns the number of sinks that accepted it.
+    wait: block until the sinks handled it and raise RuntimeError if one did not
+    deliver it (the caller keeps the results for another attempt).
+    """
     # Determine Subject Line dynamically
     active_names = [res["meta"]["group_name"] for res in collected_results.values()]
     unique_names = list(set(active_names))
@@ -154,14 +171,238 @@ def main():
     
     logger.info(f"🚀 Dispatching Unified Report: {subject}")
     
-    # Collect all filenames for attachment
+    # Collect all filenames for attachment (merged scheduled runs carry several)
     all_filenames = []
     for res in collected_results.values():
-        fpath = res.get("meta", {}).get("filename")
-        if fpath:
-            all_filenames.append(fpath)
+        all_filenames.extend(report_files(res.get("meta", {})))
             
-    bus.publish(topic=subject, data=unified_payload, meta={"filenames": all_filenames})
+    if not wait:
+        return bus.publish(topic=subject, data=unified_payload, meta={"filenames": all_filenames})
+    delivered = bus.publish_and_wait(topic=subject, data=unified_payload, meta={"filenames": all_filenames})
+    failed = [name for name, ok in delivered.items() if not ok]
+    if failed:
+        raise RuntimeError(f"Not delivered by sink(s) {', '.join(failed)}: {subject}")
+    return len(delivered)
+
+# Sections read once into process-wide objects (sessions, limiter, breakers, caches, pools):
+# a config reload in --serve cannot apply them
+RESTART_SECTIONS = {
+    "HTTP": "pooled HTTP session",
+    "SCRAPING": "scrape workers, host limiter, async engine",
+    "RESILIENCE": "retries and circuit breakers",
+    "CACHE": "feed/article/embedding caches, watermark and vector index files",
+    "INCREMENTAL": "watermark store; MODE applies live",
+    "COLLECTION": "WORK_POOL_SIZE; other keys apply live",
+    "ENDPOINTS": "fetcher endpoints",
+}
+
+def _keep_report_copy(path: str) -> str:
+    """Timestamped copy of a saved report (the original path is returned if it is missing)."""
+    root, ext = os.path.splitext(path)
+    kept = f"{root}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}"
+    try:
+        shutil.copyfile(path, kept)
+    except OSError as e:
+        logger.warning(f"Could not keep a copy of {path}: {e}")
+        return path
+    return kept
+
+def _drop_report_copies(results, copies: set):
+    """Delete the copies in `copies` that the delivered results attached (forgotten from the set)."""
+    for res in results.values():
+        for path in report_files(res.get("meta", {})):
+            if path not in copies:
+                continue # The group's own report file, not a copy
+            copies.discard(path)
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Could not delete report copy {path}: {e}")
+
+def serve(collector_keys, apply_overrides):
+    """
+    Daemon mode (--serve): fetchers, HTTP pools, the work pool and DataCleaner models
+    stay loaded between runs; core.scheduler.Scheduler runs each group on its
+    CONFIG["SCHEDULER"] cadence and dispatches on its own schedule.
+    config.py edits are applied once running groups finish: scheduling, groups and
+    per-run settings directly, CLEANING and MESSAGE_BUS/EMAIL by rebuilding the cleaner
+    and the bus. Sections in RESTART_SECTIONS are only logged as needing a restart.
+    """
+    pool_size = CONFIG.get("COLLECTION", {}).get("WORK_POOL_SIZE", 20)
+    shared = SharedResources(max_workers=pool_size)
+    if CONFIG.get("SCHEDULER", {}).get("WARM_UP", True):
+        logger.info(f"🔥 Models warmed up: {shared.cleaner.warm_up() or 'none'}")
+    state = {"bus": MessageBus()}
+    report_copies = set() # Kept by run_group until their dispatch is delivered
+
+    def on_reload(changed):
+        apply_overrides()
+        frozen = sorted(changed & set(RESTART_SECTIONS))
+        if frozen:
+            logger.warning("⚠️ Restart --serve to apply: " + "; ".join(f"{key} ({RESTART_SECTIONS[key]})" for key in frozen))
+        if "CLEANING" in changed:
+            from processors.DataCleaner import DataCleaner
+            shared.cleaner = DataCleaner() # Collectors pick up shared.cleaner per run; models stay cached
+        if changed & {"MESSAGE_BUS", "EMAIL"}:
+            old_bus, state["bus"] = state["bus"], MessageBus()
+            old_bus.shutdown()
+
+    def run_group(key):
+        data, meta = run_collector(key, shared=shared)
+        if meta:
+            # The next run overwrites the group's report file; keep a copy for the pending dispatch
+            kept = _keep_report_copy(meta["filename"])
+            if kept != meta["filename"]:
+                report_copies.add(kept)
+            meta["filename"] = kept
+        return data, meta
+
+    def dispatch(results):
+        publish_results(state["bus"], results, wait=True)
+        _drop_report_copies(results, report_copies)
+
+    def on_idle():
+        # Per-run URL sharing: forget articles between runs so the next run scrapes them fresh
+        reuse = get_url_registry().report()
+        rss = peak_rss_mb()
+        logger.info(f"🔁 URL Registry: {reuse['unique']} scraped, {reuse['shared']} reused | "
+                    f"Peak RSS: {f'{rss:.0f} MB' if rss else 'N/A'}")
+        get_url_registry().reset()
+
+    scheduler = Scheduler(
+        collector_keys,
+        run_group=run_group,
+        dispatch=dispatch,
+        reloader=ConfigReloader(config.__file__, on_reload=on_reload),
+        on_idle=on_idle
+    )
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda signum, frame: scheduler.stop())
+
+    try:
+        _mark_first_fetch()
+        scheduler.serve()
+    finally:
+        shared.shutdown()
+        for name, m in state["bus"].shutdown().items():
+            logger.info(f"📬 Sink {name}: {m['delivered']} delivered, {m['failed']} failed, {m['dropped']} dropped")
+
+def main():
+    parser = argparse.ArgumentParser(description="News Engine CLI")
+    parser.add_argument("--collector", type=str, default="ALL", help="Specific collector to run (e.g., US_TECH) or ALL")
+    parser.add_argument("--start-date", type=str, default=None, help="Start date (YYYY-MM-DD) for historical fetch")
+    parser.add_argument("--end-date", type=str, default=None, help="End date (YYYY-MM-DD) for historical fetch")
+    parser.add_argument("--parallel-collectors", type=int, default=1, help="Run up to N collectors concurrently with shared fetchers (default: 1 = sequential)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--full", action="store_true", help="Fetch the whole DAYS_BACK window, ignoring the per-query watermarks")
+    mode.add_argument("--since-last-run", action="store_true", help="Only entries newer than the last saved run (default per CONFIG INCREMENTAL.MODE)")
+    parser.add_argument("--backfill", action="store_true", help="With --start-date/--end-date: fetch Google RSS per day window in parallel, resumable after a crash")
+    parser.add_argument("--window-days", type=int, default=None, help="Backfill window size in days (default per CONFIG BACKFILL.WINDOW_DAYS)")
+    parser.add_argument("--serve", action="store_true", help="Keep running: collect each group on its CONFIG SCHEDULER cadence, dispatch on a separate schedule")
+    args = parser.parse_args()
+
+    if args.backfill and not (args.start_date and args.end_date):
+        parser.error("--backfill requires --start-date and --end-date")
+    if args.serve and (args.start_date or args.backfill):
+        parser.error("--serve collects recent news; it cannot be combined with a date range or --backfill")
+
+    def apply_overrides():
+        """CLI flags over CONFIG (re-applied after a config reload in --serve mode)."""
+        if args.backfill:
+            CONFIG.setdefault("BACKFILL", {})["ENABLED"] = True
+        if args.window_days:
+            CONFIG.setdefault("BACKFILL", {})["WINDOW_DAYS"] = args.window_days
+        # Historical ranges always fetch their whole window
+        if args.full or args.start_date:
+            CONFIG.setdefault("INCREMENTAL", {})["MODE"] = "full"
+        elif args.since_last_run:
+            CONFIG.setdefault("INCREMENTAL", {})["MODE"] = "since_last_run"
+
+    apply_overrides()
+    logger.info(f"🔖 Collection mode: {CONFIG.get('INCREMENTAL', {}).get('MODE', 'since_last_run')}")
+
+    target = args.collector.upper()
+    collector_keys = []
+    
+    if target == "ALL":
+        collector_keys = list(COLLECTOR_MAP.keys())
+    else:
+        if target in COLLECTOR_MAP:
+            collector_keys = [target]
+        else:
+            logger.error(f"Invalid collector: {target}. Available: {list(COLLECTOR_MAP.keys())}")
+            return
+
+    if args.serve:
+        serve(collector_keys, apply_overrides)
+        return
+
+    # Validate Dates
+    start_date = args.start_date
+    end_date = args.end_date
+    if (start_date and not end_date) or (end_date and not start_date):
+        logger.error("Must provide BOTH --start-date and --end-date for historical fetch.")
+        return
+
+    # Initialize MessageBus
+    bus = MessageBus()
+
+    # 1. Collection Phase
+    collected_results = {} # { key: {data: ..., meta: ...} }
+    # Run-level stage timings (per-collector metrics are exported next to each report)
+    run_stats = StatsTracker()
+    
+    with run_stats.stage("collect"):
+        if args.parallel_collectors > 1 and len(collector_keys) > 1:
+            logger.info(f"⚡ Parallel mode: {args.parallel_collectors} collectors at a time.")
+            outputs = run_collectors_parallel(collector_keys, start_date, end_date, args.parallel_collectors)
+        else:
+            # PASS DATES HERE
+            outputs = {key: run_collector(key, start_date, end_date) for key in collector_keys}
+
+    for key, (data, meta) in outputs.items():
+        if data and meta:
+            collected_results[key] = {"data": data, "meta": meta}
+
+    # Cross-keyword/collector article reuse (same URL scraped once per run)
+    reuse = get_url_registry().report()
+    rss = peak_rss_mb()
+    logger.info(f"📈 Peak RSS: {f'{rss:.0f} MB' if rss else 'N/A'} | Models loaded: {loaded_models() or 'none'}")
+    logger.info(f"🔁 URL Registry: {reuse['unique']} articles scraped, {reuse['shared']} reused ({reuse['saved_pct']}% of scrapes saved).")
+
+    # Per-host scraping state is process-wide: it belongs to the run, not to one report
+    limiter = get_host_limiter()
+    if limiter:
+        summary = limiter.summary()
+        logger.info(f"🚦 Host limiter: {summary['requests']} requests to {summary['hosts']} hosts, "
+                    f"{summary['throttled']} throttled, {summary['errors']} errors.")
+        for host, h in limiter.snapshot().items():
+            run_stats.incr("host_requests_total", h["requests"], host=host)
+            run_stats.incr("host_throttled_total", h["throttled"], host=host)
+            run_stats.incr("host_errors_total", h["errors"], host=host)
+
+    # 2. Dispatch/Notification Phase
+    if collected_results:
+        logger.info("📨 Starting Dispatch Phase...")
+    else:
+        logger.warning("No data collected from any source. Nothing to dispatch.")
+    
+    with run_stats.stage("dispatch"):
+        if collected_results:
+            publish_results(bus, collected_results, start_date, end_date)
+
+        # Sinks deliver in the background; wait for them (and stop their workers) before exiting
+        sink_metrics = bus.shutdown()
+    for name, m in sink_metrics.items():
+        logger.info(f"📬 Sink {name}: {m['delivered']} delivered, {m['failed']} failed, {m['dropped']} dropped | "
+                    f"latency avg {m['latency_ms']['avg']} ms, max {m['latency_ms']['max']} ms | peak queue {m['peak_depth']}")
+        run_stats.incr("sink_messages_total", m["delivered"], sink=name, outcome="delivered")
+        run_stats.incr("sink_messages_total", m["failed"], sink=name, outcome="failed")
+        run_stats.incr("sink_messages_total", m["dropped"], sink=name, outcome="dropped")
+
+    if CONFIG.get("METRICS", {}).get("EXPORT", True):
+        os.makedirs("data", exist_ok=True) # No report may have created it
+        write_metrics(run_stats.metrics(), os.path.abspath(os.path.join("data", "Run_Metrics")), const_labels={"report": "Run_Metrics"})
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,11 @@
 import logging
 import time
 from config import CONFIG
+import numpy as np
+from processors import model_registry
+from processors import clustering
+from processors.embedding_cache import get_embedding_cache
+from processors.vector_index import get_vector_index
 
 logger = logging.getLogger(__name__)
 
@@ -13,35 +18,69 @@ class DataCleaner:
         self.english_conf = self.config.get("ENGLISH", {})
         self.chinese_conf = self.config.get("CHINESE", {})
         
-        self.models = {} # Cache: 'model_name' -> Model Object
-        self.util = None
+        # Clustering backend: "blocked" (processors.clustering) or "sentence_transformers"
+        self.clustering_conf = self.config.get("CLUSTERING", {})
         
-        if self.enabled:
-            try:
-                from sentence_transformers import SentenceTransformer, util
-                self.util = util
-                self.SentenceTransformer = SentenceTransformer # Class ref
-                
-                # Pre-load or Lazy-load? Lazy load is better if not cleaning logic runs.
-                # But here we usually run cleaning. Let's pre-load unique models.
-                unique_models = set([
-                    self.english_conf.get("MODEL_NAME", "all-MiniLM-L6-v2"),
-                    self.chinese_conf.get("MODEL_NAME", "paraphrase-multilingual-MiniLM-L12-v2")
-                ])
-                
-                for m_name in unique_models:
-                    if not m_name: continue
-                    logger.info(f"Loading Cleaning Model: {m_name}...")
-                    self.models[m_name] = self.SentenceTransformer(m_name)
-                    
-                logger.info("Cleaning Models Loaded Successfully.")
-            except ImportError:
-                logger.error("sentence-transformers not installed. Cleaning disabled.")
-                self.enabled = False
-            except Exception as e:
-                logger.error(f"Failed to load cleaning models: {e}")
-                self.enabled = False
+        # Models are loaded lazily on the first clean_data call and shared
+        # process-wide through processors.model_registry.
     
+    def warm_up(self) -> list:
+        """Load the configured models now (long-running processes). Returns the names loaded."""
+        if not self.enabled:
+            return []
+        names = dict.fromkeys(conf.get("MODEL_NAME") for conf in (self.english_conf, self.chinese_conf) if conf.get("MODEL_NAME"))
+        return [name for name in names if self._get_model(name) is not None]
+
+    def _get_model(self, model_name):
+        """
+        Fetch a model from the process-wide registry. Disables cleaning if unavailable.
+        """
+        try:
+            return model_registry.get_model(model_name)
+        except ImportError:
+            logger.error("sentence-transformers not installed. Cleaning disabled.")
+            self.enabled = False
+        except Exception as e:
+            logger.error(f"Failed to load cleaning model {model_name}: {e}")
+            self.enabled = False
+        return None
+
+    def _encode(self, model, model_name, texts, language):
+        """
+        Encode texts, only sending embedding-cache misses to model.encode.
+        Returns an (n, dim) float32 numpy array.
+        """
+        cache = get_embedding_cache(model_name)
+        if not cache:
+            return model.encode(texts, convert_to_numpy=True)
+
+        vectors, missing = cache.get_many(texts)
+        if missing:
+            fresh = model.encode([texts[i] for i in missing], convert_to_numpy=True)
+            cache.put_many([texts[i] for i in missing], fresh)
+            for i, vec in zip(missing, fresh):
+                vectors[i] = vec
+        else:
+            cache.flush() # Persist last-used timestamps for eviction
+        logger.info(f"[{language}] Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} encoded.")
+        return np.vstack(vectors).astype(np.float32)
+
+    def _cluster(self, embeddings, threshold):
+        """
+        Community detection with the configured backend (same keep/drop semantics).
+        """
+        if self.clustering_conf.get("BACKEND", "blocked") == "sentence_transformers":
+            # Original O(n^2) path, kept for comparison
+            return model_registry.get_util().community_detection(embeddings, min_community_size=1, threshold=threshold)
+        return clustering.community_detection(
+            embeddings,
+            threshold=threshold,
+            min_community_size=1,
+            block_size=self.clustering_conf.get("BLOCK_SIZE", 2048),
+            lsh_bits=self.clustering_conf.get("LSH_BITS", 0),
+            lsh_tables=self.clustering_conf.get("LSH_TABLES", 4)
+        )
+
     def _is_valid(self, item) -> bool:
         """
         Check if an item is valid/high-quality enough to be included.
@@ -63,11 +102,16 @@ class DataCleaner:
             
         return True
 
-    def clean_data(self, data_map: dict, language: str = "ENGLISH") -> dict:
+    def clean_data(self, data_map: dict, language: str = "ENGLISH", cross_run: bool = True, scope: str = "default", pending: list = None) -> dict:
         """
         Deduplication for a specific language scope.
         data_map: { 'source_name': [item1, ...], ... }
         language: "ENGLISH" or "CHINESE" key in config.
+        cross_run: also drop items already reported in previous runs (rolling vector index)
+                   and remember the items kept here. Disable for historical fetches.
+        scope: cross-run index partition (the collector group).
+        pending: if given, (index, vectors) of the kept items are appended here instead of
+                 being added to the index, so the caller can add them once the report is saved.
         """
         if not self.enabled:
             return data_map
@@ -76,12 +120,6 @@ class DataCleaner:
         model_name = conf.get("MODEL_NAME")
         threshold = conf.get("SIMILARITY_THRESHOLD", 0.85)
         
-        model = self.models.get(model_name)
-        if not model:
-            logger.warning(f"Model {model_name} not loaded. Skipping cleaning.")
-            return data_map
-
-        logger.info(f"[{language}] Starting Semantic Deduplication ({model_name})...")
         start_time = time.time()
         
         # 1. Flatten Data
@@ -105,19 +143,41 @@ class DataCleaner:
         if not all_items:
             return data_map
 
+        # Load on first use (groups without data never pay for the model)
+        model = self._get_model(model_name)
+        if not model:
+            logger.warning(f"Model {model_name} not loaded. Skipping cleaning.")
+            return data_map
+
+        logger.info(f"[{language}] Starting Semantic Deduplication ({model_name})...")
+
         # 2. Generate Embeddings
         logger.info(f"[{language}] Encoding {len(all_items)} items...")
-        embeddings = model.encode(all_items, convert_to_tensor=True)
+        embeddings = self._encode(model, model_name, all_items, language)
         
-        # 3. Compute & Cluster
+        # 3. Cross-Run Check: stories already reported in the last N days
+        index = get_vector_index(model_name, scope) if cross_run else None
+        seen_count = 0
+        if index is not None and len(index):
+            similarity = index.max_similarity(embeddings)
+            for ref, sim in zip(references, similarity):
+                if sim >= threshold:
+                    ref['is_duplicate'] = True
+                    seen_count += 1
+            logger.info(f"[{language}] Cross-run index: {seen_count} items already reported.")
+        fresh = [i for i, ref in enumerate(references) if not ref['is_duplicate']]
+
+        # 4. Compute & Cluster (new items only)
         logger.info(f"[{language}] Clustering (Threshold {threshold})...")
-        clusters = self.util.community_detection(embeddings, min_community_size=1, threshold=threshold)
+        clusters = []
+        if fresh:
+            clusters = self._cluster(embeddings[fresh], threshold)
         
         duplicates_count = 0
         for cluster in clusters:
             if len(cluster) <= 1: continue
             
-            cluster_refs = [references[i] for i in cluster]
+            cluster_refs = [references[fresh[i]] for i in cluster]
             # Strategy: Keep longest content
             cluster_refs.sort(key=lambda x: len(x['item'].get('content', '') or ''), reverse=True)
             
@@ -128,13 +188,21 @@ class DataCleaner:
                 d['is_duplicate'] = True
                 duplicates_count += 1
                 
-        # 5. Reconstruct
+        # 5. Remember what we report, for the next runs
+        if index is not None:
+            kept = [i for i in fresh if not references[i]['is_duplicate']]
+            if kept and pending is not None:
+                pending.append((index, embeddings[kept]))
+            elif kept:
+                index.add(embeddings[kept])
+
+        # 6. Reconstruct
         cleaned_map = {k: [] for k in data_map.keys()}
         for ref in references:
             if not ref['is_duplicate']:
                 cleaned_map[ref['key']].append(ref['item'])
                 
         elapsed = time.time() - start_time
-        logger.info(f"[{language}] Deduplication Complete {elapsed:.2f}s. Removed {duplicates_count} duplicates.")
+        logger.info(f"[{language}] Deduplication Complete {elapsed:.2f}s. Removed {duplicates_count} duplicates, {seen_count} seen in previous runs.")
         
         return cleaned_map
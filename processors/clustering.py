@@ -0,0 +1,110 @@
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def community_detection(embeddings, threshold: float = 0.85, min_community_size: int = 1,
+                        block_size: int = 2048, lsh_bits: int = 0, lsh_tables: int = 4, seed: int = 0) -> list[list[int]]:
+    """
+    Drop-in replacement for sentence_transformers.util.community_detection (CPU path)
+    that never materializes the n x n similarity matrix.
+    - Similarities are computed tile by tile (block_size x block_size) and thresholded
+      on the fly; only pairs >= threshold are kept (sparse for deduplication).
+    - lsh_bits > 0 enables a random-projection prefilter: only pairs sharing a
+      signature in at least one of lsh_tables tables are compared (approximate).
+    Community semantics match the original: for each item, all neighbors >= threshold
+    ordered by similarity; communities sorted by size and taken greedily without overlap.
+    """
+    emb = _normalize(embeddings)
+    n = len(emb)
+    if n == 0:
+        return []
+    min_community_size = min(min_community_size, n)
+
+    if lsh_bits > 0:
+        rows, cols, sims = _lsh_pairs(emb, threshold, block_size, lsh_bits, lsh_tables, seed)
+    else:
+        rows, cols, sims = _blocked_pairs(emb, threshold, block_size)
+
+    # Neighbor lists per item, ordered by similarity (desc), then index
+    order = np.lexsort((cols, -sims, rows))
+    rows, cols = rows[order], cols[order]
+    bounds = np.searchsorted(rows, np.arange(n + 1))
+
+    communities = []
+    for i in range(n):
+        start, end = bounds[i], bounds[i + 1]
+        if end - start >= min_community_size:
+            communities.append(cols[start:end].tolist())
+
+    # Largest first (stable, like the original), greedy non-overlapping extraction
+    communities.sort(key=len, reverse=True)
+    unique_communities = []
+    extracted_ids = set()
+    for community in communities:
+        non_overlapped = [idx for idx in community if idx not in extracted_ids]
+        if len(non_overlapped) >= min_community_size:
+            unique_communities.append(non_overlapped)
+            extracted_ids.update(non_overlapped)
+
+    unique_communities.sort(key=len, reverse=True)
+    return unique_communities
+
+def _normalize(embeddings) -> np.ndarray:
+    emb = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(emb, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return emb / norms
+
+def _blocked_pairs(emb, threshold, block_size):
+    """All (i, j, sim) with sim >= threshold, computed tile by tile."""
+    n = len(emb)
+    rows, cols, sims = [], [], []
+    for r0 in range(0, n, block_size):
+        left = emb[r0:r0 + block_size]
+        for c0 in range(0, n, block_size):
+            tile = left @ emb[c0:c0 + block_size].T
+            r, c = np.nonzero(tile >= threshold)
+            rows.append(r + r0)
+            cols.append(c + c0)
+            sims.append(tile[r, c])
+    rows, cols, sims = np.concatenate(rows), np.concatenate(cols), np.concatenate(sims)
+    return _with_self_pairs(n, rows, cols, sims)
+
+def _lsh_pairs(emb, threshold, block_size, bits, tables, seed):
+    """Pairs >= threshold among items sharing a random-hyperplane signature."""
+    n, dim = emb.shape
+    rng = np.random.default_rng(seed)
+    weights = (1 << np.arange(bits)).astype(np.int64)
+    keys, sims = [], []
+    for _ in range(tables):
+        planes = rng.standard_normal((dim, bits)).astype(np.float32)
+        signatures = ((emb @ planes) > 0).astype(np.int64) @ weights
+        order = np.argsort(signatures, kind="stable")
+        boundaries = np.flatnonzero(np.diff(signatures[order])) + 1
+        for bucket in np.split(order, boundaries):
+            if len(bucket) < 2:
+                continue
+            r, c, s = _blocked_pairs(emb[bucket], threshold, block_size)
+            keys.append(bucket[r].astype(np.int64) * n + bucket[c])
+            sims.append(s)
+    if keys:
+        # Same pair found in several tables -> keep one
+        keys, first = np.unique(np.concatenate(keys), return_index=True)
+        sims = np.concatenate(sims)[first]
+        rows, cols = keys // n, keys % n
+    else:
+        rows = cols = np.empty(0, dtype=np.int64)
+        sims = np.empty(0, dtype=np.float32)
+    return _with_self_pairs(n, rows, cols, sims)
+
+def _with_self_pairs(n, rows, cols, sims):
+    """Every item is its own neighbor (as with the full matrix), even if rounding or LSH lost it."""
+    has_self = np.zeros(n, dtype=bool)
+    has_self[rows[rows == cols]] = True
+    missing = np.flatnonzero(~has_self)
+    if len(missing):
+        rows = np.concatenate([rows, missing])
+        cols = np.concatenate([cols, missing])
+        sims = np.concatenate([sims, np.ones(len(missing), dtype=np.float32)])
+    return rows.astype(np.int64), cols.astype(np.int64), sims.astype(np.float32)
@@ -0,0 +1,356 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+import numpy as np
+from config import CONFIG
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache for ONE model.
+    - Vectors: float32 rows appended to '<model>.f32', read back through a numpy memmap.
+    - Index:   '<model>.index.ndjson', an append-only log: a header line (model, dim,
+      generation), then one [sha1(model + text), row, last_used_ts] line per stored
+      vector or persisted hit; later lines win.
+    Entries unused for max_age_days, and the least recently used beyond max_entries,
+    are dropped when the cache opens and on later writes (daily, or as soon as the cap
+    is exceeded). Eviction rewrites the log; the vector file is compacted when less
+    than half of its rows are still referenced.
+    Thread-safe; writes also take an advisory file lock and first read what other
+    processes appended, so separate processes sharing the directory don't clobber each other.
+    """
+    EVICT_EVERY = 86400 # Seconds between age-based evictions in a long-running process
+    EVICT_TO = 0.9      # Share of max_entries kept by a size eviction (room before the next one)
+
+    def __init__(self, cache_dir: str, model_name: str, max_age_days: float = 30, max_entries: int = 200000):
+        os.makedirs(cache_dir, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+        self.model_name = model_name
+        self.vec_path = os.path.join(cache_dir, f"{slug}.f32")
+        self.index_path = os.path.join(cache_dir, f"{slug}.index.ndjson")
+        self.legacy_index_path = os.path.join(cache_dir, f"{slug}.index.json")
+        self.lock_path = os.path.join(cache_dir, f"{slug}.lock")
+        self.max_age_seconds = max_age_days * 86400
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+
+        self.dim = None
+        self.generation = 0 # New unique token whenever row numbers change (compaction/reset)
+        self.entries = {} # key -> [row, last_used_ts]
+        self.touched = set() # Keys whose last_used_ts is not in the log yet
+        self.index_id = None # Header "id" of the log we read: a new one on every rewrite
+        self.index_offset = 0 # Bytes of that log already applied
+        self.index_lines = 0 # Entry lines in that log (superseded ones included)
+        self.evicted_at = 0.0
+        with self.lock, self._file_lock():
+            self._load()
+            self._evict(time.time())
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: list[str]):
+        """
+        Returns (vectors, missing): vectors[i] is an np.ndarray or None,
+        missing lists the indexes of texts that must be encoded.
+        """
+        now = time.time()
+        vectors = [None] * len(texts)
+        missing = []
+        # File lock: another process must not compact the vector file while we read rows
+        with self.lock, self._file_lock():
+            self._sync_index()
+            matrix = self._open_matrix()
+            for i, text in enumerate(texts):
+                key = self.key(text)
+                entry = self.entries.get(key)
+                if entry is None or matrix is None or entry[0] >= len(matrix):
+                    missing.append(i)
+                    continue
+                vectors[i] = np.array(matrix[entry[0]])
+                entry[1] = now
+                self.touched.add(key)
+        return vectors, missing
+
+    def put_many(self, texts: list[str], vectors):
+        """Append new vectors and their index lines (plus pending hits)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(texts):
+            return
+        now = time.time()
+        with self.lock, self._file_lock():
+            self._sync_index()
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._write_index() # Header carries the dim
+            elif vectors.shape[1] != self.dim:
+                logger.warning(f"Embedding dim changed for {self.model_name} ({self.dim} -> {vectors.shape[1]}). Resetting cache.")
+                self._reset(vectors.shape[1])
+                self._write_index()
+
+            first_row = self._row_count()
+            with open(self.vec_path, "ab") as f:
+                f.write(vectors.tobytes())
+            for offset, text in enumerate(texts):
+                key = self.key(text)
+                self.entries[key] = [first_row + offset, now]
+                self.touched.add(key)
+            self._persist(now)
+
+    def flush(self):
+        """Persist last-used timestamps (hits only touch memory); evicts when due."""
+        with self.lock, self._file_lock():
+            self._sync_index()
+            self._persist(time.time())
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds self.lock and the file lock)
+    # ------------------------------------------------------------------
+    def _file_lock(self):
+        return _AdvisoryLock(self.lock_path)
+
+    def _row_count(self) -> int:
+        if not self.dim or not os.path.exists(self.vec_path):
+            return 0
+        return os.path.getsize(self.vec_path) // (self.dim * 4)
+
+    def _open_matrix(self):
+        rows = self._row_count()
+        if not rows:
+            return None
+        return np.memmap(self.vec_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+
+    def _read_index(self, offset: int = 0):
+        """
+        (header or None, [[key, row, ts], ...], end offset) of the log from offset on.
+        A torn last line (crash mid-append) is not consumed.
+        """
+        try:
+            with open(self.index_path, "rb") as f:
+                header = _parse_line(f.readline())
+                if not isinstance(header, dict):
+                    return None, [], 0
+                if offset:
+                    f.seek(offset)
+                data = f.read()
+                start = f.tell() - len(data)
+        except OSError:
+            return None, [], 0
+        lines = []
+        end = data.rfind(b"\n") + 1
+        for raw in data[:end].splitlines():
+            line = _parse_line(raw)
+            if isinstance(line, list) and len(line) == 3:
+                lines.append(line)
+            elif raw.strip():
+                logger.warning(f"Embedding index {self.index_path}: ignoring corrupt line.")
+        return header, lines, start + end
+
+    def _load(self):
+        if not os.path.exists(self.index_path) and os.path.exists(self.legacy_index_path):
+            self._upgrade_legacy_index()
+        header, lines, end = self._read_index()
+        if header is None:
+            self._reset(None) # Vectors without an index cannot be looked up
+            return
+        self._adopt(header, lines, end)
+        rows = self._row_count()
+        # Drop index entries pointing past the end of a truncated vector file
+        self.entries = {k: v for k, v in self.entries.items() if v[0] < rows}
+
+    def _adopt(self, header, lines, end):
+        """Replace the in-memory index with a full log read (keeps our unpersisted hits)."""
+        same_rows = header.get("generation") == self.generation and header.get("dim") == self.dim
+        self.dim = header.get("dim")
+        self.generation = header.get("generation", 0)
+        self.index_id = header.get("id")
+        self.index_offset = end
+        self.index_lines = len(lines)
+        touched = {k: self.entries[k][1] for k in self.touched if k in self.entries} if same_rows else {}
+        self.entries = {}
+        for key, row, ts in lines:
+            self.entries[key] = [row, ts]
+        # Evicted on disk stays evicted; our newer hits on surviving entries are kept
+        self.touched = {k for k in touched if k in self.entries}
+        for key in self.touched:
+            self.entries[key][1] = max(self.entries[key][1], touched[key])
+
+    def _sync_index(self):
+        """Apply what other processes appended since we last read; re-read the log if it was rewritten."""
+        header, lines, end = self._read_index(self.index_offset if self.index_id else 0)
+        if header is None:
+            self.index_id = None # Gone: the next write starts a new log
+            return
+        if header.get("id") != self.index_id:
+            # Rewritten (eviction/compaction) by another process: reload it
+            header, lines, end = self._read_index()
+            if header is not None:
+                self._adopt(header, lines, end)
+            return
+        for key, row, ts in lines:
+            mine = self.entries.get(key)
+            if mine is None or ts > mine[1]:
+                self.entries[key] = [row, ts]
+        self.index_offset = end
+        self.index_lines += len(lines)
+
+    def _persist(self, now: float):
+        """Append pending index lines, then evict / rewrite the log when due."""
+        if self.touched:
+            if self.index_id is None:
+                self._write_index()
+            else:
+                self._append_index([(k, *self.entries[k]) for k in self.touched if k in self.entries])
+        self.touched = set()
+        if len(self.entries) > self.max_entries or now - self.evicted_at >= self.EVICT_EVERY:
+            self._evict(now)
+        elif self.index_lines > 2 * len(self.entries) + 1000:
+            # Mostly superseded timestamps: shrink the log
+            self._write_index()
+
+    def _append_index(self, lines):
+        if not lines:
+            return
+        payload = b"".join(json.dumps(line).encode("utf-8") + b"\n" for line in lines)
+        with open(self.index_path, "ab") as f:
+            # A torn line from a crash would glue onto the first new one
+            if self.index_offset < f.tell():
+                payload = b"\n" + payload
+            f.write(payload)
+            self.index_offset = f.tell()
+        self.index_lines += len(lines)
+
+    def _write_index(self):
+        """Rewrite the whole log (header + one line per live entry) and replace it atomically."""
+        self.index_id = uuid.uuid4().hex
+        header = {"model": self.model_name, "dim": self.dim, "generation": self.generation, "id": self.index_id}
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for key, (row, ts) in self.entries.items():
+                f.write(json.dumps([key, row, ts]).encode("utf-8") + b"\n")
+            self.index_offset = f.tell()
+        os.replace(tmp_path, self.index_path)
+        self.index_lines = len(self.entries)
+        self.touched = set()
+
+    def _upgrade_legacy_index(self):
+        """One-time move from the single-JSON index (rewritten on every write) to the log."""
+        try:
+            with open(self.legacy_index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Embedding index unreadable ({e}). Starting empty.")
+            data = None
+        if data and data.get("dim"):
+            self.dim = data["dim"]
+            self.generation = data.get("generation", 0)
+            rows = self._row_count()
+            self.entries = {k: v for k, v in data.get("entries", {}).items() if v[0] < rows}
+            self._write_index()
+        try:
+            os.remove(self.legacy_index_path)
+        except OSError:
+            pass
+
+    def _reset(self, dim):
+        self.dim = dim
+        # Unique, not a counter: a process that restarted from an empty index must not
+        # reuse a generation another process still holds with different row numbers
+        self.generation = uuid.uuid4().hex
+        self.entries = {}
+        self.touched = set()
+        if os.path.exists(self.vec_path):
+            os.remove(self.vec_path)
+
+    def _evict(self, now: float):
+        self.evicted_at = now
+        cutoff = now - self.max_age_seconds
+        before = len(self.entries)
+        self.entries = {k: v for k, v in self.entries.items() if v[1] >= cutoff}
+        if len(self.entries) > self.max_entries:
+            recent = sorted(self.entries.items(), key=lambda kv: kv[1][1], reverse=True)
+            self.entries = dict(recent[:int(self.max_entries * self.EVICT_TO)])
+        rows = self._row_count()
+        if rows and len(self.entries) < rows / 2:
+            self._compact()
+        elif len(self.entries) != before:
+            self._write_index()
+        if len(self.entries) != before:
+            logger.info(f"EmbeddingCache ({self.model_name}): evicted {before - len(self.entries)} entries.")
+
+    def _compact(self):
+        """Rewrite the vector file with referenced rows only."""
+        matrix = self._open_matrix()
+        live = sorted(self.entries.items(), key=lambda kv: kv[1][0])
+        tmp_path = self.vec_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for new_row, (k, v) in enumerate(live):
+                f.write(np.asarray(matrix[v[0]], dtype=np.float32).tobytes())
+                v[0] = new_row
+        del matrix
+        os.replace(tmp_path, self.vec_path)
+        self.generation = uuid.uuid4().hex
+        self._write_index()
+
+def _parse_line(raw: bytes):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+class _AdvisoryLock:
+    """Exclusive flock on a side file (no-op without fcntl)."""
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+
+    def __enter__(self):
+        if fcntl:
+            self.handle = open(self.path, "a")
+            fcntl.flock(self.handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self.handle:
+            fcntl.flock(self.handle, fcntl.LOCK_UN)
+            self.handle.close()
+            self.handle = None
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_embedding_cache(model_name: str):
+    """Process-wide EmbeddingCache per model from CONFIG["CACHE"], or None if disabled."""
+    conf = CONFIG.get("CACHE", {})
+    emb_conf = conf.get("EMBEDDINGS", {})
+    if not emb_conf.get("ENABLED", False):
+        return None
+    with _caches_lock:
+        if model_name not in _caches:
+            try:
+                _caches[model_name] = EmbeddingCache(
+                    os.path.join(conf.get("DIR", "cache"), "embeddings"),
+                    model_name,
+                    max_age_days=emb_conf.get("MAX_AGE_DAYS", 30),
+                    max_entries=emb_conf.get("MAX_ENTRIES", 200000)
+                )
+            except Exception as e:
+                logger.error(f"Failed to open embedding cache for {model_name}: {e}. Caching disabled.")
+                _caches[model_name] = None
+        return _caches[model_name]
@@ -0,0 +1,43 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Process-wide SentenceTransformer instances: 'model_name' -> Model Object
+_models = {}
+_model_locks = {}
+_registry_lock = threading.Lock()
+
+def get_model(model_name: str):
+    """
+    Return the SentenceTransformer for model_name, loading it on first use.
+    Thread-safe: concurrent callers wait for a single load, and every
+    DataCleaner/collector in the process reuses the same instance.
+    Raises ImportError if sentence-transformers is not installed.
+    """
+    model = _models.get(model_name)
+    if model is not None:
+        return model
+
+    with _registry_lock:
+        lock = _model_locks.setdefault(model_name, threading.Lock())
+
+    with lock:
+        model = _models.get(model_name)
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            logger.info(f"Loading Cleaning Model: {model_name}...")
+            start_time = time.time()
+            model = SentenceTransformer(model_name)
+            _models[model_name] = model
+            logger.info(f"Cleaning Model {model_name} loaded in {time.time() - start_time:.2f}s.")
+    return model
+
+def get_util():
+    """sentence_transformers.util (imported lazily with torch)."""
+    from sentence_transformers import util
+    return util
+
+def loaded_models() -> list[str]:
+    return list(_models.keys())
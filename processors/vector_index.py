@@ -0,0 +1,178 @@
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+import numpy as np
+from config import CONFIG
+
+try:
+    import hnswlib
+except ImportError:
+    # Optional ANN backend; exact numpy search is used without it.
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+class RollingVectorIndex:
+    """
+    Embeddings of items already reported, partitioned by run day:
+    <root>/<model>/<YYYY-MM-DD>.npy (L2-normalized float32 rows).
+    Only the last `retention_days` partitions are loaded; older ones are deleted,
+    at load and whenever add() starts a new day, so memory stays bounded however
+    long the history gets (or the process runs).
+    Search backends:
+    - "exact": blockwise numpy dot product against every stored vector.
+    - "hnsw":  hnswlib inner-product graph (sub-linear), if hnswlib is installed.
+    """
+    def __init__(self, root_dir: str, model_name: str, retention_days: int = 7, backend: str = "exact", block_size: int = 4096):
+        slug = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+        self.dir = os.path.join(root_dir, slug)
+        os.makedirs(self.dir, exist_ok=True)
+        self.retention_days = retention_days
+        self.block_size = block_size
+        self.lock = threading.Lock()
+
+        if backend == "hnsw" and hnswlib is None:
+            logger.warning("hnswlib not installed. Cross-run index falls back to exact search.")
+            backend = "exact"
+        self.backend = backend
+
+        self.partitions = {} # 'YYYY-MM-DD' -> np.ndarray (n, dim)
+        self._matrix = None  # Concatenated cache for exact search
+        self._ann = None
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return sum(len(p) for p in self.partitions.values())
+
+    def max_similarity(self, vectors) -> np.ndarray:
+        """Max cosine similarity of each vector to the index (0.0 when empty)."""
+        queries = _normalize(vectors)
+        with self.lock:
+            if not len(self) or not len(queries):
+                return np.zeros(len(queries), dtype=np.float32)
+            if self.backend == "hnsw":
+                _, distances = self._get_ann().knn_query(queries, k=1)
+                return (1.0 - distances[:, 0]).astype(np.float32)
+
+            matrix = self._get_matrix()
+            best = np.full(len(queries), -1.0, dtype=np.float32)
+            for start in range(0, len(matrix), self.block_size):
+                block = matrix[start:start + self.block_size]
+                np.maximum(best, (queries @ block.T).max(axis=1), out=best)
+            return best
+
+    def add(self, vectors, day: str = None):
+        """Append vectors to the partition of `day` (default: today) and persist it."""
+        vectors = _normalize(vectors)
+        if not len(vectors):
+            return
+        day = day or datetime.now().strftime("%Y-%m-%d")
+        with self.lock:
+            if day not in self.partitions:
+                self._expire(day)
+            current = self.partitions.get(day)
+            merged = vectors if current is None else np.vstack([current, vectors])
+            path = os.path.join(self.dir, f"{day}.npy")
+            tmp_path = path + ".tmp.npy"
+            np.save(tmp_path, merged)
+            os.replace(tmp_path, path)
+            self.partitions[day] = merged
+
+            self._matrix = None
+            if self._ann is not None:
+                ann = self._ann
+                if ann.get_current_count() + len(vectors) > ann.get_max_elements():
+                    ann.resize_index(2 * (ann.get_current_count() + len(vectors)))
+                ann.add_items(vectors)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _load(self):
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        expired = 0
+        for fname in sorted(os.listdir(self.dir)):
+            if not fname.endswith(".npy") or ".tmp" in fname:
+                continue
+            day = fname[:-4]
+            path = os.path.join(self.dir, fname)
+            if day < cutoff:
+                os.remove(path)
+                expired += 1
+                continue
+            try:
+                self.partitions[day] = np.load(path).astype(np.float32)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable index partition {path}: {e}")
+        logger.info(f"Cross-run index: {len(self)} vectors in {len(self.partitions)} partitions ({expired} expired).")
+
+    def _expire(self, today: str):
+        """Drop partitions older than retention_days before `today` (caller holds self.lock)."""
+        cutoff = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        expired = [day for day in self.partitions if day < cutoff]
+        for day in expired:
+            del self.partitions[day]
+            try:
+                os.remove(os.path.join(self.dir, f"{day}.npy"))
+            except FileNotFoundError:
+                pass
+        if expired:
+            # hnswlib cannot delete rows cheaply: rebuild on next search
+            self._matrix = None
+            self._ann = None
+            logger.info(f"Cross-run index: expired {len(expired)} partitions, {len(self)} vectors left.")
+
+    def _get_matrix(self):
+        if self._matrix is None:
+            self._matrix = np.vstack(list(self.partitions.values()))
+        return self._matrix
+
+    def _get_ann(self):
+        if self._ann is None:
+            matrix = self._get_matrix()
+            ann = hnswlib.Index(space="ip", dim=matrix.shape[1])
+            ann.init_index(max_elements=max(2 * len(matrix), 1024), ef_construction=200, M=16)
+            ann.set_ef(64)
+            ann.add_items(matrix)
+            self._ann = ann
+        return self._ann
+
+def _normalize(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_vector_index(model_name: str, scope: str = "default"):
+    """
+    Process-wide RollingVectorIndex per (scope, model) from CONFIG["CLEANING"]["CROSS_RUN"],
+    or None if disabled. Scope is the collector group: a story reported by one group
+    must not be dropped from another group's report.
+    """
+    conf = CONFIG.get("CLEANING", {}).get("CROSS_RUN", {})
+    if not conf.get("ENABLED", False):
+        return None
+    key = (scope, model_name)
+    with _indexes_lock:
+        if key not in _indexes:
+            try:
+                _indexes[key] = RollingVectorIndex(
+                    os.path.join(CONFIG.get("CACHE", {}).get("DIR", "cache"), "vector_index", re.sub(r"[^A-Za-z0-9_.-]", "_", scope)),
+                    model_name,
+                    retention_days=conf.get("RETENTION_DAYS", 7),
+                    backend=conf.get("BACKEND", "exact")
+                )
+            except Exception as e:
+                logger.error(f"Failed to open cross-run index for {scope}/{model_name}: {e}. Cross-run dedup disabled.")
+                _indexes[key] = None
+        return _indexes[key]
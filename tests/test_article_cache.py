@@ -0,0 +1,48 @@
+import os
+import sys
+import tempfile
+import time
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.article_cache import ArticleCache
+
+ARTICLE = {"title": "Fed holds rates", "text": "The Federal Reserve held rates steady." * 3, "authors": ["A. Writer"], "images": []}
+
+def test_article_cache_roundtrip():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ArticleCache(os.path.join(tmp, "articles.sqlite3"))
+        assert cache.get("https://example.com/a") is None
+
+        cache.put("https://example.com/a", ARTICLE)
+        assert cache.contains("https://example.com/a")
+        assert cache.get("https://example.com/a") == ARTICLE
+        cache.close()
+
+        # Persisted across instances (= across runs)
+        reopened = ArticleCache(os.path.join(tmp, "articles.sqlite3"))
+        assert reopened.get("https://example.com/a") == ARTICLE
+        reopened.close()
+
+def test_article_cache_ttl_and_lru():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ArticleCache(os.path.join(tmp, "articles.sqlite3"), ttl_hours=1, max_entries=2)
+        cache.put("u1", ARTICLE)
+        cache.put("u2", ARTICLE)
+        time.sleep(0.01)
+        cache.get("u1") # u1 now more recently used than u2
+        cache.put("u3", ARTICLE)
+        cache.evict()
+        assert cache.contains("u1") and cache.contains("u3")
+        assert not cache.contains("u2")
+
+        # Expired entries are misses
+        cache.ttl_seconds = 0
+        time.sleep(0.01)
+        assert cache.get("u1") is None
+        cache.close()
+
+if __name__ == "__main__":
+    test_article_cache_roundtrip()
+    test_article_cache_ttl_and_lru()
+    print("PASS: ArticleCache")
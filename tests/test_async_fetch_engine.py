@@ -0,0 +1,76 @@
+import os
+import sys
+# Make sure project root is in path if running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "benchmarks"))
+
+import pytest
+from config import CONFIG
+from local_news_server import LocalNewsServer
+from data_sources import async_fetch_engine
+from data_sources.async_fetch_engine import AsyncFetchEngine, is_available
+from data_sources.GoogleNews_RSS_Fetcher import GoogleNewsRSSFetcher
+from utils.rate_limiter import AdaptiveHostLimiter
+from utils.singleflight import SingleFlight
+from utils.utils_data import StatsTracker
+
+pytestmark = pytest.mark.skipif(not is_available(), reason="aiohttp not installed (optional backend)")
+
+def test_per_host_limit_bounds_sockets():
+    with LocalNewsServer(items_per_feed=1, latency_ms=60) as server:
+        engine = AsyncFetchEngine(max_concurrency=64, per_host_limit=3, timeout=10)
+        try:
+            urls = [f"{server.url}/article/h/story-{i}" for i in range(12)]
+            pages = engine.fetch_many(urls + urls[:4]) # Duplicates are downloaded once
+        finally:
+            engine.close()
+        assert set(pages) == set(urls) and all(pages.values())
+        assert server.stats() == {"article 200": 12}
+        assert server.peak_active == 3
+
+def test_per_host_limit_holds_with_adaptive_limiter():
+    # The limiter would admit 16 at once; the per-host cap still applies
+    limiter = AdaptiveHostLimiter(initial_limit=16, max_limit=32, rate=1000, max_rate=1000, burst=100)
+    with LocalNewsServer(items_per_feed=1, latency_ms=60) as server:
+        engine = AsyncFetchEngine(max_concurrency=64, per_host_limit=3, timeout=10, limiter=limiter)
+        try:
+            urls = [f"{server.url}/article/h/story-{i}" for i in range(12)]
+            pages = engine.fetch_many(urls)
+        finally:
+            engine.close()
+        assert all(pages.values())
+        assert server.peak_active == 3
+        assert limiter.summary()["requests"] == 12
+
+def test_publishers_download_in_parallel_behind_one_feed_host(monkeypatch):
+    monkeypatch.setitem(CONFIG["CACHE"]["FEEDS"], "ENABLED", False)
+    monkeypatch.setitem(CONFIG["CACHE"]["ARTICLES"], "ENABLED", False)
+    monkeypatch.setitem(CONFIG["INCREMENTAL"], "ENABLED", False)
+    with LocalNewsServer(items_per_feed=12, hosts=4, latency_ms=150) as server:
+        monkeypatch.setitem(CONFIG, "ENDPOINTS", server.endpoints())
+        # Every article link is on 127.0.0.1 (like news.google.com): one socket per publisher
+        engine = AsyncFetchEngine(max_concurrency=64, per_host_limit=1, timeout=10)
+        monkeypatch.setattr(async_fetch_engine, "_engine", engine)
+        fetcher = GoogleNewsRSSFetcher(StatsTracker())
+        fetcher.backend, fetcher.inflight = "async", SingleFlight()
+        try:
+            items = fetcher.fetch("chip stocks")
+        finally:
+            engine.close()
+        assert len(items) == 12
+        assert server.peak_active == 4
+
+def test_timeout_and_http_errors_return_none():
+    with LocalNewsServer(items_per_feed=1, latency_ms=400) as server:
+        engine = AsyncFetchEngine(per_host_limit=4, timeout=0.1)
+        try:
+            slow = f"{server.url}/article/h/slow"
+            missing = f"{server.url}/nowhere"
+            assert engine.fetch_many([slow, missing]) == {slow: None, missing: None}
+        finally:
+            engine.close()
+        engine.close() # Idempotent
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
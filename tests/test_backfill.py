@@ -0,0 +1,177 @@
+import logging
+import os
+import sys
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CONFIG
+from utils.backfill import Backfill, date_windows, split_window
+from utils.journal import Journal
+from utils.utils_data import StatsTracker
+
+class _FakeGoogle:
+    """fetch_window stand-in: 100 entries (saturated) for any range wider than one day."""
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    def fetch_window(self, query, lang, geo, limit, start_date, end_date, split_at=None):
+        self.calls.append((query, start_date, end_date))
+        if (query, start_date) in self.fail:
+            self.fail.discard((query, start_date))
+            raise ConnectionError("feed down")
+        if split_at is not None: # Only multi-day windows are offered a split
+            return None, 100
+        return [{"title": f"{query} {start_date}", "link": f"https://example.com/{query}/{start_date}"}], 100
+
+class _FakeCollector:
+    def __init__(self, google):
+        self.stats = StatsTracker()
+        self.logger = logging.getLogger("test_backfill")
+        self.shared = None
+        self.google_fetcher = google
+        self.other_calls = []
+
+    def _prefetch_tickers(self, items):
+        return {}
+
+    def fetch_item(self, item, cat_name, start_date=None, end_date=None, prefetched=None, include_google=True):
+        assert include_google is False
+        self.other_calls.append(item["value"])
+        return [{"title": f"guardian {item['value']}", "link": f"https://guardian.example/{item['value']}"}]
+
+    def _tag(self, news_list, category):
+        for n in news_list:
+            n["category"] = category
+
+def _config(monkeypatch, tmp_path, window_days):
+    monkeypatch.setitem(CONFIG, "ENABLE_GOOGLE_RSS", True)
+    monkeypatch.setitem(CONFIG, "BACKFILL", {
+        "ENABLED": True, "WINDOW_DAYS": window_days, "SPLIT_AT": 90,
+        "MAX_PARALLEL_WINDOWS": 4, "CHECKPOINT_DIR": str(tmp_path)
+    })
+
+def test_date_windows_and_split():
+    assert date_windows("2025-01-01", "2025-01-05", 2) == [
+        ("2025-01-01", "2025-01-02"), ("2025-01-03", "2025-01-04"), ("2025-01-05", "2025-01-05")
+    ]
+    assert split_window("2025-01-01", "2025-01-04") == [("2025-01-01", "2025-01-02"), ("2025-01-03", "2025-01-04")]
+    assert split_window("2025-01-01", "2025-01-02") == [("2025-01-01", "2025-01-01"), ("2025-01-02", "2025-01-02")]
+    assert split_window("2025-01-01", "2025-01-01") is None
+
+def test_saturated_windows_split_down_to_days(monkeypatch, tmp_path):
+    _config(monkeypatch, tmp_path, window_days=4)
+    google = _FakeGoogle()
+    collector = _FakeCollector(google)
+    results = Backfill(collector, "G", "2025-01-01", "2025-01-04").run([{"value": "chips"}])
+
+    titles = sorted(r["title"] for r in results)
+    assert titles == ["chips 2025-01-01", "chips 2025-01-02", "chips 2025-01-03", "chips 2025-01-04", "guardian chips"]
+    assert all(r["category"] == "G" for r in results if r["title"].startswith("chips"))
+    # Windows are passed as inclusive day ranges
+    assert ("chips", "2025-01-04", "2025-01-04") in google.calls
+    assert collector.stats.stats["Backfill (Split)"]["count"] == 3
+    assert collector.stats.stats["Backfill (Windows)"]["count"] == 4
+
+def test_resume_skips_checkpointed_windows(monkeypatch, tmp_path):
+    _config(monkeypatch, tmp_path, window_days=1)
+    items = [{"value": "chips"}, {"value": "memory"}]
+
+    google = _FakeGoogle(fail={("memory", "2025-01-02")})
+    first = _FakeCollector(google)
+    results = Backfill(first, "G", "2025-01-01", "2025-01-03").run(items)
+    assert len(results) == 2 + 6 - 1
+    assert first.stats.stats["Backfill (Failed)"]["status"] == "FAILED"
+
+    # Rerun of the same group/range: only the failed window is fetched again
+    google = _FakeGoogle()
+    second = _FakeCollector(google)
+    backfill = Backfill(second, "G", "2025-01-01", "2025-01-03")
+    results = backfill.run(items)
+    assert google.calls == [("memory", "2025-01-02", "2025-01-02")]
+    assert second.other_calls == []
+    assert len(results) == 8
+    assert second.stats.stats["Backfill (Resumed)"]["count"] == 7
+
+    backfill.journal.remove()
+    assert not os.path.exists(backfill.journal.path)
+
+def test_resume_expands_split_windows(monkeypatch, tmp_path):
+    _config(monkeypatch, tmp_path, window_days=4)
+    items = [{"value": "chips"}]
+    first = Backfill(_FakeCollector(_FakeGoogle()), "G", "2025-01-01", "2025-01-04").run(items)
+
+    # Completed saturated backfill: the rerun rebuilds everything from the checkpoint
+    google = _FakeGoogle()
+    second = _FakeCollector(google)
+    results = Backfill(second, "G", "2025-01-01", "2025-01-04").run(items)
+    assert google.calls == [] and second.other_calls == []
+    assert sorted(r["title"] for r in results) == sorted(r["title"] for r in first)
+    assert second.stats.stats["Backfill (Resumed)"]["count"] == 1 + 4
+
+def test_resume_refetches_only_the_failed_half(monkeypatch, tmp_path):
+    _config(monkeypatch, tmp_path, window_days=4)
+    items = [{"value": "chips"}]
+    google = _FakeGoogle(fail={("chips", "2025-01-03")})
+    results = Backfill(_FakeCollector(google), "G", "2025-01-01", "2025-01-04").run(items)
+    assert len(results) == 1 + 2
+
+    google = _FakeGoogle()
+    results = Backfill(_FakeCollector(google), "G", "2025-01-01", "2025-01-04").run(items)
+    # The failed half is still saturated and splits again; the finished half is not refetched
+    assert google.calls[0] == ("chips", "2025-01-03", "2025-01-04")
+    assert sorted(google.calls[1:]) == [("chips", "2025-01-03", "2025-01-03"), ("chips", "2025-01-04", "2025-01-04")]
+    assert len(results) == 1 + 4
+
+def test_checkpoint_write_failure_does_not_abort(monkeypatch, tmp_path):
+    _config(monkeypatch, tmp_path, window_days=4)
+
+    def disk_full(self, record):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(Journal, "append", disk_full)
+    collector = _FakeCollector(_FakeGoogle())
+    results = Backfill(collector, "G", "2025-01-01", "2025-01-04").run([{"value": "chips"}])
+    assert len(results) == 1 + 4
+    assert collector.stats.stats["Backfill (Windows)"]["count"] == 4
+
+def test_window_keeps_only_its_own_days(monkeypatch):
+    import time
+    import feedparser
+    from data_sources.GoogleNews_RSS_Fetcher import GoogleNewsRSSFetcher
+    monkeypatch.setitem(CONFIG["CACHE"]["FEEDS"], "ENABLED", False)
+    monkeypatch.setitem(CONFIG["CACHE"]["ARTICLES"], "ENABLED", False)
+    monkeypatch.setitem(CONFIG["INCREMENTAL"], "ENABLED", False)
+
+    fetcher = GoogleNewsRSSFetcher(StatsTracker())
+    feeds = []
+    # Google also returns stories around the range: one per day, Jan 1-6, at noon
+    entries = [
+        feedparser.FeedParserDict(link=f"https://example.com/{day}", published_parsed=time.strptime(f"2025-01-0{day} 12:00", "%Y-%m-%d %H:%M"))
+        for day in range(1, 7)
+    ]
+    monkeypatch.setattr(fetcher, "_fetch_feed", lambda url: feeds.append(url) or entries)
+    monkeypatch.setattr(fetcher, "_scrape_entries", lambda valid, query: [{"link": entry["link"]} for entry in valid])
+
+    news, feed_size = fetcher.fetch_window("chips", start_date="2025-01-02", end_date="2025-01-03")
+    assert feed_size == 6
+    assert [item["link"] for item in news] == ["https://example.com/2", "https://example.com/3"]
+    assert "before%3A2025-01-04" in feeds[0] # Google's before: is exclusive
+
+def test_journal_ignores_torn_tail(tmp_path):
+    path = str(tmp_path / "j.ndjson")
+    journal = Journal(path)
+    journal.append({"key": [1]})
+    journal.close()
+    with open(path, "ab") as f:
+        f.write(b'{"key": [2')  # Crash mid-write
+
+    journal = Journal(path)
+    assert journal.replay() == [{"key": [1]}]
+    journal.append({"key": [3]})
+    journal.close()
+    assert Journal(path).replay() == [{"key": [1]}, {"key": [3]}]
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,69 @@
+import os
+import sys
+import numpy as np
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processors.clustering import community_detection
+
+def reference_community_detection(embeddings, threshold, min_community_size=1):
+    """
+    Full-matrix version of sentence_transformers.util.community_detection (CPU path).
+    """
+    emb = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    scores = emb @ emb.T
+    communities = []
+    for i in range(len(emb)):
+        order = sorted(range(len(emb)), key=lambda j: (-scores[i, j], j))
+        members = [j for j in order if scores[i, j] >= threshold]
+        if len(members) >= min_community_size:
+            communities.append(members)
+    communities.sort(key=len, reverse=True)
+    unique, extracted = [], set()
+    for community in communities:
+        rest = [j for j in community if j not in extracted]
+        if len(rest) >= min_community_size:
+            unique.append(rest)
+            extracted.update(rest)
+    unique.sort(key=len, reverse=True)
+    return unique
+
+def make_embeddings(n_topics=40, per_topic=5, dim=32, noise=0.05, seed=1):
+    rng = np.random.default_rng(seed)
+    topics = rng.standard_normal((n_topics, dim))
+    emb = np.repeat(topics, per_topic, axis=0) + noise * rng.standard_normal((n_topics * per_topic, dim))
+    return emb[rng.permutation(len(emb))].astype(np.float32)
+
+def keep_longest(clusters, lengths):
+    """DataCleaner strategy: per cluster keep the longest content, drop the rest."""
+    dropped = set()
+    for cluster in clusters:
+        ranked = sorted(cluster, key=lambda i: lengths[i], reverse=True)
+        dropped.update(ranked[1:])
+    return dropped
+
+def test_blocked_matches_reference():
+    emb = make_embeddings()
+    lengths = np.random.default_rng(2).integers(50, 500, len(emb))
+    expected = reference_community_detection(emb, 0.85)
+    # Small blocks force multiple tiles in both dimensions
+    actual = community_detection(emb, threshold=0.85, block_size=16)
+    assert actual == expected
+    assert keep_longest(actual, lengths) == keep_longest(expected, lengths)
+
+def test_lsh_prefilter_finds_planted_duplicates():
+    emb = make_embeddings(noise=0.01)
+    expected = reference_community_detection(emb, 0.9)
+    actual = community_detection(emb, threshold=0.9, lsh_bits=6, lsh_tables=8)
+    assert sorted(map(sorted, actual)) == sorted(map(sorted, expected))
+
+def test_empty_and_singletons():
+    assert community_detection(np.empty((0, 8))) == []
+    emb = np.eye(4, dtype=np.float32)
+    assert sorted(community_detection(emb, threshold=0.5)) == [[0], [1], [2], [3]]
+
+if __name__ == "__main__":
+    test_blocked_matches_reference()
+    test_lsh_prefilter_finds_planted_duplicates()
+    test_empty_and_singletons()
+    print("PASS: Clustering")
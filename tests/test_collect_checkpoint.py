@@ -0,0 +1,54 @@
+import os
+import sys
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CONFIG
+from collectors.base_collector import BaseCollector
+
+ITEMS = [{"name": f"Topic {i}", "value": f"topic {i}", "type": "keyword"} for i in range(6)]
+
+def _collector(monkeypatch, tmp_path, fail=()):
+    monkeypatch.setitem(CONFIG["GROUPS"], "ENGLISH_SOURCES", {"TEST_GROUP": {"desc": "Test", "items": ITEMS}})
+    monkeypatch.setitem(CONFIG["COLLECTION"], "CHECKPOINT", {"ENABLED": True, "DIR": str(tmp_path), "MAX_AGE_HOURS": 12})
+    monkeypatch.setitem(CONFIG["COLLECTION"]["TICKER_BATCH"], "ENABLED", False)
+    monkeypatch.setitem(CONFIG["INCREMENTAL"], "ENABLED", False) # collect_group would open cache/watermarks.sqlite3
+    collector = BaseCollector()
+    collector.fetched = []
+
+    def fetch_item(item, cat_name, start_date=None, end_date=None, prefetched=None, include_google=True):
+        collector.fetched.append(item["value"])
+        if item["value"] in fail:
+            raise MemoryError("killed mid-run")
+        return [{"title": item["value"], "link": f"https://example.com/{item['value']}", "category": cat_name}]
+
+    collector.fetch_item = fetch_item
+    return collector
+
+def test_rerun_fetches_only_missing_items(monkeypatch, tmp_path):
+    first = _collector(monkeypatch, tmp_path, fail={"topic 2", "topic 5"})
+    assert len(first.collect_group("TEST_GROUP")) == 4
+
+    second = _collector(monkeypatch, tmp_path)
+    results = second.collect_group("TEST_GROUP")
+    assert sorted(second.fetched) == ["topic 2", "topic 5"]
+    assert sorted(r["title"] for r in results) == [item["value"] for item in ITEMS]
+    assert second.stats.stats["Checkpoint (Resumed)"]["count"] == 4
+
+    # Saved report: the journal is gone and the next run starts fresh
+    monkeypatch.chdir(tmp_path)
+    second.save_report("Report_Test.json", results, second.stats.stats)
+    assert not os.path.exists(os.path.join(tmp_path, "TEST_GROUP_recent.ndjson"))
+
+def test_stale_recent_journal_is_ignored(monkeypatch, tmp_path):
+    _collector(monkeypatch, tmp_path).collect_group("TEST_GROUP")
+    path = os.path.join(tmp_path, "TEST_GROUP_recent.ndjson")
+    os.utime(path, (0, 0))
+
+    collector = _collector(monkeypatch, tmp_path)
+    collector.collect_group("TEST_GROUP")
+    assert len(collector.fetched) == len(ITEMS)
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
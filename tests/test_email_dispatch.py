@@ -0,0 +1,82 @@
+import io
+import os
+import sys
+import tempfile
+import zipfile
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email import encoders
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dispatchers.email_dispatcher import EmailDispatcher
+from core.sinks import EmailSink
+
+def make_dispatcher(**kwargs):
+    return EmailDispatcher("smtp.example.com", 465, None, None, "to@example.com", **kwargs)
+
+def wire_size(body_html, blobs):
+    """What send_email puts on the wire (CRLF line endings)."""
+    msg = MIMEMultipart()
+    msg['From'], msg['To'], msg['Subject'] = "from@example.com", "to@example.com", "[News_Engine] Subject"
+    msg.attach(MIMEText(body_html, 'html'))
+    for name, data in blobs:
+        part = MIMEBase("application", "octet-stream")
+        part.set_payload(data)
+        encoders.encode_base64(part)
+        part.add_header('Content-Disposition', 'attachment', filename=name)
+        msg.attach(part)
+    return len(msg.as_string().replace("\n", "\r\n").encode("utf-8"))
+
+def test_size_estimate_is_close_and_conservative():
+    dispatcher = make_dispatcher()
+    blobs = [("reports.zip", os.urandom(300_000))]
+    for body in ("<p>ascii only</p>\n" * 5000, "<h2>📌 港股科技</h2>\n" * 5000):
+        estimate = dispatcher.estimate_message_size(body, blobs)
+        actual = wire_size(body, blobs)
+        assert actual <= estimate <= actual + 8192
+
+def test_attachments_zipped_in_memory():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for name in ("Report_US_Tech.json", "Report_Macro.json"):
+            path = os.path.join(tmp, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"cleaned_data": []}\n' * 2000)
+            paths.append(path)
+        blobs = make_dispatcher().pack_attachments(paths + [os.path.join(tmp, "missing.json")])
+        assert len(blobs) == 1 and blobs[0][0].endswith(".zip")
+        with zipfile.ZipFile(io.BytesIO(blobs[0][1])) as zf:
+            assert sorted(zf.namelist()) == ["Report_Macro.json", "Report_US_Tech.json"]
+        assert len(blobs[0][1]) < sum(os.path.getsize(p) for p in paths) / 10
+
+        raw = make_dispatcher(compress_attachments=False).pack_attachments(paths)
+        assert [name for name, _ in raw] == ["Report_US_Tech.json", "Report_Macro.json"]
+
+def test_missing_credentials_returns_tuple():
+    assert make_dispatcher().send_email("s", "<p>x</p>") == (False, "Missing SENDER_EMAIL or SENDER_PASSWORD")
+
+def test_planner_picks_largest_fitting_stage():
+    items = [{"title": f"T{i}", "content": "x" * 2000, "source": "S"} for i in range(200)]
+    payload = {"cleaned_data": items, "meta": {}}
+    bus = EmailSink(make_dispatcher(max_message_bytes=10 ** 9))
+    assert bus.plan_dispatch(payload, "Topic", [])[0] == 0
+
+    # Full content (~680 KB as base64) does not fit, 500-char truncation (~275 KB) does
+    bus.email_dispatcher.max_message_bytes = 300_000
+    stage, bodies, blobs = bus.plan_dispatch(payload, "Topic", [])
+    assert stage == 1 and list(bodies) == [500] and blobs == []
+
+    # Attachments that can never fit are dropped instead of failing every attempt,
+    # and the mail says which reports are missing
+    stage, bodies, blobs = bus.plan_dispatch(payload, "Topic", [("big.zip", b"0" * 500_000)],
+                                             names=["Report_US_Tech.json", "Report_Macro.json"])
+    assert stage == 1 and blobs == []
+    assert "Not attached (message size limit): Report_US_Tech.json, Report_Macro.json" in bodies[500]
+    assert bodies[500].rstrip().endswith("</html>")
+
+    # Attachments that fit are sent and not mentioned
+    bus.email_dispatcher.max_message_bytes = 10 ** 9
+    _, bodies, blobs = bus.plan_dispatch(payload, "Topic", [("small.zip", b"0" * 1000)], names=["Report_US_Tech.json"])
+    assert blobs and "Not attached" not in bodies[None]
@@ -0,0 +1,40 @@
+import os
+import sys
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from formatters.email_formatter import EmailFormatter
+
+ITEMS = [
+    {"title": "Fed holds rates", "source": "Guardian", "content": "A" * 800, "link": "https://example.com/a", "published_date": "2025-01-01"},
+    {"title": "Oil slips", "source": "YFinance", "content": "short", "publish_time": "2025-01-02"},
+]
+PAYLOAD = {
+    "is_unified": True,
+    "subject": "Daily",
+    "results": {"MACRO": {"data": {"cleaned_data": ITEMS, "raw_data": ITEMS * 3}, "meta": {"group_name": "Macro"}}},
+}
+
+def test_cached_variants_match_fresh_renders():
+    reused = EmailFormatter()
+    for limit in (None, 500, 100, 0):
+        assert reused.format_html(PAYLOAD, cleaned_truncate_length=limit) == EmailFormatter().format_html(PAYLOAD, cleaned_truncate_length=limit)
+
+def test_truncation_stages():
+    formatter = EmailFormatter()
+    full = formatter.format_html(PAYLOAD)
+    assert "A" * 800 in full and "Cleaned: 2 | Raw: 6" in full and "📌 Macro" in full
+    truncated = formatter.format_html(PAYLOAD, cleaned_truncate_length=100)
+    assert "A" * 100 + "..." in truncated and "A" * 101 not in truncated
+    assert '<div class="summary">short</div>' in truncated
+    title_only = formatter.format_html(PAYLOAD, cleaned_truncate_length=0)
+    assert 'class="summary"' not in title_only and "Oil slips" in title_only
+
+    # A new payload is rendered from scratch, not from the cache
+    other = {"cleaned_data": [{"title": "Other story", "content": "body"}], "meta": {}}
+    assert "Other story" in formatter.format_html(other)
+
+if __name__ == "__main__":
+    test_cached_variants_match_fresh_renders()
+    test_truncation_stages()
+    print("PASS: EmailFormatter")
@@ -0,0 +1,139 @@
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from processors.embedding_cache import EmbeddingCache, _AdvisoryLock
+
+DIM = 8
+
+def _vec(i):
+    return np.full(DIM, float(i), dtype=np.float32)
+
+def _texts(ids):
+    return [f"story {i}" for i in ids]
+
+def _read_log(cache_dir):
+    with open(os.path.join(cache_dir, "model.index.ndjson"), encoding="utf-8") as f:
+        header, *lines = [json.loads(line) for line in f]
+    return header, lines
+
+def _age_entries(cache_dir, keep):
+    """Mark every index entry except the keys in `keep` as long unused (the next cache opened evicts them)."""
+    path = os.path.join(cache_dir, "model.index.ndjson")
+    # Like a cache writer rewriting its log: under the file lock, new log id, atomic replace
+    with _AdvisoryLock(os.path.join(cache_dir, "model.lock")):
+        header, lines = _read_log(cache_dir)
+        header["id"] = uuid.uuid4().hex
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(json.dumps(header) + "\n")
+            for key, row, ts in lines:
+                f.write(json.dumps([key, row, ts if key in keep else 0]) + "\n")
+        os.replace(path + ".tmp", path)
+
+def test_roundtrip_and_missing(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(_texts(range(3)), [_vec(i) for i in range(3)])
+    vectors, missing = cache.get_many(_texts([0, 2, 7]))
+    assert missing == [2]
+    assert vectors[0][0] == 0 and vectors[1][0] == 2
+
+def test_reader_sees_compaction_by_other_process(tmp_path):
+    reader = EmbeddingCache(str(tmp_path), "model")
+    reader.put_many(_texts(range(10)), [_vec(i) for i in range(10)])
+    assert reader.get_many(_texts([9]))[0][0][0] == 9
+
+    # Another process starts, evicts 7 of 10 rows and compacts: row numbers change
+    survivors = _texts([3, 6, 9])
+    _age_entries(str(tmp_path), {reader.key(t) for t in survivors})
+    EmbeddingCache(str(tmp_path), "model")
+
+    vectors, missing = reader.get_many(_texts([3, 6, 9, 0]))
+    assert [v[0] for v in vectors[:3]] == [3, 6, 9] # Not whatever now sits at the old rows
+    assert missing == [3]
+
+def test_concurrent_reads_during_compactions(tmp_path):
+    writer = EmbeddingCache(str(tmp_path), "model")
+    writer.put_many(_texts(range(40)), [_vec(i) for i in range(40)])
+    reader = EmbeddingCache(str(tmp_path), "model")
+    wrong = []
+    stop = threading.Event()
+
+    def read_loop():
+        ids = list(range(40))
+        while not stop.is_set():
+            vectors, _ = reader.get_many(_texts(ids))
+            wrong.extend((i, v[0]) for i, v in zip(ids, vectors) if v is not None and v[0] != i)
+
+    thread = threading.Thread(target=read_loop)
+    thread.start()
+    try:
+        for round_ in range(8):
+            # Each round: fresh rows appended, most rows aged out, compaction in a "new process"
+            new_ids = range(100 + round_ * 10, 110 + round_ * 10)
+            writer.put_many(_texts(new_ids), [_vec(i) for i in new_ids])
+            _age_entries(str(tmp_path), {writer.key(t) for t in _texts(range(0, 40, 3 + round_ % 3))})
+            writer = EmbeddingCache(str(tmp_path), "model")
+    finally:
+        stop.set()
+        thread.join(10)
+    assert wrong == []
+
+def test_hits_are_appended_not_rewritten(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(_texts(range(5)), [_vec(i) for i in range(5)])
+    header, lines = _read_log(str(tmp_path))
+    assert len(lines) == 5
+
+    cache.get_many(_texts([1, 3]))
+    cache.flush()
+    after, lines = _read_log(str(tmp_path))
+    assert after == header # Same log, two more lines
+    assert sorted(line[0] for line in lines[5:]) == sorted(cache.key(t) for t in _texts([1, 3]))
+
+    # Another process sees them without a rewrite
+    other = EmbeddingCache(str(tmp_path), "model")
+    assert other.entries[cache.key("story 1")][1] == cache.entries[cache.key("story 1")][1]
+
+def test_long_running_cache_evicts_on_flush(tmp_path, monkeypatch):
+    cache = EmbeddingCache(str(tmp_path), "model", max_age_days=1, max_entries=10)
+    clock = [time.time()]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+
+    for start in range(0, 30, 5): # Never reopened, like --serve
+        clock[0] += 1
+        cache.put_many(_texts(range(start, start + 5)), [_vec(i) for i in range(start, start + 5)])
+    # Over the cap: least recently used dropped, vector file compacted
+    assert len(cache.entries) <= 10
+    assert cache._row_count() <= 20
+    assert cache.get_many(_texts([29]))[0][0][0] == 29
+    assert cache.get_many(_texts([0]))[1] == [0]
+    assert len(_read_log(str(tmp_path))[1]) == len(cache.entries)
+
+    # A day later an idle cache drops what aged out on its next flush
+    clock[0] += 2 * 86400
+    cache.get_many(_texts([29]))
+    cache.flush()
+    assert list(cache.entries) == [cache.key("story 29")]
+
+def test_legacy_json_index_is_upgraded(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(_texts(range(3)), [_vec(i) for i in range(3)])
+    header, lines = _read_log(str(tmp_path))
+    with open(tmp_path / "model.index.json", "w", encoding="utf-8") as f:
+        json.dump({"model": "model", "dim": DIM, "generation": header["generation"],
+                   "entries": {key: [row, ts] for key, row, ts in lines}}, f)
+    os.remove(tmp_path / "model.index.ndjson")
+
+    upgraded = EmbeddingCache(str(tmp_path), "model")
+    assert upgraded.get_many(_texts([2]))[0][0][0] == 2
+    assert not os.path.exists(tmp_path / "model.index.json")
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
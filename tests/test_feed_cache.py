@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.feed_cache import FeedCache
+
+def test_feed_cache_validators_roundtrip():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FeedCache(os.path.join(tmp, "feeds.sqlite3"))
+        assert cache.get("https://news.google.com/rss/search?q=NVDA") is None
+        assert FeedCache.conditional_headers(None) == {}
+
+        entries = [{"link": "https://example.com/a", "title": "Nvidia beats", "published_parsed": [2024, 1, 2, 3, 4, 5, 1, 2, 0]}]
+        cache.put("https://news.google.com/rss/search?q=NVDA", entries, etag='"abc"', modified="Tue, 02 Jan 2024 03:04:05 GMT")
+        cache.close()
+
+        # Persisted across runs
+        reopened = FeedCache(os.path.join(tmp, "feeds.sqlite3"))
+        cached = reopened.get("https://news.google.com/rss/search?q=NVDA")
+        assert cached["payload"] == entries
+        assert FeedCache.conditional_headers(cached) == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Tue, 02 Jan 2024 03:04:05 GMT",
+        }
+        reopened.close()
+
+def test_feed_cache_purges_stale_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "feeds.sqlite3")
+        cache = FeedCache(path)
+        cache.put("u1", [], etag='"x"')
+        cache.close()
+
+        reopened = FeedCache(path, max_age_days=0)
+        assert reopened.get("u1") is None
+        reopened.close()
+
+if __name__ == "__main__":
+    test_feed_cache_validators_roundtrip()
+    test_feed_cache_purges_stale_rows()
+    print("PASS: FeedCache")
@@ -0,0 +1,47 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_sources.http_client import PooledSession
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep-alive
+    connections = set()
+    calls = 0
+
+    def do_GET(self):
+        type(self).connections.add(self.client_address)
+        type(self).calls += 1
+        # First request fails with 503 to exercise the transport retry
+        status = 503 if self.path == "/flaky" and type(self).calls == 1 else 200
+        body = b"<rss></rss>"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_pooled_session_reuses_connections_and_retries():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    session = PooledSession(retries=2, backoff_factor=0, timeout=5)
+    try:
+        assert session.get(f"{base}/flaky").status_code == 200
+        for _ in range(5):
+            assert session.get(f"{base}/feed").status_code == 200
+        # 7 requests (incl. the retried 503) over a single keep-alive socket
+        assert _Handler.calls == 7
+        assert len(_Handler.connections) == 1
+    finally:
+        session.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_pooled_session_reuses_connections_and_retries()
+    print("PASS: HTTP client")
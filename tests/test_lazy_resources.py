@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+# Make sure project root is in path if running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import pytest
+from config import CONFIG
+from collectors.lazy_resources import LazyResources, resources_for_items
+from collectors.base_collector import BaseCollector
+from collectors.shared_resources import SharedResources
+import utils.feed_cache as feed_cache
+
+HEAVY = ["yfinance", "akshare", "openbb", "newspaper", "bs4", "feedparser", "numpy", "torch", "sentence_transformers", "pyarrow"]
+
+def test_importing_main_loads_no_data_source_library():
+    code = f"import sys, main; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True)
+    assert out.stdout.strip() == ""
+
+def test_resources_follow_item_types():
+    keywords = [{"value": "fed", "type": "keyword"}]
+    assert resources_for_items(keywords) == ["google_fetcher", "guardian_fetcher", "cleaner"]
+    assert resources_for_items(keywords, google_enabled=False) == ["cleaner"]
+    assert resources_for_items([{"value": "600519", "type": "stock_zh_a"}]) == ["ak_fetcher", "cleaner"]
+    assert resources_for_items([{"value": "AAPL", "type": "stock_us"}]) == ["yf_fetcher", "obb_fetcher", "cleaner"]
+
+def test_fetchers_built_on_first_use(monkeypatch, tmp_path):
+    # Fetchers open their caches on construction: keep them out of the repo
+    monkeypatch.setitem(CONFIG["CACHE"], "DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(feed_cache, "_cache", None)
+    collector = BaseCollector()
+    assert collector.loaded_resources() == []
+    guardian = collector.guardian_fetcher
+    assert collector.guardian_fetcher is guardian and guardian.stats is collector.stats
+    assert collector.loaded_resources() == ["guardian_fetcher"]
+
+    shared = SharedResources(max_workers=1)
+    try:
+        first, second = BaseCollector(shared=shared), BaseCollector(shared=shared)
+        assert first.guardian_fetcher is second.guardian_fetcher is shared.guardian_fetcher
+        assert shared.loaded_resources() == ["guardian_fetcher"]
+    finally:
+        shared.shutdown()
+
+def test_subclasses_must_build_and_init():
+    class NoBuild(LazyResources):
+        pass
+
+    with pytest.raises(TypeError):
+        NoBuild()
+
+    class NoInit(LazyResources):
+        def __init__(self):
+            pass
+
+        def _build(self, name):
+            return name
+
+    with pytest.raises(AttributeError, match="__init__ was not called"):
+        NoInit().cleaner
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
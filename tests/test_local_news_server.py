@@ -0,0 +1,90 @@
+import os
+import sys
+# Make sure project root is in path if running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "benchmarks"))
+
+from config import CONFIG
+from local_news_server import LocalNewsServer
+from data_sources.GoogleNews_RSS_Fetcher import GoogleNewsRSSFetcher
+from data_sources.Guardian_Fetcher import GuardianFetcher
+from utils.rate_limiter import AdaptiveHostLimiter
+from utils.singleflight import SingleFlight
+from utils.utils_data import StatsTracker
+
+def test_fetchers_run_offline_against_stand_in(monkeypatch, tmp_path):
+    with LocalNewsServer(items_per_feed=12, hosts=3) as server:
+        monkeypatch.setitem(CONFIG, "ENDPOINTS", server.endpoints())
+        monkeypatch.setitem(CONFIG["CACHE"]["FEEDS"], "ENABLED", False)
+        monkeypatch.setitem(CONFIG["CACHE"]["ARTICLES"], "ENABLED", False)
+        monkeypatch.setitem(CONFIG["INCREMENTAL"], "ENABLED", False)
+        monkeypatch.setenv("GUARDIAN_API_KEY", "offline")
+
+        items = GoogleNewsRSSFetcher(StatsTracker()).fetch("chip stocks")
+        assert len(items) == 12
+        assert {item["source"] for item in items} == {"GoogleNews (FullText)"}
+        assert len({item["content"] for item in items}) == 12 # Unique bodies survive dedup
+
+        guardian = GuardianFetcher(StatsTracker()).fetch("chip stocks", limit=5)
+        assert len(guardian) == 5 and guardian[0]["source"] == "The Guardian (FullText)"
+        assert server.stats() == {"article 200": 12, "guardian 200": 1, "rss 200": 1}
+
+def test_download_decodes_pages_without_charset(monkeypatch):
+    import requests
+    monkeypatch.setitem(CONFIG["CACHE"]["FEEDS"], "ENABLED", False)
+    monkeypatch.setitem(CONFIG["CACHE"]["ARTICLES"], "ENABLED", False)
+    monkeypatch.setitem(CONFIG["INCREMENTAL"], "ENABLED", False)
+    body = "<html><body><p>港股医药板块午后走强，创新药概念股领涨。</p></body></html>".encode("utf-8")
+
+    class Session:
+        def get(self, url, timeout=None):
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["Content-Type"] = "text/html"
+            response.encoding = requests.utils.get_encoding_from_headers(response.headers) # ISO-8859-1, as the adapter sets it
+            response._content = body
+            return response
+
+    fetcher = GoogleNewsRSSFetcher(StatsTracker())
+    fetcher.http, fetcher.limiter = Session(), None
+    assert "创新药" in fetcher._download("http://example.cn/a")
+
+def test_throttled_publisher_does_not_slow_other_hosts(monkeypatch):
+    monkeypatch.setitem(CONFIG["CACHE"]["FEEDS"], "ENABLED", False)
+    monkeypatch.setitem(CONFIG["CACHE"]["ARTICLES"], "ENABLED", False)
+    monkeypatch.setitem(CONFIG["INCREMENTAL"], "ENABLED", False)
+    with LocalNewsServer(items_per_feed=12, hosts=2, throttled_hosts={"publisher0.example"}) as server:
+        monkeypatch.setitem(CONFIG, "ENDPOINTS", server.endpoints())
+        fetcher = GoogleNewsRSSFetcher(StatsTracker())
+        # Every link is on 127.0.0.1 (like news.google.com); the feed's <source> names the publisher
+        fetcher.backend, fetcher.max_workers, fetcher.inflight = "threads", 2, SingleFlight()
+        fetcher.limiter = AdaptiveHostLimiter(initial_limit=8, rate=2.0, burst=10, max_wait=0.3)
+
+        items = fetcher.fetch("chip stocks")
+        throttled_links = [f"{server.url}/article/publisher0.example/chip-stocks-{i}" for i in range(0, 12, 2)]
+
+    hosts = fetcher.limiter.snapshot()
+    assert "127.0.0.1" not in hosts
+    throttled = hosts["publisher0.example"]
+    assert throttled["throttled"] > 0 and throttled["limit"] < 8 and throttled["rate"] < 2.0
+    healthy = hosts["publisher1.example"]
+    assert healthy["requests"] == 6 and healthy["throttled"] == 0
+    assert healthy["limit"] >= 8 and healthy["rate"] > 2.0
+    assert sorted(item["source"] for item in items) == ["GoogleNews (FullText)"] * 6 + ["GoogleNews (Snippet)"] * 6
+
+    # Deferred downloads are not kept: a later caller gets another try once the host recovers
+    assert [url for url in throttled_links if not fetcher.inflight.seen(url)]
+
+def test_error_injection_is_seeded():
+    def run():
+        with LocalNewsServer(items_per_feed=1, error_rate=0.5, seed=7) as server:
+            import requests
+            statuses = [requests.get(f"{server.url}/article/h/x-{i}").status_code for i in range(20)]
+        return statuses
+    first = run()
+    assert first == run() and 0 < first.count(503) < 20
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
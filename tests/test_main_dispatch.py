@@ -0,0 +1,50 @@
+import os
+import sys
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+class _RecordingBus:
+    instances = []
+
+    def __init__(self):
+        self.published = []
+        self.shut_down = False
+        _RecordingBus.instances.append(self)
+
+    def publish(self, topic, data, meta=None):
+        self.published.append(topic)
+
+    def shutdown(self, timeout=None):
+        self.shut_down = True
+        return {}
+
+def test_bus_shut_down_when_nothing_collected(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["main.py", "--collector", "US_TECH"])
+    monkeypatch.setattr(main, "MessageBus", _RecordingBus)
+    monkeypatch.setattr(main, "run_collector", lambda key, start_date=None, end_date=None: (None, None))
+    _RecordingBus.instances.clear()
+
+    main.main()
+
+    bus, = _RecordingBus.instances
+    assert bus.published == [] and bus.shut_down
+    assert (tmp_path / "data" / "Run_Metrics.metrics.json").exists()
+
+def test_delivered_report_copies_are_deleted(tmp_path):
+    report = tmp_path / "US_TECH.json"
+    copy = tmp_path / "US_TECH_20260301_080000.json"
+    other = tmp_path / "CN_20260301_080000.json"
+    for path in (report, copy, other):
+        path.write_text("{}")
+    copies = {str(copy), str(other)}
+
+    main._drop_report_copies({"US_TECH": {"meta": {"filenames": [str(copy), str(report)]}}}, copies)
+    assert not copy.exists() and report.exists() and other.exists()
+    assert copies == {str(other)} # Still awaiting its own dispatch
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,143 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.message_bus import MessageBus
+from core.sinks import BaseSink, FileSink, WebhookSink
+
+PAYLOAD = {
+    "is_unified": True,
+    "results": {
+        "US_TECH": {
+            "data": {"cleaned_data": [{"title": "A"}, {"title": "B"}], "raw_data": [{"title": "A"}, {"title": "B"}, {"title": "C"}]},
+            "meta": {"group_name": "美股科技与AI"}
+        }
+    },
+    "meta": {}
+}
+
+class SlowSink(BaseSink):
+    name = "slow"
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.release = threading.Event()
+
+    def deliver(self, message):
+        self.release.wait(self.delay)
+        return True
+
+class FailingSink(BaseSink):
+    name = "failing"
+
+    def deliver(self, message):
+        raise RuntimeError("boom")
+
+def start_webhook_server():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append(json.loads(body))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, received
+
+def test_sinks_deliver_in_background():
+    server, received = start_webhook_server()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "outbox.ndjson")
+            bus = MessageBus(sinks=[
+                FileSink(path, include_data=False),
+                WebhookSink(f"http://127.0.0.1:{server.server_port}/hook")
+            ])
+            assert bus.publish("Daily", PAYLOAD, meta={"date": "2026-01-01"}) == 2
+            metrics = bus.shutdown(timeout=10)
+
+            with open(path, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+            assert len(lines) == 1 and lines[0]["topic"] == "Daily" and "data" not in lines[0]
+            assert lines[0]["summary"]["US_TECH"] == {"group_name": "美股科技与AI", "count": 2, "raw_count": 3, "titles": ["A", "B"]}
+
+            assert len(received) == 1 and received[0]["summary"]["US_TECH"]["count"] == 2
+            assert metrics["file"]["delivered"] == 1 and metrics["webhook"]["delivered"] == 1
+            assert metrics["webhook"]["latency_ms"]["avg"] is not None
+    finally:
+        server.shutdown()
+
+def test_slow_sink_blocks_neither_publish_nor_other_sinks():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "outbox.ndjson")
+        slow = SlowSink(delay=30)
+        bus = MessageBus(sinks=[slow, FileSink(path)])
+
+        start = time.perf_counter()
+        for i in range(3):
+            bus.publish(f"T{i}", PAYLOAD)
+        assert time.perf_counter() - start < 1
+
+        # File sink drained while the slow one is still on its first message
+        assert bus.workers["file"].wait_idle(time.monotonic() + 5)
+        with open(path, encoding="utf-8") as f:
+            assert len(f.readlines()) == 3
+        metrics = bus.metrics()
+        assert metrics["slow"]["delivered"] == 0 and metrics["slow"]["queue_depth"] >= 1
+
+        slow.release.set()
+        metrics = bus.shutdown(timeout=5)
+        assert metrics["slow"]["delivered"] == 3 and metrics["file"]["delivered"] == 3
+
+def test_full_queue_drops_and_failures_are_counted():
+    slow = SlowSink(delay=30)
+    bus = MessageBus(sinks=[slow, FailingSink()])
+    bus.put_timeout = 0.05
+    bus.workers["slow"].queue.maxsize = 1
+
+    accepted = [bus.publish(f"T{i}", PAYLOAD) for i in range(4)]
+    # First message is taken by the worker, the second fills the queue, the rest are dropped
+    assert accepted[-1] == 1
+    slow.release.set()
+    metrics = bus.shutdown(timeout=5)
+    assert metrics["slow"]["dropped"] >= 1
+    assert metrics["slow"]["delivered"] + metrics["slow"]["dropped"] == 4
+    assert metrics["failing"]["failed"] == 4 and metrics["failing"]["dropped"] == 0
+
+def test_publish_and_wait_reports_each_sink():
+    with tempfile.TemporaryDirectory() as tmp:
+        slow = SlowSink(delay=30)
+        bus = MessageBus(sinks=[FileSink(os.path.join(tmp, "outbox.ndjson")), FailingSink(), slow])
+        assert bus.publish_and_wait("Daily", PAYLOAD, timeout=0.5) == {"file": True, "failing": False, "slow": False}
+        slow.release.set()
+        bus.shutdown(timeout=5)
+
+def test_sink_must_implement_deliver():
+    class NoDeliver(BaseSink):
+        name = "incomplete"
+    try:
+        NoDeliver()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("BaseSink subclass without deliver() was instantiated")
+
+if __name__ == "__main__":
+    test_sinks_deliver_in_background()
+    test_slow_sink_blocks_neither_publish_nor_other_sinks()
+    test_full_queue_drops_and_failures_are_counted()
+    test_publish_and_wait_reports_each_sink()
+    test_sink_must_implement_deliver()
+    print("OK")
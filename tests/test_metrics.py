@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+import threading
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.metrics import MetricsRegistry, to_prometheus, write_metrics
+from utils.utils_data import StatsRouter, StatsTracker
+
+def test_sharded_updates_merge_across_threads():
+    stats = StatsTracker()
+
+    def work(n):
+        for i in range(1000):
+            stats.incr("bytes_downloaded_total", 10, source="article")
+            stats.observe("source_latency_seconds", 0.02 if i % 50 else 3.0, source="article")
+        stats.update(f"GoogleRSS (q{n})", 5)
+        stats.update("ArticleCache (Hit)", 1)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats.update("GoogleRSS (q0)", 0, "boom")
+
+    snapshot = stats.metrics()
+    assert snapshot["counters"]["bytes_downloaded_total"] == [{"labels": {"source": "article"}, "value": 80000}]
+    hist = snapshot["histograms"]["source_latency_seconds"][0]
+    assert hist["count"] == 8000 and hist["max"] == 3.0
+    assert 0.01 <= hist["p50"] <= 0.025 and 2.5 <= hist["p99"] <= 3.0
+    assert stats.stats["ArticleCache (Hit)"] == {"count": 8, "status": "OK", "error": None}
+    assert stats.stats["GoogleRSS (q0)"] == {"count": 5, "status": "FAILED", "error": "boom"}
+
+def test_stage_timer_and_router_binding():
+    tracker, router = StatsTracker(), StatsRouter()
+    with router.bind(tracker):
+        with router.stage("scrape"):
+            pass
+        router.incr("retries_total", source="YFinance")
+    stage = tracker.metrics()["histograms"]["stage_seconds"][0]
+    assert stage["labels"] == {"stage": "scrape"} and stage["count"] == 1
+    assert router.default.metrics()["counters"] == {}
+
+def test_prometheus_and_json_export(tmp_path):
+    registry = MetricsRegistry(buckets=(0.1, 1))
+    registry.observe("stage_seconds", 0.5, stage="fetch")
+    registry.observe("stage_seconds", 5, stage="fetch")
+    registry.incr("timeouts_total", source='we"ird')
+    registry.update_source("Guardian (AI)", 3)
+    text = to_prometheus(registry.snapshot(), {"report": "Report_US_Tech"})
+    assert '# TYPE news_engine_stage_seconds histogram' in text
+    assert 'news_engine_stage_seconds_bucket{report="Report_US_Tech",stage="fetch",le="0.1"} 0' in text
+    assert 'news_engine_stage_seconds_bucket{report="Report_US_Tech",stage="fetch",le="1"} 1' in text
+    assert 'news_engine_stage_seconds_bucket{report="Report_US_Tech",stage="fetch",le="+Inf"} 2' in text
+    assert 'news_engine_stage_seconds_count{report="Report_US_Tech",stage="fetch"} 2' in text
+    assert 'news_engine_timeouts_total{report="Report_US_Tech",source="we\\"ird"} 1' in text
+    assert 'news_engine_source_items{report="Report_US_Tech",source="Guardian (AI)"} 3' in text
+
+    json_path, prom_path = write_metrics(registry.snapshot(), str(tmp_path / "Report_US_Tech"))
+    with open(json_path, encoding="utf-8") as f:
+        assert json.load(f)["histograms"]["stage_seconds"][0]["sum"] == 5.5
+    assert os.path.exists(prom_path) and not os.path.exists(prom_path + ".tmp")
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,48 @@
+import os
+import sys
+import threading
+import time
+import types
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processors import model_registry
+
+class _SlowModel:
+    loads = 0
+    lock = threading.Lock()
+
+    def __init__(self, name):
+        with _SlowModel.lock:
+            _SlowModel.loads += 1
+        time.sleep(0.1) # Concurrent callers arrive during the load
+        self.name = name
+
+def test_one_model_per_name_across_threads(monkeypatch):
+    # Stand-in for the optional sentence-transformers package, scoped to this test
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=_SlowModel))
+    monkeypatch.setattr(model_registry, "_models", {})
+    monkeypatch.setattr(model_registry, "_model_locks", {})
+    _SlowModel.loads = 0
+
+    barrier = threading.Barrier(8)
+    got = [None] * 8
+
+    def worker(i):
+        barrier.wait()
+        got[i] = model_registry.get_model("mini" if i % 2 else "large")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+    assert _SlowModel.loads == 2
+    assert len({id(m) for m in got if m.name == "mini"}) == 1
+    assert len({id(m) for m in got if m.name == "large"}) == 1
+    assert sorted(model_registry.loaded_models()) == ["large", "mini"]
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
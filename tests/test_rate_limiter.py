@@ -0,0 +1,58 @@
+import os
+import sys
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rate_limiter import AdaptiveHostLimiter
+
+def test_concurrency_limit_and_token_bucket():
+    limiter = AdaptiveHostLimiter(initial_limit=2, rate=1.0, burst=5)
+    assert limiter.try_acquire("a.com") == 0.0
+    assert limiter.try_acquire("a.com") == 0.0
+    # At the concurrency limit: wait hint, other hosts unaffected
+    assert limiter.try_acquire("a.com") > 0
+    assert limiter.try_acquire("b.com") == 0.0
+
+    # Burst exhausted -> wait roughly one token interval
+    limiter = AdaptiveHostLimiter(initial_limit=10, rate=1.0, burst=1)
+    assert limiter.try_acquire("a.com") == 0.0
+    assert 0.5 < limiter.try_acquire("a.com") <= 1.0
+    assert limiter.acquire("a.com", max_wait=0.01) is False
+
+def test_aimd_adapts_to_responses():
+    limiter = AdaptiveHostLimiter(initial_limit=4, max_limit=8, rate=2.0, burst=100, latency_target=1.0)
+    for _ in range(40):
+        assert limiter.acquire("good.com", max_wait=1)
+        limiter.release("good.com", 200, 0.05)
+    assert limiter.snapshot()["good.com"]["limit"] == 8
+    assert limiter.snapshot()["good.com"]["rate"] > 2.0
+
+    for status in (429, 403):
+        assert limiter.acquire("hostile.com", max_wait=1)
+        limiter.release("hostile.com", status, 0.05)
+    hostile = limiter.snapshot()["hostile.com"]
+    assert hostile["limit"] == 1 and hostile["throttled"] == 2 and hostile["rate"] == 0.5
+
+    # Slow answers shrink the limit without counting as throttled
+    assert limiter.acquire("slow.com", max_wait=1)
+    limiter.release("slow.com", 200, 3.0)
+    assert limiter.snapshot()["slow.com"]["limit"] == 3
+
+    summary = limiter.summary()
+    assert summary["hosts"] == 3 and summary["throttled"] == 2
+    assert list(summary["backed_off"]) == ["hostile.com"]
+
+def test_release_adapts_the_host_that_answered():
+    limiter = AdaptiveHostLimiter(initial_limit=2, rate=2.0, burst=10)
+    assert limiter.acquire("publisher.com", max_wait=1)
+    # Admitted on the publisher, answered by the host it redirected to
+    limiter.release("publisher.com", 429, 0.05, answered_by="www.publisher.com")
+    hosts = limiter.snapshot()
+    assert hosts["publisher.com"]["inflight"] == 0 and hosts["publisher.com"]["throttled"] == 0
+    assert hosts["www.publisher.com"]["throttled"] == 1 and hosts["www.publisher.com"]["rate"] == 1.0
+
+if __name__ == "__main__":
+    test_concurrency_limit_and_token_bucket()
+    test_aimd_adapts_to_responses()
+    test_release_adapts_the_host_that_answered()
+    print("PASS: Host limiter")
@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.report_archive import ReportArchive, available_codecs, load_report, write_report_archive
+from utils.utils_data import save_custom_json
+
+def make_report():
+    raw = []
+    for i in range(60):
+        item = {
+            "source": "GoogleNews (FullText)" if i % 2 else "YFinance",
+            "title": f"Story {i} 新闻",
+            "content": f"Body {i}\nline two " * 40,
+            "related_ticker": "NVDA",
+            "category": "US_MARKET_TECH" if i % 3 else "HK_TECH",
+        }
+        if i % 2:
+            item["author"] = ["A. Writer"]
+        else:
+            item["publish_time"] = None # present but null, distinct from missing
+        raw.append(item)
+    cleaned = raw[::2]
+    # An item that is not part of raw_data is kept as its own row
+    cleaned.append({"title": "Only cleaned", "content": "x", "category": "HK_TECH"})
+    return {"meta": {"count": len(cleaned), "stats": {"GoogleRSS (NVDA)": {"count": 30, "status": "OK", "error": None}}},
+            "cleaned_data": cleaned, "raw_data": raw}
+
+def test_archive_roundtrip_all_codecs():
+    report = make_report()
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "report.json")
+        save_custom_json(report, json_path)
+        for codec in available_codecs():
+            path = os.path.join(tmp, f"report_{codec}.zip")
+            assert write_report_archive(report, path, codec=codec) == codec
+            assert load_report(path) == report
+            assert os.path.getsize(path) < os.path.getsize(json_path) / 3
+        assert load_report(json_path) == report
+
+def test_archive_column_and_category_reads():
+    report = make_report()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.zip")
+        write_report_archive(report, path, codec="deflate")
+        with ReportArchive(path) as archive:
+            assert set(archive.categories) == {"US_MARKET_TECH", "HK_TECH"}
+            assert archive.column("title") == [item["title"] for item in report["raw_data"]]
+            assert archive.column("title", cleaned=True) == [item["title"] for item in report["cleaned_data"]]
+            assert archive.column("author", category="HK_TECH") == [
+                item.get("author") for item in report["raw_data"] if item["category"] == "HK_TECH"
+            ]
+            hk = archive.rows(category="HK_TECH", columns=["title", "publish_time"], cleaned=True)
+            assert hk == [
+                {k: item[k] for k in ("title", "publish_time") if k in item}
+                for item in report["cleaned_data"] if item["category"] == "HK_TECH"
+            ]
+
+if __name__ == "__main__":
+    test_archive_roundtrip_all_codecs()
+    test_archive_column_and_category_reads()
+    print("PASS: Report archive")
@@ -0,0 +1,124 @@
+import os
+import sys
+import pytest
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.resilience import CircuitBreaker, CircuitOpenError, backoff_delay, retry_call
+from utils.utils_data import StatsTracker
+
+def test_backoff_is_jittered_and_capped():
+    for attempt in range(1, 10):
+        delay = backoff_delay(attempt, base_delay=1.0, max_delay=4.0)
+        assert 0 <= delay <= min(4.0, 2 ** (attempt - 1))
+
+def test_breaker_trips_then_fails_fast_and_recovers():
+    stats = StatsTracker()
+    breaker = CircuitBreaker("Dead", failure_threshold=3, cooldown=0.05)
+    calls = []
+
+    def dead():
+        calls.append(1)
+        raise ConnectionError("upstream down")
+
+    # First ticker burns attempts until the breaker trips, then stops early
+    with pytest.raises(CircuitOpenError):
+        retry_call(dead, retries=5, base_delay=0, breaker=breaker, stats=stats)
+    assert len(calls) == 3
+
+    # Later tickers fail fast without calling the source
+    with pytest.raises(CircuitOpenError):
+        retry_call(dead, retries=5, base_delay=0, breaker=breaker, stats=stats)
+    assert len(calls) == 3
+
+    # After the cool-down one probe goes through; success closes the breaker
+    import time
+    time.sleep(0.06)
+    assert retry_call(lambda: "ok", breaker=breaker, stats=stats) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    report = stats.get_report()
+    assert report["Breaker Dead: closed->open"]["count"] == 1
+    assert report["Breaker Dead: open->half_open"]["count"] == 1
+    assert report["Breaker Dead: half_open->closed"]["count"] == 1
+
+def test_retry_without_breaker_raises_last_error():
+    attempts = []
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ValueError("transient")
+        return 42
+    assert retry_call(flaky, retries=5, base_delay=0) == 42
+    with pytest.raises(ValueError):
+        retry_call(lambda: (_ for _ in ()).throw(ValueError("x")), retries=2, base_delay=0)
+
+class Delisted(Exception):
+    pass
+
+def test_permanent_errors_skip_retries_and_breaker():
+    breaker = CircuitBreaker("Yahoo", failure_threshold=2, cooldown=60)
+    calls = []
+
+    def delisted():
+        calls.append(1)
+        raise Delisted("possibly delisted; no price data found")
+
+    for _ in range(5): # One bad symbol per group must not trip the shared source
+        with pytest.raises(Delisted):
+            retry_call(delisted, retries=5, base_delay=0, breaker=breaker,
+                       permanent=lambda e: isinstance(e, Delisted))
+    assert len(calls) == 5
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+
+def test_permanent_errors_are_neutral_for_the_breaker(monkeypatch):
+    import utils.resilience as resilience
+    clock = [0.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: clock[0])
+    breaker = CircuitBreaker("Yahoo", failure_threshold=3, cooldown=60)
+    permanent = lambda e: isinstance(e, Delisted)
+
+    def fail(error):
+        def call():
+            raise error
+        with pytest.raises(type(error)):
+            retry_call(call, retries=1, base_delay=0, breaker=breaker, permanent=permanent)
+
+    # A delisted symbol between source failures does not reset the consecutive count
+    fail(ConnectionError("rate limited"))
+    fail(ConnectionError("rate limited"))
+    fail(Delisted("no data"))
+    assert breaker.failures == 2
+    fail(ConnectionError("rate limited"))
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # ...nor closes a half-open breaker; the next call probes again
+    clock[0] = 61.0
+    fail(Delisted("no data"))
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    fail(ConnectionError("rate limited"))
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_backoff_sleep_ends_when_breaker_opens(monkeypatch):
+    import threading
+    import time
+    import utils.resilience as resilience
+    monkeypatch.setattr(resilience, "backoff_delay", lambda *args: 30)
+    breaker = CircuitBreaker("Slow", failure_threshold=2, cooldown=60)
+
+    def down():
+        raise ConnectionError("upstream down")
+
+    # Trip the breaker from another thread while this one sleeps a long backoff
+    threading.Timer(0.1, breaker.record_failure).start()
+    start = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        retry_call(down, retries=3, breaker=breaker)
+    assert time.monotonic() - start < 5
+
+if __name__ == "__main__":
+    test_backoff_is_jittered_and_capped()
+    test_breaker_trips_then_fails_fast_and_recovers()
+    test_retry_without_breaker_raises_last_error()
+    test_permanent_errors_skip_retries_and_breaker()
+    print("PASS: Resilience")
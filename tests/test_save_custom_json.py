@@ -0,0 +1,87 @@
+import json
+import os
+import re
+import sys
+import tempfile
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.utils_data import save_custom_json
+
+def reference_dumps(data):
+    """Previous implementation: full json.dumps + regex collapse of stats blocks."""
+    json_str = json.dumps(data, ensure_ascii=False, indent=4)
+    def collapse_match(match):
+        block = match.group(0)
+        collapsed = re.sub(r'\s*\n\s*', ' ', block)
+        collapsed = re.sub(r'\{ "', '{ "', collapsed)
+        collapsed = re.sub(r', "', ', "', collapsed)
+        collapsed = re.sub(r' \} ', ' }', collapsed)
+        return collapsed
+    pattern = r'\{\s+"count": \d+,\s+"status": "[^"]+",\s+"error": (?:null|"[^"]*")\s+\}'
+    return re.sub(pattern, collapse_match, json_str)
+
+def make_report():
+    tricky = "".join(chr(c) for c in range(0, 0xA0)) + "   中文 🚀 \\ \" '"
+    items = [
+        {
+            "source": "GoogleNews (FullText)",
+            "title": f"Headline {i} — 新闻",
+            "published_date": "2025-01-01T00:00:00",
+            "author": ["A. Writer", "B. Writer"] if i % 2 else [],
+            "content": ("Body text. " * 50) + tricky,
+            "related_ticker": "NVDA",
+            "score": 0.1 * i if i % 4 == 0 else i, # floats take the stdlib path
+            "meta": {} if i % 3 else {"nested": [1, 2, {"x": None, "y": True}]},
+            "big": 2 ** 70 if i == 3 else i,
+        }
+        for i in range(8)
+    ]
+    return {
+        "meta": {
+            "timestamp": "2025-01-01T00:00:00",
+            "count": len(items),
+            "raw_count": 0,
+            "stats": {
+                "GoogleRSS (NVDA)": {"count": 12, "status": "OK", "error": None},
+                "YFinance (AAPL)": {"count": 0, "status": "FAILED", "error": "HTTP 429: Too Many Requests"},
+                "Quoted": {"count": 0, "status": "FAILED", "error": 'bad "quote"'},
+                "Empty status": {"count": 1, "status": "", "error": None},
+                "Bool count": {"count": True, "status": "OK", "error": None},
+                "Reordered": {"status": "OK", "count": 1, "error": None},
+            },
+            "host_limiter": {"hosts": 0, "backed_off": {}},
+        },
+        "cleaned_data": items,
+        "raw_data": [],
+        1: "int key",
+        None: [(), ("tuple", 1)],
+    }
+
+def test_streaming_writer_is_byte_compatible():
+    report = make_report()
+    expected = reference_dumps(report)
+    with tempfile.TemporaryDirectory() as tmp:
+        for use_orjson in (False, True):
+            path = os.path.join(tmp, f"report_{use_orjson}.json")
+            save_custom_json(report, path, use_orjson=use_orjson)
+            with open(path, encoding="utf-8") as f:
+                assert f.read() == expected
+            assert not os.path.exists(path + ".tmp")
+
+def test_failed_write_keeps_previous_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.json")
+        save_custom_json({"ok": 1}, path)
+        try:
+            save_custom_json({"bad": object()}, path)
+        except TypeError:
+            pass
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f) == {"ok": 1}
+        assert os.listdir(tmp) == ["report.json"]
+
+if __name__ == "__main__":
+    test_streaming_writer_is_byte_compatible()
+    test_failed_write_keeps_previous_file()
+    print("PASS: save_custom_json")
@@ -0,0 +1,148 @@
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from config import CONFIG
+from core.message_bus import MessageBus
+from core.scheduler import Scheduler, ConfigReloader, next_dispatch_time
+from core.sinks import EmailSink, FileSink
+from dispatchers.email_dispatcher import EmailDispatcher
+
+def _conf(**overrides):
+    conf = {
+        "DEFAULTS": {"INTERVAL_MINUTES": 60, "JITTER_SECONDS": 0, "PRIORITY": 100},
+        "GROUPS": {"LOW": {"PRIORITY": 50}, "HIGH": {"PRIORITY": 1}, "OFF": {"ENABLED": False}},
+        "MAX_PARALLEL": 1,
+        "RUN_ON_START": True,
+        "DISPATCH": {"TIMES": [], "INTERVAL_MINUTES": 60, "ON_STOP": True},
+    }
+    conf.update(overrides)
+    return conf
+
+def _serve_in_thread(scheduler):
+    thread = threading.Thread(target=scheduler.serve, daemon=True)
+    thread.start()
+    return thread
+
+def test_priorities_cadence_and_dispatch_on_stop(monkeypatch):
+    conf = _conf()
+    conf["GROUPS"]["HIGH"]["INTERVAL_MINUTES"] = 0.002 # ~0.12s
+    monkeypatch.setitem(CONFIG, "SCHEDULER", conf)
+    order, dispatched, idle = [], [], []
+
+    def run_group(key):
+        order.append(key)
+        run = order.count(key)
+        time.sleep(0.02)
+        return {"cleaned_data": [{"title": f"{key} {run}"}]}, {"filename": f"{key}_{run}.json"}
+
+    scheduler = Scheduler(["LOW", "HIGH", "OFF"], run_group, dispatched.append, on_idle=lambda: idle.append(1))
+    thread = _serve_in_thread(scheduler)
+    time.sleep(0.5)
+    scheduler.stop()
+    thread.join(5)
+
+    assert order[:2] == ["HIGH", "LOW"] # One slot: priority decides who goes first
+    assert order.count("HIGH") >= 3 and order.count("LOW") == 1
+    assert "OFF" not in order
+    assert idle
+    # Nothing was due for dispatch within the hour; stop sends every run since, merged per group
+    assert len(dispatched) == 1 and set(dispatched[0]) == {"HIGH", "LOW"}
+    high = dispatched[0]["HIGH"]
+    runs = order.count("HIGH")
+    assert [item["title"] for item in high["data"]["cleaned_data"]] == [f"HIGH {n}" for n in range(runs, 0, -1)]
+    assert high["meta"]["filenames"] == [f"HIGH_{n}.json" for n in range(1, runs + 1)]
+    assert scheduler.status()["jobs"]["HIGH"]["runs"] == order.count("HIGH")
+
+def test_failed_group_is_rescheduled(monkeypatch):
+    monkeypatch.setitem(CONFIG, "SCHEDULER", _conf(DEFAULTS={"INTERVAL_MINUTES": 0.002, "JITTER_SECONDS": 0}))
+    calls = []
+
+    def run_group(key):
+        calls.append(key)
+        raise RuntimeError("boom")
+
+    scheduler = Scheduler(["A"], run_group, lambda results: None)
+    thread = _serve_in_thread(scheduler)
+    time.sleep(0.4)
+    scheduler.stop()
+    thread.join(5)
+    assert len(calls) >= 2 and scheduler.jobs["A"].failures == len(calls)
+
+def test_failed_dispatch_keeps_results(monkeypatch):
+    monkeypatch.setitem(CONFIG, "SCHEDULER", _conf())
+    attempts = []
+
+    def dispatch(results):
+        attempts.append(results)
+        if len(attempts) == 1:
+            raise ConnectionError("smtp down")
+
+    scheduler = Scheduler(["A"], lambda key: None, dispatch)
+    scheduler.pending = {"A": {"data": {"cleaned_data": [{"title": "one"}]}, "meta": {"filename": "A_1.json"}}}
+    scheduler._dispatch()
+    assert "A" in scheduler.pending
+
+    # A run finishing before the retry is merged with the undelivered one
+    with scheduler.lock:
+        scheduler._add_pending("A", {"data": {"cleaned_data": [{"title": "two"}, {"title": "one"}]}, "meta": {"filename": "A_2.json"}})
+    scheduler._dispatch()
+    assert scheduler.pending == {}
+    delivered = attempts[-1]["A"]
+    assert [item["title"] for item in delivered["data"]["cleaned_data"]] == ["two", "one"]
+    assert delivered["meta"]["filenames"] == ["A_1.json", "A_2.json"]
+
+def test_undelivered_email_keeps_results(monkeypatch, tmp_path):
+    monkeypatch.setitem(CONFIG, "SCHEDULER", _conf())
+    # No credentials: the email sink fails on its worker thread, after publish() returned
+    bus = MessageBus(sinks=[EmailSink(EmailDispatcher("smtp.invalid", 465, None, None, None))])
+    state = {"bus": bus}
+    scheduler = Scheduler(["A"], lambda key: None, lambda results: main.publish_results(state["bus"], results, wait=True))
+    scheduler.pending = {"A": {"data": {"cleaned_data": [{"title": "one"}]}, "meta": {"filename": "A_1.json", "group_name": "A"}}}
+
+    scheduler._dispatch()
+    assert "A" in scheduler.pending
+    assert bus.shutdown(timeout=5)["email"]["failed"] == 1
+
+    state["bus"] = MessageBus(sinks=[FileSink(str(tmp_path / "outbox.ndjson"))])
+    scheduler._dispatch()
+    assert scheduler.pending == {}
+    assert state["bus"].shutdown(timeout=5)["file"]["delivered"] == 1
+
+def test_next_dispatch_time():
+    now = datetime(2026, 3, 2, 12, 0).timestamp()
+    assert next_dispatch_time(now, {"TIMES": ["08:00", "18:00"]}) == datetime(2026, 3, 2, 18, 0).timestamp()
+    assert next_dispatch_time(now, {"TIMES": ["08:00"]}) == datetime(2026, 3, 3, 8, 0).timestamp()
+    assert next_dispatch_time(now, {"INTERVAL_MINUTES": 30}) == now + 1800
+
+def test_config_reload_updates_shared_dict(monkeypatch, tmp_path):
+    monkeypatch.setitem(CONFIG, "SCHEDULER", _conf())
+    path = tmp_path / "config.py"
+    path.write_text("from config import CONFIG as BASE\nCONFIG = dict(BASE)\n")
+    seen = []
+    reloader = ConfigReloader(str(path), on_reload=seen.append)
+    assert not reloader.changed()
+
+    path.write_text(
+        "from config import CONFIG as BASE\nCONFIG = dict(BASE)\n"
+        "CONFIG['SCHEDULER'] = dict(BASE['SCHEDULER'], MAX_PARALLEL=7)\n"
+    )
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    assert reloader.changed()
+    assert reloader.reload() == {"SCHEDULER"}
+    assert CONFIG["SCHEDULER"]["MAX_PARALLEL"] == 7 and seen == [{"SCHEDULER"}]
+
+    # A broken edit keeps the running config
+    path.write_text("CONFIG = {")
+    os.utime(path, (time.time() + 10, time.time() + 10))
+    assert reloader.reload() == set()
+    assert CONFIG["SCHEDULER"]["MAX_PARALLEL"] == 7
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
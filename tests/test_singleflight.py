@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+import time
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from utils.singleflight import SingleFlight
+
+def _run_concurrently(n, target):
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def scrape():
+        calls.append(1)
+        time.sleep(0.1) # Followers arrive while the leader works
+        return {"text": "body"}
+
+    results = _run_concurrently(8, lambda: flight.do("https://example.com/a", scrape))
+    assert len(calls) == 1
+    assert sum(1 for _, shared in results if not shared) == 1
+    assert all(result is results[0][0] for result, _ in results)
+    assert flight.report() == {"unique": 1, "shared": 7, "saved_pct": 87.5}
+
+    # Later callers get the stored result without calling again
+    assert flight.do("https://example.com/a", scrape) == (results[0][0], True)
+    assert len(calls) == 1 and flight.seen("https://example.com/a")
+
+def test_error_reaches_every_waiter_and_is_forgotten():
+    flight = SingleFlight()
+
+    def broken():
+        time.sleep(0.1)
+        raise ConnectionError("reset")
+
+    results = _run_concurrently(5, lambda: flight.do("k", broken))
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert not flight.seen("k")
+    # A later caller retries
+    assert flight.do("k", lambda: "ok") == ("ok", False)
+
+def test_reset_forgets_results():
+    flight = SingleFlight()
+    flight.do("k", lambda: 1)
+    flight.reset()
+    assert not flight.seen("k") and flight.report()["unique"] == 0
+    with pytest.raises(ValueError):
+        flight.do("k", lambda: int("x"))
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
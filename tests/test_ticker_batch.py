@@ -0,0 +1,63 @@
+import os
+import sys
+from types import SimpleNamespace
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_sources.OpenBB_NewsFetcher as openbb_module
+from data_sources.OpenBB_NewsFetcher import OpenBBNewsFetcher
+
+class _FakeNews:
+    """Records obb.news.company calls; one article per requested symbol."""
+    def __init__(self):
+        self.calls = []
+
+    def company(self, symbol, provider, start_date, end_date, limit):
+        self.calls.append((symbol, provider))
+        results = [
+            SimpleNamespace(title=f"{s} news via {provider}", url=f"https://example.com/{provider}/{s}",
+                            date=None, symbols=s, excerpt=f"About {s}")
+            for s in symbol.split(",")
+        ]
+        return SimpleNamespace(results=results)
+
+def test_grouped_company_news_fans_out_per_symbol(monkeypatch):
+    fake = _FakeNews()
+    monkeypatch.setattr(openbb_module, "obb", SimpleNamespace(news=fake))
+    monkeypatch.delenv("FMP_API_KEY", raising=False)
+
+    fetcher = OpenBBNewsFetcher()
+    symbols = ["AAPL", "MSFT", "NVDA", "GOOGL", "AMZN"]
+    grouped = fetcher.fetch_company_news_grouped(symbols, batch_size=2)
+
+    # 3 calls (2 + 2 + 1 symbols) instead of 5
+    assert fake.calls == [("AAPL,MSFT", "yfinance"), ("NVDA,GOOGL", "yfinance"), ("AMZN", "yfinance")]
+    assert {s: [n["title"] for n in news] for s, news in grouped.items()} == {
+        s: [f"{s} news via yfinance"] for s in symbols
+    }
+
+def test_untagged_batched_news_is_not_attributed(monkeypatch):
+    class _Untagged(_FakeNews):
+        def company(self, symbol, provider, start_date, end_date, limit):
+            result = super().company(symbol, provider, start_date, end_date, limit)
+            result.results.append(SimpleNamespace(title=f"Market wrap ({symbol})", url=f"https://example.com/wrap/{symbol}",
+                                                  date=None, symbols=None, excerpt="Stocks rose"))
+            return result
+
+    monkeypatch.setattr(openbb_module, "obb", SimpleNamespace(news=_Untagged()))
+    monkeypatch.delenv("FMP_API_KEY", raising=False)
+
+    grouped = OpenBBNewsFetcher().fetch_company_news_grouped(["AAPL", "MSFT", "NVDA"], batch_size=2)
+    assert [n["title"] for n in grouped["AAPL"]] == ["AAPL news via yfinance"]
+    assert [n["title"] for n in grouped["MSFT"]] == ["MSFT news via yfinance"]
+    # A one-symbol batch is the per-ticker call: its untagged news is that ticker's
+    assert [n["title"] for n in grouped["NVDA"]] == ["NVDA news via yfinance", "Market wrap (NVDA)"]
+
+def test_single_ticker_string_is_not_split(monkeypatch):
+    fake = _FakeNews()
+    monkeypatch.setattr(openbb_module, "obb", SimpleNamespace(news=fake))
+    monkeypatch.delenv("FMP_API_KEY", raising=False)
+
+    news = OpenBBNewsFetcher().fetch_company_news("TSLA")
+    assert fake.calls == [("TSLA", "yfinance")]
+    assert len(news) == 1
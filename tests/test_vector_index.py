@@ -0,0 +1,67 @@
+import os
+import sys
+import numpy as np
+import pytest
+# Make sure project root is in path if running directly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CONFIG
+import processors.vector_index as vector_index
+import collectors.base_collector as base_collector
+from collectors.base_collector import BaseCollector
+
+@pytest.fixture
+def cross_run(monkeypatch, tmp_path):
+    monkeypatch.setitem(CONFIG["CLEANING"], "CROSS_RUN", {"ENABLED": True, "RETENTION_DAYS": 7, "BACKEND": "exact"})
+    monkeypatch.setitem(CONFIG["CACHE"], "DIR", str(tmp_path / "cache"))
+    monkeypatch.setitem(CONFIG, "METRICS", {"EXPORT": False})
+    monkeypatch.setattr(vector_index, "_indexes", {})
+    monkeypatch.chdir(tmp_path)
+
+def test_index_is_scoped_per_group(cross_run):
+    first = vector_index.get_vector_index("model", "US_MARKET_TECH")
+    second = vector_index.get_vector_index("model", "GLOBAL_MACRO_RISKS")
+    assert first is not second
+    assert vector_index.get_vector_index("model", "US_MARKET_TECH") is first
+
+    first.add(np.eye(3, dtype=np.float32))
+    assert len(first) == 3 and len(second) == 0
+    assert second.max_similarity(np.eye(3)).max() == 0.0
+
+def test_add_on_a_new_day_expires_old_partitions(tmp_path):
+    index = vector_index.RollingVectorIndex(str(tmp_path), "model", retention_days=2)
+    index.add(np.eye(3, dtype=np.float32), day="2026-03-01")
+    index.add(np.eye(3, dtype=np.float32)[:1], day="2026-03-02")
+    assert len(index) == 4
+
+    # A long-running process never reloads: the day change drops what fell out of retention
+    index.add(np.eye(3, dtype=np.float32)[:2], day="2026-03-04")
+    assert sorted(index.partitions) == ["2026-03-02", "2026-03-04"] and len(index) == 3
+    assert sorted(os.listdir(index.dir)) == ["2026-03-02.npy", "2026-03-04.npy"]
+    assert index.max_similarity(np.eye(3)).tolist() == [1.0, 1.0, 0.0]
+
+def test_vectors_added_only_after_report_saved(cross_run, monkeypatch):
+    index = vector_index.get_vector_index("model", "US_MARKET_TECH")
+    collector = BaseCollector()
+    collector.pending_vectors.append((index, np.eye(2, dtype=np.float32)))
+
+    fail = [True]
+    saved = []
+
+    def save(data, path):
+        if fail[0]:
+            raise OSError("disk full")
+        saved.append(path)
+
+    monkeypatch.setattr(base_collector, "save_custom_json", save)
+    with pytest.raises(OSError):
+        collector.save_report("Report.json", [], {})
+    assert len(index) == 0 # A failed save must not mark the stories as reported
+
+    fail[0] = False
+    collector.save_report("Report.json", [], {})
+    assert saved
+    assert len(index) == 2 and collector.pending_vectors == []
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
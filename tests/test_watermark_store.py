@@ -0,0 +1,156 @@
+import calendar
+import os
+import sys
+import time
+# Make sure project root is in path if running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "benchmarks"))
+
+from config import CONFIG
+from utils.utils_data import StatsRouter, StatsTracker
+from utils.watermark_store import WatermarkStore, filter_since_watermark, to_epoch
+import utils.watermark_store as watermark_store
+
+def test_watermarks_commit_per_collector_and_never_move_back(tmp_path, monkeypatch):
+    monkeypatch.setitem(CONFIG, "INCREMENTAL", {"MODE": "since_last_run"})
+    store = WatermarkStore(str(tmp_path / "wm.sqlite3"), overlap_minutes=10)
+    us_tech, macro = StatsTracker(), StatsTracker()
+    router = StatsRouter()
+
+    with router.bind(us_tech):
+        store.propose(router, "google_rss", "nvidia", "en-US/US", 1000.0)
+        store.propose(router, "google_rss", "nvidia", "en-US/US", 5000.0)
+    store.propose(macro, "google_rss", "inflation", "en-US/US", 7000.0)
+
+    # Nothing is visible before the owning collector saved its report
+    assert store.get("google_rss", "nvidia", "en-US/US") is None
+    assert store.commit(us_tech) == 1
+    assert store.get("google_rss", "nvidia", "en-US/US") == 5000.0
+    assert store.get("google_rss", "inflation", "en-US/US") is None
+    assert store.cutoff("google_rss", "nvidia", "en-US/US") == 5000.0 - 600
+
+    store.propose(us_tech, "google_rss", "nvidia", "en-US/US", 3000.0)
+    store.commit(us_tech)
+    assert store.get("google_rss", "nvidia", "en-US/US") == 5000.0
+
+    monkeypatch.setitem(CONFIG["INCREMENTAL"], "MODE", "full")
+    assert store.cutoff("google_rss", "nvidia", "en-US/US") is None
+    store.close()
+
+def test_shared_keyword_has_one_watermark_per_group(tmp_path, monkeypatch):
+    monkeypatch.setitem(CONFIG, "INCREMENTAL", {"MODE": "since_last_run"})
+    db_path = str(tmp_path / "wm.sqlite3")
+    store = WatermarkStore(db_path, overlap_minutes=0)
+    items = [{"title": "NAND prices", "publish_time": "2025-01-14T08:00:00+00:00"}]
+
+    # US tech saves its report first; the commodities group must still get the story
+    tech, commodities = StatsTracker(), StatsTracker()
+    store.set_group(tech, "US_MARKET_TECH")
+    store.set_group(commodities, "COMMODITIES_EN")
+    assert filter_since_watermark(store, tech, "google_rss", "NAND Flash", "en-US/US", items, lambda item: item["publish_time"]) == items
+    store.commit(tech)
+    assert filter_since_watermark(store, commodities, "google_rss", "NAND Flash", "en-US/US", items, lambda item: item["publish_time"]) == items
+    store.commit(commodities)
+
+    # Next run: each group skips what it reported itself
+    rerun = StatsTracker()
+    store.set_group(rerun, "US_MARKET_TECH")
+    assert filter_since_watermark(store, rerun, "google_rss", "NAND Flash", "en-US/US", items, lambda item: item["publish_time"]) == []
+    assert store.get("google_rss", "NAND Flash", "en-US/US", "COMMODITIES_EN") == to_epoch(items[0]["publish_time"])
+    assert store.get("google_rss", "NAND Flash", "en-US/US") is None
+    store.close()
+
+def test_ungrouped_store_is_upgraded(tmp_path):
+    import sqlite3
+    db_path = str(tmp_path / "wm.sqlite3")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE watermarks (source TEXT, query TEXT, locale TEXT, published REAL, updated_at REAL, PRIMARY KEY (source, query, locale))")
+    conn.execute("INSERT INTO watermarks VALUES ('google_rss', 'H200', 'en-US/US', 1000.0, 1000.0)")
+    conn.commit()
+    conn.close()
+
+    store = WatermarkStore(db_path)
+    assert store.get("google_rss", "H200", "en-US/US") is None
+    stats = StatsTracker()
+    store.set_group(stats, "US_MARKET_TECH")
+    store.propose(stats, "google_rss", "H200", "en-US/US", 2000.0)
+    assert store.commit(stats) == 1
+    assert store.get("google_rss", "H200", "en-US/US", "US_MARKET_TECH") == 2000.0
+    store.close()
+
+def test_filter_keeps_newer_and_undated_items(tmp_path, monkeypatch):
+    monkeypatch.setitem(CONFIG, "INCREMENTAL", {"MODE": "since_last_run"})
+    store = WatermarkStore(str(tmp_path / "wm.sqlite3"), overlap_minutes=0)
+    stats = StatsTracker()
+    store.propose(stats, "yfinance", "NVDA", "", to_epoch("2025-01-14T08:00:00+00:00"))
+    store.commit(stats)
+
+    items = [
+        {"title": "old", "publish_time": "2025-01-14T07:59:00+00:00"},
+        {"title": "same", "publish_time": "2025-01-14T08:00:00+00:00"},
+        {"title": "new", "publish_time": "2025-01-14T09:30:00Z"},
+        {"title": "undated", "publish_time": None},
+    ]
+    fresh = filter_since_watermark(store, stats, "yfinance", "NVDA", "", items, lambda item: item["publish_time"])
+    assert [item["title"] for item in fresh] == ["new", "undated"]
+    assert stats.stats["Watermark (Skipped)"]["count"] == 2
+    store.commit(stats)
+    assert store.get("yfinance", "NVDA", "") == to_epoch("2025-01-14T09:30:00Z")
+    assert filter_since_watermark(None, stats, "yfinance", "NVDA", "", items, lambda item: item["publish_time"]) is items
+    assert to_epoch(time.gmtime(1736841600)) == 1736841600.0
+    store.close()
+
+def test_google_rss_skips_entries_before_watermark(tmp_path, monkeypatch):
+    from local_news_server import LocalNewsServer
+    from data_sources.GoogleNews_RSS_Fetcher import GoogleNewsRSSFetcher
+
+    store = WatermarkStore(str(tmp_path / "wm.sqlite3"), overlap_minutes=0)
+    monkeypatch.setattr(watermark_store, "_store", store)
+    monkeypatch.setitem(CONFIG, "INCREMENTAL", {"ENABLED": True, "MODE": "since_last_run"})
+    monkeypatch.setitem(CONFIG["CACHE"]["FEEDS"], "ENABLED", False)
+    monkeypatch.setitem(CONFIG["CACHE"]["ARTICLES"], "ENABLED", False)
+
+    seed = StatsTracker()
+    store.propose(seed, "google_rss", "watermark test", "en-US/US", time.time() - 35 * 60)
+    store.commit(seed)
+
+    with LocalNewsServer(items_per_feed=12, hosts=3) as server:
+        monkeypatch.setitem(CONFIG, "ENDPOINTS", server.endpoints())
+        stats = StatsTracker()
+        items = GoogleNewsRSSFetcher(stats).fetch("watermark test")
+        # Fixture items are 10, 20, 30, ... minutes old: only three are newer than the watermark
+        assert len(items) == 3
+        assert stats.stats["Watermark (Skipped)"]["count"] == 9
+        assert server.stats()["article 200"] == 3
+
+        monkeypatch.setitem(CONFIG["INCREMENTAL"], "MODE", "full")
+        assert len(GoogleNewsRSSFetcher(StatsTracker()).fetch("watermark test")) == 12
+    store.close()
+
+def test_failed_run_drops_its_proposals(tmp_path, monkeypatch):
+    import main
+
+    store = WatermarkStore(str(tmp_path / "wm.sqlite3"), overlap_minutes=0)
+    monkeypatch.setattr(watermark_store, "_store", store)
+    monkeypatch.setitem(CONFIG, "INCREMENTAL", {"ENABLED": True, "MODE": "since_last_run"})
+
+    class CrashingCollector:
+        def __init__(self, shared=None):
+            self.stats = StatsTracker()
+
+        def run(self, start_date=None, end_date=None):
+            store.set_group(self.stats, "US_MARKET_TECH")
+            store.propose(self.stats, "google_rss", "nvidia", "en-US/US", 5000.0)
+            raise RuntimeError("cleaner crashed before save_report")
+
+    monkeypatch.setitem(main.COLLECTOR_MAP, "CRASHING", {"class": CrashingCollector, "name": "Crashing"})
+    assert main.run_collector("CRASHING") == (None, None)
+    # Nothing committed, and nothing left behind for a long-running process to accumulate
+    assert store.get("google_rss", "nvidia", "en-US/US", "US_MARKET_TECH") is None
+    assert store.pending == {} and store.groups == {}
+    store.close()
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+class ArticleCache:
+    """
+    Disk-backed (SQLite) cache of extracted articles, keyed by URL.
+    Stores the newspaper3k output (title/text/authors/images) so a story that stays
+    in the Google RSS window for days is only downloaded and parsed once.
+    - TTL: entries older than ttl_hours are treated as misses and purged.
+    - LRU: once max_entries is exceeded, least recently read entries are evicted.
+    """
+    def __init__(self, db_path: str, ttl_hours: float = 192, max_entries: int = 50000):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self._writes_since_evict = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    url TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_accessed ON articles(accessed_at)")
+            self.conn.commit()
+        self.evict()
+
+    def get(self, url: str):
+        """Return the cached article dict, or None on miss/expiry."""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT payload, created_at FROM articles WHERE url = ?", (url,)).fetchone()
+            if not row:
+                return None
+            payload, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self.conn.execute("DELETE FROM articles WHERE url = ?", (url,))
+                self.conn.commit()
+                return None
+            self.conn.execute("UPDATE articles SET accessed_at = ? WHERE url = ?", (now, url))
+            self.conn.commit()
+        return json.loads(payload)
+
+    def contains(self, url: str) -> bool:
+        """Cheap existence check (no LRU touch)."""
+        with self.lock:
+            row = self.conn.execute("SELECT created_at FROM articles WHERE url = ?", (url,)).fetchone()
+        return bool(row) and (time.time() - row[0]) <= self.ttl_seconds
+
+    def put(self, url: str, article: dict):
+        now = time.time()
+        payload = json.dumps(article, ensure_ascii=False)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO articles (url, payload, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (url, payload, now, now)
+            )
+            self.conn.commit()
+            self._writes_since_evict += 1
+            need_evict = self._writes_since_evict >= 500
+        if need_evict:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then trim to max_entries by least recent access."""
+        cutoff = time.time() - self.ttl_seconds
+        with self.lock:
+            self._writes_since_evict = 0
+            expired = self.conn.execute("DELETE FROM articles WHERE created_at < ?", (cutoff,)).rowcount
+            total = self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            overflow = total - self.max_entries
+            if overflow > 0:
+                self.conn.execute(
+                    "DELETE FROM articles WHERE url IN (SELECT url FROM articles ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,)
+                )
+            self.conn.commit()
+        if expired or overflow > 0:
+            logger.info(f"ArticleCache evicted {expired} expired, {max(overflow, 0)} LRU entries.")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_article_cache():
+    """Process-wide ArticleCache from CONFIG["CACHE"], or None if disabled/unavailable."""
+    global _cache
+    conf = CONFIG.get("CACHE", {})
+    article_conf = conf.get("ARTICLES", {})
+    if not article_conf.get("ENABLED", False):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = ArticleCache(
+                    os.path.join(conf.get("DIR", "cache"), "articles.sqlite3"),
+                    ttl_hours=article_conf.get("TTL_HOURS", 192),
+                    max_entries=article_conf.get("MAX_ENTRIES", 50000)
+                )
+            except Exception as e:
+                logger.error(f"Failed to open article cache: {e}. Caching disabled.")
+                _cache = False # Don't retry on every call
+        return _cache or None
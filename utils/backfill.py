@@ -0,0 +1,190 @@
+import concurrent.futures
+import os
+import threading
+from datetime import datetime, timedelta
+from config import CONFIG
+from utils.journal import Journal
+
+DATE_FMT = "%Y-%m-%d"
+
+def date_windows(start_date: str, end_date: str, days: int) -> list[tuple[str, str]]:
+    """Inclusive [start, end] day ranges of at most `days` days covering start_date..end_date."""
+    start = datetime.strptime(start_date, DATE_FMT)
+    end = datetime.strptime(end_date, DATE_FMT)
+    days = max(1, int(days))
+    windows = []
+    while start <= end:
+        last = min(end, start + timedelta(days=days - 1))
+        windows.append((start.strftime(DATE_FMT), last.strftime(DATE_FMT)))
+        start = last + timedelta(days=1)
+    return windows
+
+def split_window(window_start: str, window_end: str):
+    """Two halves of a multi-day window, or None for a single day."""
+    start = datetime.strptime(window_start, DATE_FMT)
+    end = datetime.strptime(window_end, DATE_FMT)
+    span = (end - start).days
+    if span < 1:
+        return None
+    middle = start + timedelta(days=(span - 1) // 2)
+    return [
+        (window_start, middle.strftime(DATE_FMT)),
+        ((middle + timedelta(days=1)).strftime(DATE_FMT), window_end)
+    ]
+
+_window_budget = None
+_window_budget_lock = threading.Lock()
+
+def get_window_budget():
+    """Process-wide semaphore: at most BACKFILL.MAX_PARALLEL_WINDOWS windows in flight, all collectors together."""
+    global _window_budget
+    with _window_budget_lock:
+        if _window_budget is None:
+            _window_budget = threading.BoundedSemaphore(max(1, CONFIG.get("BACKFILL", {}).get("MAX_PARALLEL_WINDOWS", 8)))
+        return _window_budget
+
+class Backfill:
+    """
+    Windowed historical fetch for one collector group.
+    Google RSS keywords are fetched per (keyword, window); a window whose feed holds
+    SPLIT_AT entries or more (Google caps feeds at ~100) is split in halves, down to
+    single days. Everything else in fetch_item (tickers, Guardian) runs once per item.
+    Each finished unit is appended to a checkpoint journal, so a rerun with the same
+    group and range only fetches what is missing. Splits are journaled too: on replay a
+    split window stands for its halves. Failed windows are not recorded.
+    """
+    def __init__(self, collector, group_key: str, start_date: str, end_date: str):
+        self.collector = collector
+        self.group_key = group_key
+        self.start_date = start_date
+        self.end_date = end_date
+        conf = CONFIG.get("BACKFILL", {})
+        self.window_days = conf.get("WINDOW_DAYS", 1)
+        self.split_at = conf.get("SPLIT_AT", 90)
+        self.max_parallel = max(1, conf.get("MAX_PARALLEL_WINDOWS", 8))
+        self.journal = Journal(os.path.join(
+            conf.get("CHECKPOINT_DIR", os.path.join("cache", "backfill")),
+            f"{group_key}_{start_date}_{end_date}.ndjson"
+        ))
+        self.stats = collector.stats
+        self.logger = collector.logger
+
+    def run(self, items: list) -> list:
+        done = {}
+        splits = set()
+        for record in self.journal.replay():
+            if record.get("split"):
+                splits.add(tuple(record["key"]))
+            else:
+                done[tuple(record["key"])] = record.get("results", [])
+
+        units = []
+        for item in items:
+            val = item.get("value")
+            units.append((val, "all", item))
+            if self._uses_google(item):
+                units.extend((val, ws, we, item) for ws, we in date_windows(self.start_date, self.end_date, self.window_days))
+
+        results = []
+        pending = []
+        resumed = 0
+        stack = units[::-1]
+        while stack:
+            unit = stack.pop()
+            key = unit[:-1]
+            if key in done:
+                results.extend(done[key])
+                resumed += 1
+            elif key in splits:
+                # Saturated last time: its halves are checkpointed (or still missing) on their own
+                val, ws, we, item = unit
+                stack.extend((val, half_start, half_end, item) for half_start, half_end in reversed(split_window(ws, we)))
+            else:
+                pending.append(unit)
+        if resumed:
+            self.stats.update("Backfill (Resumed)", resumed)
+        self.logger.info(f"🗓️ Backfill {self.group_key} {self.start_date}..{self.end_date}: {len(pending)} units to fetch, {resumed} from checkpoint.")
+
+        # Batched tickers only for the items whose non-RSS part is still missing
+        ticker_items = [unit[-1] for unit in pending if unit[1] == "all"]
+        prefetched = self.collector._prefetch_tickers(ticker_items) if ticker_items else {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="backfill") as executor:
+            futures = {executor.submit(self._run_unit, unit, prefetched): unit for unit in pending}
+            while futures:
+                finished, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    unit = futures.pop(future)
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Backfill {unit[:-1]} failed: {e}")
+                        self.stats.update("Backfill (Failed)", 1, e)
+                        continue
+                    if data is None:
+                        # Saturated feed: fetch both halves instead
+                        self.stats.update("Backfill (Split)", 1)
+                        val, ws, we, item = unit
+                        self._checkpoint({"key": [val, ws, we], "split": True})
+                        for half_start, half_end in split_window(ws, we):
+                            half = (val, half_start, half_end, item)
+                            futures[executor.submit(self._run_unit, half, prefetched)] = half
+                        continue
+                    self._checkpoint({"key": list(unit[:-1]), "results": data})
+                    if len(unit) == 4:
+                        self.stats.update("Backfill (Windows)", 1)
+                    results.extend(data)
+        if self.journal is not None:
+            self.journal.close()
+        return _dedup_by_link(results)
+
+    def _checkpoint(self, record):
+        """Journal a finished or split window; a failed write drops the checkpoint, not the backfill."""
+        if self.journal is None:
+            return
+        try:
+            self.journal.append(record)
+        except OSError as e:
+            self.logger.warning(f"Backfill checkpoint write failed ({e}). Continuing without checkpoint.")
+            self.journal = None
+
+    def _uses_google(self, item) -> bool:
+        return bool(CONFIG.get("ENABLE_GOOGLE_RSS")) and (item.get("type", "keyword") == "keyword" or "desc" in item)
+
+    def _run_unit(self, unit, prefetched):
+        with get_window_budget():
+            if self.collector.shared:
+                with self.collector.shared.stats.bind(self.stats):
+                    return self._fetch_unit(unit, prefetched)
+            return self._fetch_unit(unit, prefetched)
+
+    def _fetch_unit(self, unit, prefetched):
+        """Results of one unit, or None if the window must be split."""
+        if unit[1] == "all":
+            val, _, item = unit
+            return self.collector.fetch_item(item, self.group_key, self.start_date, self.end_date,
+                                             prefetched, include_google=False)
+
+        val, window_start, window_end, item = unit
+        split_at = self.split_at if split_window(window_start, window_end) else None
+        news, _ = self.collector.google_fetcher.fetch_window(
+            query=val, lang="en-US", geo="US", limit=1000,
+            start_date=window_start, end_date=window_end, split_at=split_at
+        )
+        if news is None:
+            return None
+        self.collector._tag(news, self.group_key)
+        return news
+
+def _dedup_by_link(results: list) -> list:
+    """One copy per link (the same story is often found by several keywords of the group)."""
+    seen = set()
+    unique = []
+    for news in results:
+        link = news.get("link")
+        if link:
+            if link in seen:
+                continue
+            seen.add(link)
+        unique.append(news)
+    return unique
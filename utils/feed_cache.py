@@ -0,0 +1,98 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+class FeedCache:
+    """
+    Disk-backed (SQLite) store of feed responses for conditional GETs.
+    Per query URL it keeps the validators (ETag / Last-Modified) and the parsed
+    entries, so a 304 Not Modified can be answered from the previous run.
+    URLs are stored hashed: Guardian URLs carry the API key.
+    """
+    def __init__(self, db_path: str, max_age_days: float = 14):
+        self.max_age_seconds = max_age_days * 86400
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS feeds (
+                    key TEXT PRIMARY KEY,
+                    etag TEXT,
+                    modified TEXT,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute("DELETE FROM feeds WHERE fetched_at < ?", (time.time() - self.max_age_seconds,))
+            self.conn.commit()
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str):
+        """Returns { etag, modified, payload } or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT etag, modified, payload FROM feeds WHERE key = ?", (self.key(url),)).fetchone()
+        if not row:
+            return None
+        return {"etag": row[0], "modified": row[1], "payload": json.loads(row[2])}
+
+    @staticmethod
+    def conditional_headers(cached) -> dict:
+        """If-None-Match / If-Modified-Since headers for a get() result (empty if None)."""
+        headers = {}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["modified"]:
+            headers["If-Modified-Since"] = cached["modified"]
+        return headers
+
+    def put(self, url: str, payload, etag: str = None, modified: str = None):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO feeds (key, etag, modified, payload, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (self.key(url), etag, modified, json.dumps(payload, ensure_ascii=False), time.time())
+            )
+            self.conn.commit()
+
+    def touch(self, url: str):
+        """Mark a 304-confirmed entry as fresh."""
+        with self.lock:
+            self.conn.execute("UPDATE feeds SET fetched_at = ? WHERE key = ?", (time.time(), self.key(url)))
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_feed_cache():
+    """Process-wide FeedCache from CONFIG["CACHE"], or None if disabled/unavailable."""
+    global _cache
+    conf = CONFIG.get("CACHE", {})
+    feed_conf = conf.get("FEEDS", {})
+    if not feed_conf.get("ENABLED", False):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = FeedCache(
+                    os.path.join(conf.get("DIR", "cache"), "feeds.sqlite3"),
+                    max_age_days=feed_conf.get("MAX_AGE_DAYS", 14)
+                )
+            except Exception as e:
+                logger.error(f"Failed to open feed cache: {e}. Conditional requests disabled.")
+                _cache = False # Don't retry on every call
+        return _cache or None
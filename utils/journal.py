@@ -0,0 +1,67 @@
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+class Journal:
+    """
+    Append-only NDJSON log for crash-safe progress (backfill windows, collected items).
+    Every append() is one line, flushed and fsynced before returning, so a record
+    is either complete on disk or absent; replay() skips a torn last line.
+    """
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self._file = None
+
+    def replay(self) -> list:
+        """All complete records, in append order ([] if the journal does not exist)."""
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, "rb") as f:
+            for n, line in enumerate(f, 1):
+                if not line.endswith(b"\n"):
+                    logger.warning(f"Journal {self.path}: ignoring torn record at line {n}.")
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"Journal {self.path}: ignoring corrupt record at line {n}.")
+        return records
+
+    def append(self, record):
+        line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self.lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = open(self.path, "ab")
+                # A torn tail from a crash would glue onto the next record
+                if self._file.tell() and not _ends_with_newline(self.path):
+                    self._file.write(b"\n")
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """Close and delete (the work it protected is safely saved elsewhere)."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+def _ends_with_newline(path) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
@@ -0,0 +1,222 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+PREFIX = "news_engine_"
+# Seconds; covers cache hits (ms) up to whole collector stages (minutes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 1800)
+
+HELP = {
+    "source_latency_seconds": "Latency of one request/call per data source.",
+    "stage_seconds": "Time spent per pipeline stage (scrape is summed over concurrent queries).",
+    "bytes_downloaded_total": "Response bytes downloaded per data source.",
+    "retries_total": "Retried calls per data source.",
+    "timeouts_total": "Timed out requests per data source.",
+    "sink_messages_total": "MessageBus messages per sink and outcome.",
+    "source_items": "Items returned per source (StatsTracker.update).",
+    "source_failed": "1 if the source reported an error.",
+}
+
+class _Shard:
+    """Metrics of one thread. Its lock is only contended while a snapshot is taken."""
+    __slots__ = ("lock", "counters", "histograms", "sources")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}   # (name, labels) -> value
+        self.histograms = {} # (name, labels) -> [bucket counts..., +Inf count, sum, max]
+        self.sources = {}    # source -> [count, error]
+
+class MetricsRegistry:
+    """
+    Counters and latency histograms sharded per thread: worker threads only ever
+    touch their own shard, so hot-path updates never wait on each other.
+    snapshot() merges the shards (labels are keyword arguments, values str()-ed).
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._source_order = {} # First-seen order of StatsTracker sources
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def incr(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        shard = self._shard()
+        with shard.lock:
+            shard.counters[key] = shard.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        shard = self._shard()
+        with shard.lock:
+            hist = shard.histograms.get(key)
+            if hist is None:
+                hist = shard.histograms[key] = [0] * (len(self.buckets) + 1) + [0.0, 0.0]
+            hist[index] += 1
+            hist[-2] += value
+            hist[-1] = max(hist[-1], value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def update_source(self, source, count, error=None):
+        if source not in self._source_order:
+            with self._shards_lock:
+                self._source_order.setdefault(source, len(self._source_order))
+        shard = self._shard()
+        with shard.lock:
+            entry = shard.sources.get(source)
+            if entry is None:
+                entry = shard.sources[source] = [0, None]
+            entry[0] += count
+            if error:
+                entry[1] = str(error)
+
+    # ------------------------------------------------------------------
+    # Merged views
+    # ------------------------------------------------------------------
+    def _merged(self):
+        counters, histograms, sources = {}, {}, {}
+        with self._shards_lock:
+            shards = list(self._shards)
+            order = dict(self._source_order)
+        for shard in shards:
+            with shard.lock:
+                for key, value in shard.counters.items():
+                    counters[key] = counters.get(key, 0) + value
+                for key, hist in shard.histograms.items():
+                    merged = histograms.get(key)
+                    if merged is None:
+                        histograms[key] = list(hist)
+                    else:
+                        for i in range(len(hist) - 1):
+                            merged[i] += hist[i]
+                        merged[-1] = max(merged[-1], hist[-1])
+                for source, (count, error) in shard.sources.items():
+                    entry = sources.setdefault(source, [0, None])
+                    entry[0] += count
+                    entry[1] = error or entry[1]
+        sources = dict(sorted(sources.items(), key=lambda kv: order.get(kv[0], len(order))))
+        return counters, histograms, sources
+
+    def sources(self) -> dict:
+        """Legacy StatsTracker view: { source: { count, status, error } }."""
+        return {
+            source: {"count": count, "status": "FAILED" if error else "OK", "error": error}
+            for source, (count, error) in self._merged()[2].items()
+        }
+
+    def _quantile(self, hist, q):
+        """Estimate from bucket counts (linear within the bucket, capped at the observed max)."""
+        total = sum(hist[:-2])
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for i, n in enumerate(hist[:-2]):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else hist[-1]
+                return min(hist[-1], lower + (upper - lower) * (rank - seen) / n)
+            seen += n
+        return hist[-1]
+
+    def snapshot(self) -> dict:
+        """JSON-friendly: { sources, counters: {name: [...]}, histograms: {name: [...]} }."""
+        counters, histograms, _ = self._merged()
+        out = {"sources": self.sources(), "counters": {}, "histograms": {}}
+        for (name, labels), value in sorted(counters.items()):
+            out["counters"].setdefault(name, []).append({"labels": dict(labels), "value": value})
+        for (name, labels), hist in sorted(histograms.items()):
+            count = sum(hist[:-2])
+            out["histograms"].setdefault(name, []).append({
+                "labels": dict(labels),
+                "count": count,
+                "sum": round(hist[-2], 6),
+                "max": round(hist[-1], 6),
+                "p50": _round(self._quantile(hist, 0.5)),
+                "p99": _round(self._quantile(hist, 0.99)),
+                "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], hist[:-2]))
+            })
+        return out
+
+def _round(value):
+    return None if value is None else round(value, 6)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+def to_prometheus(snapshot: dict, const_labels: dict = None) -> str:
+    """Prometheus text exposition format (node_exporter textfile collector)."""
+    const_labels = const_labels or {}
+    lines = []
+
+    def header(name, kind):
+        lines.append(f"# HELP {PREFIX}{name} {HELP.get(name, name)}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+    if snapshot["sources"]:
+        header("source_items", "gauge")
+        for source, entry in snapshot["sources"].items():
+            lines.append(f"{PREFIX}source_items{_labels({**const_labels, 'source': source})} {entry['count']}")
+        header("source_failed", "gauge")
+        for source, entry in snapshot["sources"].items():
+            lines.append(f"{PREFIX}source_failed{_labels({**const_labels, 'source': source})} {int(entry['status'] == 'FAILED')}")
+
+    for name, series in snapshot["counters"].items():
+        header(name, "counter")
+        for s in series:
+            lines.append(f"{PREFIX}{name}{_labels({**const_labels, **s['labels']})} {s['value']}")
+
+    for name, series in snapshot["histograms"].items():
+        header(name, "histogram")
+        for s in series:
+            labels = {**const_labels, **s["labels"]}
+            cumulative = 0
+            for le, n in s["buckets"].items():
+                cumulative += n
+                lines.append(f"{PREFIX}{name}_bucket{_labels({**labels, 'le': le})} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {s['sum']}")
+            lines.append(f"{PREFIX}{name}_count{_labels(labels)} {s['count']}")
+    return "\n".join(lines) + "\n"
+
+def write_metrics(snapshot: dict, base_path: str, const_labels: dict = None) -> tuple[str, str]:
+    """
+    Write <base_path>.metrics.json and <base_path>.prom (atomically, for the textfile collector).
+    Returns both paths.
+    """
+    json_path, prom_path = f"{base_path}.metrics.json", f"{base_path}.prom"
+    for path, text in ((json_path, json.dumps(snapshot, ensure_ascii=False, indent=2)),
+                       (prom_path, to_prometheus(snapshot, const_labels))):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    return json_path, prom_path
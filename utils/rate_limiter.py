@@ -0,0 +1,171 @@
+import logging
+import threading
+import time
+from config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+class _HostState:
+    __slots__ = ("limit", "rate", "tokens", "updated", "inflight", "requests", "throttled", "errors", "latency")
+
+    def __init__(self, limit, rate, burst):
+        self.limit = float(limit)   # AIMD concurrency limit (fractional, floored on use)
+        self.rate = float(rate)     # Token bucket refill, requests/second
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.inflight = 0
+        self.requests = 0
+        self.throttled = 0          # 403/429/503 answers
+        self.errors = 0             # Timeouts / connection errors
+        self.latency = None         # EWMA, seconds
+
+class AdaptiveHostLimiter:
+    """
+    Per-host admission control for article scraping: a token bucket (request rate)
+    combined with an AIMD concurrency limit, both driven by observed responses.
+    - Fast healthy answer: additive increase (limit += 1/limit, i.e. ~+1 per `limit`
+      requests; rate += rate_step).
+    - Slow answer (> latency_target): limit -= 1.
+    - 403/429/503 or network error: multiplicative decrease of limit and rate, bucket emptied.
+    Thread-safe; the async engine polls try_acquire(), worker threads block in acquire().
+    """
+    THROTTLE_STATUSES = (403, 429, 503)
+    POLL_INTERVAL = 0.05 # Wait hint while a host is at its concurrency limit
+
+    def __init__(self, initial_limit: int = 4, min_limit: int = 1, max_limit: int = 32,
+                 rate: float = 2.0, min_rate: float = 0.2, max_rate: float = 20.0, burst: int = 4,
+                 rate_step: float = 0.2, backoff: float = 0.5, latency_target: float = 5.0, max_wait: float = 30):
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.initial_rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.rate_step = rate_step
+        self.backoff = backoff
+        self.latency_target = latency_target
+        self.max_wait = max_wait
+        self.cond = threading.Condition()
+        self.hosts = {}
+
+    def _state(self, host) -> _HostState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = _HostState(self.initial_limit, self.initial_rate, self.burst)
+        return state
+
+    def _try_acquire_locked(self, host) -> float:
+        state = self._state(host)
+        now = time.monotonic()
+        state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+        state.updated = now
+        if state.inflight >= int(state.limit):
+            return self.POLL_INTERVAL
+        if state.tokens < 1:
+            return (1 - state.tokens) / state.rate
+        state.tokens -= 1
+        state.inflight += 1
+        state.requests += 1
+        return 0.0
+
+    def try_acquire(self, host) -> float:
+        """Take a slot for host. Returns 0.0 on success, else seconds to wait before retrying."""
+        with self.cond:
+            return self._try_acquire_locked(host)
+
+    def acquire(self, host, max_wait: float = None) -> bool:
+        """Block until host admits a request. False if max_wait (seconds) ran out first."""
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        with self.cond:
+            while True:
+                wait = self._try_acquire_locked(host)
+                if not wait:
+                    return True
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self.cond.wait(wait)
+
+    def release(self, host, status: int = None, latency: float = None, answered_by: str = None):
+        """
+        Return the slot and adapt the host's limits.
+        status None means the request failed without an HTTP answer.
+        answered_by: host that actually answered (after a redirect), if not host itself;
+        it takes the adaptation, host only gets its slot back.
+        """
+        with self.cond:
+            slot = self._state(host)
+            slot.inflight = max(0, slot.inflight - 1)
+            state = self._state(answered_by or host)
+            if latency is not None:
+                state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+
+            if status is None or status in self.THROTTLE_STATUSES:
+                if status is None:
+                    state.errors += 1
+                else:
+                    state.throttled += 1
+                state.limit = max(self.min_limit, state.limit * self.backoff)
+                state.rate = max(self.min_rate, state.rate * self.backoff)
+                state.tokens = 0.0
+            elif latency is not None and latency > self.latency_target:
+                state.limit = max(self.min_limit, state.limit - 1)
+            else:
+                state.limit = min(self.max_limit, state.limit + 1 / state.limit)
+                state.rate = min(self.max_rate, state.rate + self.rate_step)
+            self.cond.notify_all()
+
+    def snapshot(self) -> dict:
+        """{ host: { limit, rate, inflight, requests, throttled, errors, latency_ms } }, busiest hosts first."""
+        with self.cond:
+            items = sorted(self.hosts.items(), key=lambda kv: kv[1].requests, reverse=True)
+            return {
+                host: {
+                    "limit": int(state.limit),
+                    "rate": round(state.rate, 2),
+                    "inflight": state.inflight,
+                    "requests": state.requests,
+                    "throttled": state.throttled,
+                    "errors": state.errors,
+                    "latency_ms": int(state.latency * 1000) if state.latency is not None else None
+                }
+                for host, state in items
+            }
+
+    def summary(self) -> dict:
+        """Compact report: totals plus the full state of hosts that throttled or failed."""
+        hosts = self.snapshot()
+        return {
+            "hosts": len(hosts),
+            "requests": sum(h["requests"] for h in hosts.values()),
+            "throttled": sum(h["throttled"] for h in hosts.values()),
+            "errors": sum(h["errors"] for h in hosts.values()),
+            "backed_off": {host: h for host, h in hosts.items() if h["throttled"] or h["errors"]}
+        }
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_host_limiter():
+    """Process-wide AdaptiveHostLimiter from CONFIG["SCRAPING"]["HOST_LIMITER"], or None if disabled."""
+    global _limiter
+    conf = CONFIG.get("SCRAPING", {}).get("HOST_LIMITER", {})
+    if not conf.get("ENABLED", False):
+        return None
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveHostLimiter(
+                initial_limit=conf.get("INITIAL_LIMIT", 4),
+                min_limit=conf.get("MIN_LIMIT", 1),
+                max_limit=conf.get("MAX_LIMIT", 32),
+                rate=conf.get("RATE", 2.0),
+                min_rate=conf.get("MIN_RATE", 0.2),
+                max_rate=conf.get("MAX_RATE", 20.0),
+                burst=conf.get("BURST", 4),
+                latency_target=conf.get("LATENCY_TARGET", 5.0),
+                max_wait=conf.get("MAX_WAIT", 30)
+            )
+        return _limiter
@@ -0,0 +1,222 @@
+import io
+import json
+import logging
+import zipfile
+
+try:
+    import zstandard
+except ImportError:
+    # Optional: "zstd" codec falls back to zip deflate without it
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:
+    # Optional: "parquet" codec falls back to zip deflate without it
+    pyarrow = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = "news_engine.report_archive"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+UNCATEGORIZED = "_uncategorized"
+
+# NDJSON column files: one JSON value per row, an empty line marks a missing key
+_MISSING = ""
+
+def available_codecs() -> list[str]:
+    codecs = ["deflate"]
+    if zstandard is not None:
+        codecs.append("zstd")
+    if pq is not None:
+        codecs.append("parquet")
+    return codecs
+
+def _resolve_codec(codec: str) -> str:
+    if codec == "auto":
+        return "zstd" if zstandard is not None else "deflate"
+    if codec not in available_codecs():
+        logger.warning(f"Report codec '{codec}' unavailable (missing optional package). Using deflate.")
+        return "deflate"
+    return codec
+
+def write_report_archive(report: dict, path: str, codec: str = "auto") -> str:
+    """
+    Write a report ({ meta, cleaned_data, raw_data }) as a columnar zip archive:
+    - rows are split by category, each category stores one member per column
+      (NDJSON, zip-deflated or zstd) or one Parquet member (JSON-encoded string columns);
+    - cleaned_data is stored as row references into raw_data, not as copies.
+    Returns the codec actually used.
+    """
+    codec = _resolve_codec(codec)
+    raw_data = report.get("raw_data") or []
+    cleaned_data = report.get("cleaned_data") or []
+
+    # cleaned_data items are the raw_data dicts themselves (DataCleaner keeps references);
+    # anything not found there is stored as an extra row after the raw rows.
+    rows = list(raw_data)
+    row_of = {id(item): i for i, item in enumerate(rows)}
+    cleaned_rows = []
+    for item in cleaned_data:
+        if id(item) not in row_of:
+            row_of[id(item)] = len(rows)
+            rows.append(item)
+        cleaned_rows.append(row_of[id(item)])
+
+    columns = list(dict.fromkeys(key for item in rows for key in item))
+    by_category = {}
+    for i, item in enumerate(rows):
+        by_category.setdefault(str(item.get("category") or UNCATEGORIZED), []).append(i)
+
+    manifest = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "codec": codec,
+        "meta": report.get("meta", {}),
+        "columns": columns,
+        "raw_count": len(raw_data),
+        "cleaned_rows": cleaned_rows,
+        "categories": {}
+    }
+    with zipfile.ZipFile(path, "w") as zf:
+        for n, (category, row_ids) in enumerate(by_category.items()):
+            prefix = f"rows/{n}"
+            manifest["categories"][category] = {"prefix": prefix, "rows": row_ids}
+            items = [rows[i] for i in row_ids]
+            if codec == "parquet":
+                table = pyarrow.table({col: [_encode_cell(item, col) for item in items] for col in columns})
+                buffer = io.BytesIO()
+                pq.write_table(table, buffer, compression="zstd")
+                # Stored: Parquet is compressed already and needs a seekable member for column reads
+                zf.writestr(f"{prefix}/table.parquet", buffer.getvalue(), compress_type=zipfile.ZIP_STORED)
+                continue
+            for c, col in enumerate(columns):
+                data = "\n".join(_encode_cell(item, col) for item in items).encode("utf-8")
+                if codec == "zstd":
+                    zf.writestr(f"{prefix}/{c}.ndjson.zst", zstandard.ZstdCompressor(level=10).compress(data), compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.writestr(f"{prefix}/{c}.ndjson", data, compress_type=zipfile.ZIP_DEFLATED)
+        zf.writestr(MANIFEST, json.dumps(manifest, ensure_ascii=False), compress_type=zipfile.ZIP_DEFLATED)
+    return codec
+
+def _encode_cell(item, column) -> str:
+    if column not in item:
+        return _MISSING
+    return json.dumps(item[column], ensure_ascii=False)
+
+class ReportArchive:
+    """
+    Reader for write_report_archive files. Only the members needed for the
+    requested columns/categories are decompressed.
+
+        archive = ReportArchive("data/Report_US_Tech.zip")
+        titles = archive.column("title", cleaned=True)
+        hk = archive.rows(category="HK_TECH", columns=["title", "content"])
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.zf = zipfile.ZipFile(path)
+        self.manifest = json.loads(self.zf.read(MANIFEST))
+        if self.manifest.get("format") != FORMAT_NAME:
+            raise ValueError(f"{path} is not a report archive")
+        self.codec = self.manifest["codec"]
+        self.columns = self.manifest["columns"]
+
+    @property
+    def meta(self) -> dict:
+        return self.manifest["meta"]
+
+    @property
+    def categories(self) -> list[str]:
+        return list(self.manifest["categories"])
+
+    def close(self):
+        self.zf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    def _read_column(self, category: str, column: str) -> list:
+        """Cells of one column for one category (None = missing key)."""
+        prefix = self.manifest["categories"][category]["prefix"]
+        if self.codec == "parquet":
+            with self.zf.open(f"{prefix}/table.parquet") as member:
+                cells = pq.read_table(member, columns=[column]).column(column).to_pylist()
+        else:
+            index = self.columns.index(column)
+            if self.codec == "zstd":
+                if zstandard is None:
+                    raise ImportError("zstandard is required to read this archive")
+                data = zstandard.ZstdDecompressor().decompress(self.zf.read(f"{prefix}/{index}.ndjson.zst"))
+            else:
+                data = self.zf.read(f"{prefix}/{index}.ndjson")
+            cells = data.decode("utf-8").split("\n")
+        return [None if cell == _MISSING else cell for cell in cells]
+
+    def _selected_rows(self, category, cleaned):
+        """[(category, position in category, global row id)] in report order."""
+        categories = [category] if category is not None else self.categories
+        located = [
+            (cat, pos, row)
+            for cat in categories
+            for pos, row in enumerate(self.manifest["categories"][cat]["rows"])
+        ]
+        if cleaned:
+            order = {row: n for n, row in enumerate(self.manifest["cleaned_rows"])}
+        else:
+            order = {row: row for row in range(self.manifest["raw_count"])}
+        located = [entry for entry in located if entry[2] in order]
+        located.sort(key=lambda entry: order[entry[2]])
+        return located
+
+    def rows(self, category: str = None, columns: list[str] = None, cleaned: bool = False) -> list[dict]:
+        """Items of the report (raw_data, or cleaned_data if cleaned), optionally one category / some columns."""
+        columns = [c for c in (columns or self.columns) if c in self.columns]
+        located = self._selected_rows(category, cleaned)
+        cells = {
+            (cat, col): self._read_column(cat, col)
+            for cat in dict.fromkeys(entry[0] for entry in located)
+            for col in columns
+        }
+        items = []
+        for cat, pos, _ in located:
+            item = {}
+            for col in columns:
+                cell = cells[(cat, col)][pos]
+                if cell is not None:
+                    item[col] = json.loads(cell)
+            items.append(item)
+        return items
+
+    def column(self, name: str, category: str = None, cleaned: bool = False) -> list:
+        """Values of one column (None where an item lacks the key)."""
+        return [item.get(name) for item in self.rows(category=category, columns=[name], cleaned=cleaned)]
+
+    def to_report(self) -> dict:
+        """Full report in the JSON layout { meta, cleaned_data, raw_data }."""
+        raw_data = self.rows()
+        cleaned_rows = self.manifest["cleaned_rows"]
+        raw_count = self.manifest["raw_count"]
+        extra = {}
+        if any(row >= raw_count for row in cleaned_rows):
+            extra = dict(zip(
+                (entry[2] for entry in self._selected_rows(None, True)),
+                self.rows(cleaned=True)
+            ))
+        cleaned_data = [raw_data[row] if row < raw_count else extra[row] for row in cleaned_rows]
+        return {"meta": self.meta, "cleaned_data": cleaned_data, "raw_data": raw_data}
+
+def load_report(path: str) -> dict:
+    """Load a report written either as JSON or as a report archive."""
+    if zipfile.is_zipfile(path):
+        with ReportArchive(path) as archive:
+            return archive.to_report()
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,146 @@
+import logging
+import random
+import threading
+import time
+from config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose breaker is open (fail fast)."""
+
+class CircuitBreaker:
+    """
+    Per-source circuit breaker shared by all worker threads.
+    closed -> open after `failure_threshold` consecutive failed attempts;
+    open -> half_open once `cooldown` seconds have passed (one probe call allowed);
+    half_open -> closed on probe success, back to open on probe failure.
+    Transitions are recorded as "Breaker <name>: <old>-><new>" in the caller's StatsTracker.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 6, cooldown: float = 60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+        self.opened = threading.Condition(self.lock) # Wakes retry sleeps when the breaker trips
+
+    def _transition(self, new_state, stats=None):
+        old_state, self.state = self.state, new_state
+        if new_state == self.OPEN:
+            self.opened_at = time.monotonic()
+            self.opened.notify_all()
+            logger.warning(f"🔌 Circuit '{self.name}' open for {self.cooldown}s after {self.failures} failures.")
+        elif new_state == self.CLOSED:
+            logger.info(f"🔌 Circuit '{self.name}' closed.")
+        if stats is not None:
+            stats.update(f"Breaker {self.name}: {old_state}->{new_state}", 1)
+
+    def allow(self, stats=None) -> bool:
+        with self.lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    return False
+                self._transition(self.HALF_OPEN, stats)
+            if self.state == self.HALF_OPEN:
+                if self.probing:
+                    return False
+                self.probing = True
+            return True
+
+    def record_success(self, stats=None):
+        with self.lock:
+            self.failures = 0
+            self.probing = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED, stats)
+
+    def record_neutral(self, stats=None):
+        """The call ended without saying anything about the source's health (no count change)."""
+        with self.lock:
+            self.probing = False # A half-open breaker lets the next call probe instead
+
+    def record_failure(self, stats=None):
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self._transition(self.OPEN, stats)
+
+    def wait(self, timeout: float):
+        """Sleep up to `timeout` seconds, returning early if the breaker opens meanwhile."""
+        with self.lock:
+            self.opened.wait_for(lambda: self.state == self.OPEN, timeout)
+
+    def is_open(self) -> bool:
+        with self.lock:
+            return self.state == self.OPEN and time.monotonic() - self.opened_at < self.cooldown
+
+def backoff_delay(attempt: int, base_delay: float = 1.0, max_delay: float = 8.0) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(max_delay, base_delay * 2^(attempt-1)))."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** (attempt - 1))))
+
+def retry_call(operation, *args, retries: int = 5, base_delay: float = 1.0, max_delay: float = 8.0,
+               breaker: CircuitBreaker = None, stats=None, label: str = "", permanent=None, **kwargs):
+    """
+    Call operation(*args, **kwargs) with jittered exponential backoff between attempts.
+    With a breaker, every attempt is gated: once the source trips (here or in another
+    thread), the remaining attempts are abandoned and CircuitOpenError is raised;
+    a backoff sleep in progress is cut short when that happens.
+    permanent: optional predicate for errors of this call rather than of the source
+    (e.g. a delisted symbol). Those are raised at once, without retries, and are neutral
+    for the breaker: neither a failure nor a success that would reset its count.
+    """
+    last_exception = None
+    for attempt in range(1, retries + 1):
+        if breaker is not None and not breaker.allow(stats):
+            raise CircuitOpenError(f"{breaker.name} circuit open, skipping call") from last_exception
+        start = time.perf_counter()
+        try:
+            result = operation(*args, **kwargs)
+        except Exception as e:
+            last_exception = e
+            if permanent is not None and permanent(e):
+                if breaker is not None:
+                    breaker.record_neutral(stats)
+                raise
+            if breaker is not None:
+                breaker.record_failure(stats)
+            if attempt == retries:
+                break
+            if stats is not None:
+                stats.incr("retries_total", source=label)
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            logger.warning(f"[{label}] Attempt {attempt}/{retries} failed: {e}. Retrying in {delay:.1f}s...")
+            if breaker is not None:
+                breaker.wait(delay) # Frees the worker as soon as the source trips
+            else:
+                time.sleep(delay)
+        else:
+            if stats is not None:
+                stats.observe("source_latency_seconds", time.perf_counter() - start, source=label)
+            if breaker is not None:
+                breaker.record_success(stats)
+            return result
+    raise last_exception
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Process-wide breaker per source name, configured from CONFIG["RESILIENCE"]["BREAKER"]."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            conf = CONFIG.get("RESILIENCE", {}).get("BREAKER", {})
+            breaker = _breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=conf.get("FAILURE_THRESHOLD", 6),
+                cooldown=conf.get("COOLDOWN", 60)
+            )
+        return breaker
@@ -0,0 +1,83 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    In-run registry keyed by URL (or any hashable key).
+    The first caller for a key does the work; concurrent callers block until it
+    finishes and later callers get the stored result, so the same article found
+    through "TSMC" and "台积电" is only scraped once per process.
+    Failed calls are forgotten so a later caller can retry.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._calls = {}
+        self.hits = 0   # Calls served by another caller's work
+        self.misses = 0 # Calls that did the work
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Returns (result, shared). shared=True if the result came from another caller.
+        """
+        with self.lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            with self.lock:
+                self._calls.pop(key, None)
+            raise
+        finally:
+            call.event.set()
+        return call.result, False
+
+    def seen(self, key) -> bool:
+        """True if a call for key is in flight or completed."""
+        with self.lock:
+            return key in self._calls
+
+    def report(self) -> dict:
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "unique": self.misses,
+                "shared": self.hits,
+                "saved_pct": round(100.0 * self.hits / total, 1) if total else 0.0
+            }
+
+    def reset(self):
+        """Forget all results (start of a new run in long-lived processes)."""
+        with self.lock:
+            self._calls.clear()
+            self.hits = 0
+            self.misses = 0
+
+_url_registry = SingleFlight()
+
+def get_url_registry() -> SingleFlight:
+    """Process-wide article URL registry shared by all fetchers and collectors."""
+    return _url_registry
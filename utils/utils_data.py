@@ -1,47 +1,249 @@
 import json
-import re
+import os
 import logging
+from config import CONFIG
+from utils.metrics import MetricsRegistry
+
+try:
+    import orjson
+except ImportError:
+    # Optional fast encoder for save_custom_json
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 import threading
+from contextlib import contextmanager
 
 class StatsTracker:
+    """
+    Per-source item counts / errors (report "stats" block) plus performance metrics:
+    latency histograms, counters (bytes, retries, timeouts) and per-stage wall time.
+    All updates land in per-thread shards (utils/metrics.py), so worker threads never queue on one lock.
+    """
     def __init__(self):
-        self.stats = {} 
-        self.lock = threading.Lock()
+        self.registry = MetricsRegistry()
 
     def update(self, source, count, error=None):
-        with self.lock:
-            if source not in self.stats:
-                self.stats[source] = {'count': 0, 'status': 'OK', 'error': None}
-            
-            self.stats[source]['count'] += count
-            if error:
-                self.stats[source]['status'] = 'FAILED'
-                self.stats[source]['error'] = str(error)
-    
+        self.registry.update_source(source, count, error)
+
+    @property
+    def stats(self):
+        return self.registry.sources()
+
     def get_report(self):
         return self.stats
 
-def save_custom_json(data, filepath):
+    def incr(self, name, value=1, **labels):
+        self.registry.incr(name, value, **labels)
+
+    def observe(self, name, value, **labels):
+        self.registry.observe(name, value, **labels)
+
+    def stage(self, name):
+        """Context manager timing one pipeline stage (fetch, scrape, clean, save, dispatch)."""
+        return self.registry.timer("stage_seconds", stage=name)
+
+    def timer(self, name, **labels):
+        return self.registry.timer(name, **labels)
+
+    def metrics(self) -> dict:
+        return self.registry.snapshot()
+
+    def propagate(self, fn):
+        """Wrap fn for execution in another thread (no-op for a plain tracker)."""
+        return fn
+
+class StatsRouter:
+    """
+    StatsTracker stand-in for fetchers shared by several collectors.
+    Updates go to the tracker bound to the current thread (the collector whose
+    item is being fetched), or to `default` when nothing is bound.
+    """
+    def __init__(self, default: StatsTracker = None):
+        self.default = default or StatsTracker()
+        self._local = threading.local()
+
+    @contextmanager
+    def bind(self, tracker: StatsTracker):
+        previous = getattr(self._local, "tracker", None)
+        self._local.tracker = tracker
+        try:
+            yield tracker
+        finally:
+            self._local.tracker = previous
+
+    def current(self) -> StatsTracker:
+        return getattr(self._local, "tracker", None) or self.default
+
+    def update(self, source, count, error=None):
+        self.current().update(source, count, error)
+
+    def incr(self, name, value=1, **labels):
+        self.current().incr(name, value, **labels)
+
+    def observe(self, name, value, **labels):
+        self.current().observe(name, value, **labels)
+
+    def stage(self, name):
+        return self.current().stage(name)
+
+    def timer(self, name, **labels):
+        return self.current().timer(name, **labels)
+
+    def metrics(self) -> dict:
+        return self.current().metrics()
+
+    @property
+    def stats(self):
+        return self.current().stats
+
+    def get_report(self):
+        return self.current().get_report()
+
+    def propagate(self, fn):
+        """Carry the current thread's binding into fn (for fetcher-internal pools)."""
+        tracker = self.current()
+        def run(*args, **kwargs):
+            with self.bind(tracker):
+                return fn(*args, **kwargs)
+        return run
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported, e.g. Windows)."""
+    try:
+        import resource
+        import sys
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+_STATS_KEYS = ["count", "status", "error"]
+_FLUSH_PARTS = 1024
+
+def _is_stats_block(obj) -> bool:
+    """
+    { count, status, error } objects that are written on one line.
+    Same shape the old collapse regex matched: non-negative int count, non-empty status,
+    error null or a string, and no double quotes inside the strings.
+    """
+    if list(obj) != _STATS_KEYS:
+        return False
+    count, status, error = obj["count"], obj["status"], obj["error"]
+    return (
+        isinstance(count, int) and not isinstance(count, bool) and count >= 0
+        and isinstance(status, str) and status != "" and '"' not in status
+        and (error is None or (isinstance(error, str) and '"' not in error))
+    )
+
+def _orjson_safe(obj) -> bool:
+    """True if orjson encodes obj exactly like json.dumps (no floats, str keys, no stats blocks)."""
+    if isinstance(obj, dict):
+        return (not _is_stats_block(obj)) and all(type(k) is str and _orjson_safe(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return all(_orjson_safe(v) for v in obj)
+    return obj is None or type(obj) in (str, int, bool)
+
+class _JsonStreamWriter:
+    """
+    Writes json.dumps(obj, ensure_ascii=False, indent=4) piece by piece, with stats
+    blocks on one line. Report items are encoded and flushed one at a time, so the
+    whole document never exists as a single string.
+    """
+    def __init__(self, write, use_orjson=False):
+        self.write = write
+        self.parts = []
+        self.use_orjson = use_orjson and orjson is not None
+
+    def dump(self, obj):
+        self._encode(obj, 0)
+        self.flush()
+
+    def flush(self):
+        if self.parts:
+            self.write("".join(self.parts))
+            self.parts.clear()
+
+    def _encode(self, obj, level):
+        emit = self.parts.append
+        if isinstance(obj, dict):
+            if not obj:
+                emit("{}")
+            elif _is_stats_block(obj):
+                emit(f'{{ "count": {int(obj["count"])}, "status": {_scalar(obj["status"])}, "error": {_scalar(obj["error"])} }}')
+            elif not (self.use_orjson and self._encode_orjson(obj, level)):
+                inner = "\n" + "    " * (level + 1)
+                separator = "{" + inner
+                for key, value in obj.items():
+                    emit(separator + _key(key) + ": ")
+                    self._encode(value, level + 1)
+                    separator = "," + inner
+                emit("\n" + "    " * level + "}")
+        elif isinstance(obj, (list, tuple)):
+            if not obj:
+                emit("[]")
+                return
+            inner = "\n" + "    " * (level + 1)
+            separator = "[" + inner
+            for value in obj:
+                emit(separator)
+                self._encode(value, level + 1)
+                separator = "," + inner
+                if len(self.parts) >= _FLUSH_PARTS:
+                    self.flush()
+            emit("\n" + "    " * level + "]")
+        else:
+            emit(_scalar(obj))
+
+    def _encode_orjson(self, obj, level) -> bool:
+        """Fast path for one dict: orjson (indent 2) with indentation doubled and shifted."""
+        if not _orjson_safe(obj):
+            return False
+        try:
+            lines = orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8").split("\n")
+        except (TypeError, UnicodeEncodeError, OverflowError):
+            return False # e.g. lone surrogates, ints beyond 64 bit
+        base = "    " * level
+        out = [lines[0]]
+        for line in lines[1:]:
+            content = line.lstrip(" ")
+            out.append(base + "  " * (len(line) - len(content)) + content)
+        self.parts.append("\n".join(out))
+        self.flush() # One large chunk per item: write it out right away
+        return True
+
+def _scalar(value) -> str:
+    if isinstance(value, str):
+        return _encode_str(value)
+    return json.dumps(value, ensure_ascii=False)
+
+def _key(key) -> str:
+    # json.dumps converts non-str keys: True -> "true", None -> "null", 1 -> "1"
+    if isinstance(key, str):
+        return _encode_str(key)
+    if isinstance(key, (bool, int, float)) or key is None:
+        return _encode_str(json.dumps(key))
+    raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+
+_encode_str = json.encoder.encode_basestring
+
+def save_custom_json(data, filepath, use_orjson=None):
     """
     Save JSON with 'stats' inner objects formatted on a single line.
+    Streams to disk (via a temp file, replaced on success); the bytes are identical
+    to the previous json.dumps(indent=4) + regex collapse output.
+    use_orjson: encode report items with orjson when installed (default: CONFIG["JSON_ENCODER"]).
     """
-    json_str = json.dumps(data, ensure_ascii=False, indent=4)
-    
-    # Regex to collapse stats values to single lines
-    def collapse_match(match):
-        block = match.group(0)
-        collapsed = re.sub(r'\s*\n\s*', ' ', block)
-        collapsed = re.sub(r'\{ "', '{ "', collapsed)
-        collapsed = re.sub(r', "', ', "', collapsed)
-        collapsed = re.sub(r' \} ', ' }', collapsed) 
-        return collapsed
-
-    # Pattern matches the specific structure of stats objects
-    pattern = r'\{\s+"count": \d+,\s+"status": "[^"]+",\s+"error": (?:null|"[^"]*")\s+\}'
-    json_str_custom = re.sub(pattern, collapse_match, json_str)
-    
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(json_str_custom)
+    if use_orjson is None:
+        use_orjson = CONFIG.get("JSON_ENCODER", "json") == "orjson"
+    tmp_path = f"{filepath}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            _JsonStreamWriter(f.write, use_orjson=use_orjson).dump(data)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
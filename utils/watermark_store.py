@@ -0,0 +1,177 @@
+import calendar
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+class WatermarkStore:
+    """
+    Disk-backed (SQLite) newest-published timestamp per (group, source, query, locale).
+    In "since_last_run" mode fetchers drop entries published before the watermark
+    (minus an overlap for late-indexed stories) before any scraping.
+    New watermarks are only proposed during a run; they are written by commit()
+    once the collector that fetched them has saved its report, so a crashed run
+    fetches the same window again.
+    The group comes from set_group(scope, group): a keyword listed in two groups
+    has one watermark per group, so one group's report never hides entries from the other's.
+    """
+    def __init__(self, db_path: str, overlap_minutes: float = 60):
+        self.overlap_seconds = overlap_minutes * 60
+        self.lock = threading.Lock()
+        self.pending = {} # scope (collector StatsTracker) -> { (group, source, query, locale): epoch }
+        self.groups = {} # scope -> config group being collected
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(watermarks)")]
+            if columns and "grp" not in columns:
+                # Ungrouped watermarks cannot be attributed: each group starts with one full run
+                logger.info("Watermark store: upgrading to per-group watermarks.")
+                self.conn.execute("DROP TABLE watermarks")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    grp TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    locale TEXT NOT NULL,
+                    published REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (grp, source, query, locale)
+                )
+            """)
+            self.conn.commit()
+
+    @property
+    def incremental(self) -> bool:
+        """Read per call: main.py switches modes with --full / --since-last-run."""
+        return CONFIG.get("INCREMENTAL", {}).get("MODE", "since_last_run") == "since_last_run"
+
+    def set_group(self, scope, group: str):
+        """Watermarks read and proposed under scope (a collector's stats) belong to group."""
+        with self.lock:
+            self.groups[_scope(scope)] = group
+
+    def group_of(self, scope) -> str:
+        with self.lock:
+            return self.groups.get(_scope(scope), "")
+
+    def get(self, source: str, query: str, locale: str = "", group: str = ""):
+        """Newest committed published timestamp (epoch seconds) or None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT published FROM watermarks WHERE grp = ? AND source = ? AND query = ? AND locale = ?",
+                (group, source, query, locale)
+            ).fetchone()
+        return row[0] if row else None
+
+    def cutoff(self, source: str, query: str, locale: str = "", group: str = ""):
+        """Entries published at or before this epoch are skipped (None: keep everything)."""
+        if not self.incremental:
+            return None
+        watermark = self.get(source, query, locale, group)
+        return None if watermark is None else watermark - self.overlap_seconds
+
+    def propose(self, scope, source: str, query: str, locale: str, published: float):
+        """Remember the newest timestamp seen; written by commit(scope)."""
+        scope = _scope(scope)
+        with self.lock:
+            key = (self.groups.get(scope, ""), source, query, locale)
+            pending = self.pending.setdefault(scope, {})
+            pending[key] = max(published, pending.get(key, published))
+
+    def commit(self, scope) -> int:
+        """Persist the watermarks proposed under scope (never moves one backwards). Returns how many."""
+        with self.lock:
+            scope = _scope(scope)
+            self.groups.pop(scope, None)
+            pending = self.pending.pop(scope, {})
+            if not pending:
+                return 0
+            now = time.time()
+            self.conn.executemany(
+                """
+                INSERT INTO watermarks (grp, source, query, locale, published, updated_at) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (grp, source, query, locale) DO UPDATE SET
+                    published = MAX(published, excluded.published),
+                    updated_at = excluded.updated_at
+                """,
+                [(group, source, query, locale, published, now) for (group, source, query, locale), published in pending.items()]
+            )
+            self.conn.commit()
+        return len(pending)
+
+    def discard(self, scope):
+        with self.lock:
+            scope = _scope(scope)
+            self.pending.pop(scope, None)
+            self.groups.pop(scope, None)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def _scope(stats):
+    """Pending watermarks belong to the collector: a StatsRouter resolves to the bound tracker."""
+    return stats.current() if hasattr(stats, "current") else stats
+
+def to_epoch(value):
+    """Epoch seconds for a struct_time (UTC, as feedparser returns), datetime or ISO string; None if unknown."""
+    if value is None:
+        return None
+    if isinstance(value, time.struct_time):
+        return float(calendar.timegm(value))
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return value.timestamp()
+
+def filter_since_watermark(store, stats, source: str, query: str, locale: str, items: list, published_of) -> list:
+    """
+    Drop items published before the watermark cutoff and propose the newest
+    timestamp among ALL items (published_of(item) -> value for to_epoch).
+    Items without a usable date are kept. No-op when store is None.
+    """
+    if store is None or not items:
+        return items
+    published = [to_epoch(published_of(item)) for item in items]
+    known = [p for p in published if p is not None]
+    if known:
+        store.propose(stats, source, query, locale, max(known))
+    cutoff = store.cutoff(source, query, locale, store.group_of(stats))
+    if cutoff is None:
+        return items
+    fresh = [item for item, p in zip(items, published) if p is None or p > cutoff]
+    if len(fresh) < len(items):
+        stats.update("Watermark (Skipped)", len(items) - len(fresh))
+    return fresh
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_watermark_store():
+    """Process-wide WatermarkStore from CONFIG["INCREMENTAL"], or None if disabled/unavailable."""
+    global _store
+    conf = CONFIG.get("INCREMENTAL", {})
+    if not conf.get("ENABLED", False):
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = WatermarkStore(
+                    os.path.join(CONFIG.get("CACHE", {}).get("DIR", "cache"), "watermarks.sqlite3"),
+                    overlap_minutes=conf.get("OVERLAP_MINUTES", 60)
+                )
+            except Exception as e:
+                logger.error(f"Failed to open watermark store: {e}. Incremental collection disabled.")
+                _store = False # Don't retry on every call
+        return _store or None